@@ -0,0 +1,148 @@
+"""
+Benchmark alokasi per pesan sensor: pipeline dict lama vs record SensorSample.
+
+Pipeline lama (sebelum record) per pesan:
+    current_data.copy() + timestamp  -> data_received (dict)
+    data_packet bertingkat (4 dict)   -> data_updated  (dict)
+    get_device_status (5 dict)        -> status_updated (dict)
+Pipeline baru: satu SensorSample + satu DeviceStatus, diteruskan sebagai referensi.
+
+Objek yang dikirim ditahan di antrian (`--backlog`) seperti event queued Qt
+pada laju tinggi, sehingga tekanan GC terukur. Bagian `--qt` mengukur biaya
+emit queued pyqtSignal(dict) (konversi QVariantMap) vs pyqtSignal(object).
+
+Cara pakai:
+    python benchmarks/bench_sample_records.py
+    python benchmarks/bench_sample_records.py -n 200000 --qt
+"""
+import os
+import sys
+import gc
+import time
+import argparse
+import tracemalloc
+from collections import deque
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from src.services.records import SensorSample, DeviceStatus, format_countdown
+
+CURRENT = {
+    "temperature": 37.5, "humidity": 60.0, "power": 40, "rotate_on": 120,
+    "SET": 37.5, "humidifier_power": 0
+}
+
+def legacy_message(now):
+    """Replika alokasi pipeline dict sebelum record diperkenalkan"""
+    sample = CURRENT.copy()
+    sample["timestamp"] = now
+    packet = {
+        "timestamp": sample.get("timestamp"),
+        "current": {"temperature": sample.get("temperature", 0.0), "humidity": sample.get("humidity", 0.0)},
+        "target": {"temperature": CURRENT["SET"], "humidity": 60.0},
+        "extra": {"power": sample.get("power", 0), "rotate_on": sample.get("rotate_on", 0)},
+    }
+    power = CURRENT["power"]
+    status = {
+        "power": {"value": power, "status": "ON" if power > 0 else "OFF", "active": power > 0},
+        "motor": {"status": "Idle", "active": False},
+        "timer": {"countdown": format_countdown(CURRENT["rotate_on"])},
+        "incubation": {"day": 3, "total": 21},
+    }
+    return packet, status
+
+def record_message(now):
+    sample = SensorSample(
+        now, CURRENT["temperature"], CURRENT["humidity"], CURRENT["power"],
+        CURRENT["rotate_on"], CURRENT["SET"], 60.0, "incubator"
+    )
+    power = CURRENT["power"]
+    status = DeviceStatus(power, power > 0, "Idle", False,
+                          format_countdown(CURRENT["rotate_on"]), 3, 21)
+    return sample, status
+
+def measure(build, count, backlog):
+    """Waktu per pesan, koleksi GC gen0, dan byte tertahan per pesan"""
+    queue = deque(maxlen=backlog)
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start" and info["generation"] == 0:
+            collections[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    for i in range(count):
+        queue.append(build(float(i)))
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(on_gc)
+
+    queue.clear()
+    gc.collect()
+    tracemalloc.start()
+    for i in range(backlog):
+        queue.append(build(float(i)))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "us_per_msg": elapsed / count * 1e6,
+        "gc_gen0_per_10k": collections[0] * 10000 / count,
+        "bytes_per_msg": retained / backlog,
+    }
+
+def measure_qt(count):
+    """Biaya emit queued + dispatch slot untuk payload dict vs record"""
+    from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal, Qt
+
+    class Emitter(QObject):
+        as_dict = pyqtSignal(dict)
+        as_object = pyqtSignal(object)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    emitter = Emitter()
+    received = [0]
+
+    def slot(_payload):
+        received[0] += 1
+
+    results = {}
+    for name, signal, build in (("dict", emitter.as_dict, legacy_message),
+                                ("record", emitter.as_object, record_message)):
+        signal.connect(slot, Qt.ConnectionType.QueuedConnection)
+        received[0] = 0
+        start = time.perf_counter()
+        for i in range(count):
+            signal.emit(build(float(i))[0])
+            if i % 1000 == 999:
+                app.processEvents()
+        app.processEvents()
+        results[name] = (time.perf_counter() - start) / count * 1e6
+        signal.disconnect(slot)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alokasi record sampel sensor")
+    parser.add_argument("-n", "--count", type=int, default=100000, help="Jumlah pesan (default: %(default)s)")
+    parser.add_argument("--backlog", type=int, default=2000,
+                        help="Pesan yang tertahan di antrian event (default: %(default)s)")
+    parser.add_argument("--qt", action="store_true", help="Ukur juga emit queued pyqtSignal")
+    args = parser.parse_args()
+
+    legacy = measure(legacy_message, args.count, args.backlog)
+    record = measure(record_message, args.count, args.backlog)
+
+    print(f"{'':10} {'us/pesan':>10} {'GC gen0/10k':>12} {'byte/pesan':>11}")
+    for name, result in (("dict", legacy), ("record", record)):
+        print(f"{name:10} {result['us_per_msg']:10.2f} {result['gc_gen0_per_10k']:12.1f} {result['bytes_per_msg']:11.0f}")
+    print(f"➡ Byte per pesan turun {legacy['bytes_per_msg'] / record['bytes_per_msg']:.1f}x, "
+          f"koleksi GC turun {legacy['gc_gen0_per_10k'] / max(record['gc_gen0_per_10k'], 0.1):.1f}x")
+
+    if args.qt:
+        qt = measure_qt(min(args.count, 50000))
+        print(f"📡 Emit queued: dict {qt['dict']:.2f} us, record {qt['record']:.2f} us per pesan")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Bandingkan dua hasil run_benchmarks.py dan gagal (exit code 1) jika ada regresi.
+
+    python benchmarks/compare.py baseline.json current.json
+    python benchmarks/compare.py base.json new.json --threshold 0.10 \\
+        --limit graphs.update_graph_plot=0.30 --metric median_us
+
+Regresi = waktu naik lebih dari threshold (0.20 = 20%) relatif terhadap baseline.
+Metrik default `min_us` (ronde tercepat) paling tahan terhadap gangguan proses
+lain di mesin; naikkan --rounds saat menjalankan benchmark jika hasil masih berisik.
+"""
+import sys
+import json
+import argparse
+
+METRICS = ("median_us", "min_us", "mean_us")
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def parse_limits(items, parser):
+    limits = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        try:
+            limits[name] = float(value)
+        except ValueError:
+            sep = ""
+        if not sep:
+            parser.error(f"--limit harus berformat nama=angka, bukan '{item}'")
+    return limits
+
+def compare(baseline, current, metric, threshold, limits):
+    """[(nama, lama, baru, rasio perubahan, status)]"""
+    rows = []
+    names = list(baseline["results"]) + [n for n in current["results"] if n not in baseline["results"]]
+    for name in names:
+        old = baseline["results"].get(name)
+        new = current["results"].get(name)
+        if old is None or new is None:
+            rows.append((name, old and old[metric], new and new[metric], None,
+                         "baru" if old is None else "hilang"))
+            continue
+
+        change = new[metric] / old[metric] - 1.0 if old[metric] else 0.0
+        limit = limits.get(name, threshold)
+        if change > limit:
+            status = "REGRESI"
+        elif change < -limit:
+            status = "lebih cepat"
+        else:
+            status = "ok"
+        rows.append((name, old[metric], new[metric], change, status))
+    return rows
+
+def _fmt(value):
+    return f"{value:12.2f}" if value is not None else f"{'-':>12}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan hasil benchmark KARTEL")
+    parser.add_argument("baseline", help="JSON hasil sebelum perubahan")
+    parser.add_argument("current", help="JSON hasil sesudah perubahan")
+    parser.add_argument("--metric", choices=METRICS, default="min_us", help="Metrik (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Kenaikan maksimal yang diizinkan, 0.20 = 20%% (default: %(default)s)")
+    parser.add_argument("--limit", action="append", default=[],
+                        help="Threshold khusus per benchmark: nama=0.25 (bisa berulang)")
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, args.metric, args.threshold, parse_limits(args.limit, parser))
+
+    base_meta, cur_meta = baseline.get("meta", {}), current.get("meta", {})
+    print(f"Baseline: {base_meta.get('commit')} ({base_meta.get('created')})  |  "
+          f"Sekarang: {cur_meta.get('commit')} ({cur_meta.get('created')})  |  metrik: {args.metric}")
+    if base_meta.get("platform") != cur_meta.get("platform"):
+        print("⚠ Platform berbeda, perbandingan mungkin tidak sebanding")
+
+    print(f"{'benchmark':36} {'lama (us)':>12} {'baru (us)':>12} {'perubahan':>10}  status")
+    for name, old, new, change, status in rows:
+        change_text = f"{change * 100:+9.1f}%" if change is not None else f"{'-':>10}"
+        print(f"{name:36} {_fmt(old)} {_fmt(new)} {change_text}  {status}")
+
+    regressions = [row[0] for row in rows if row[4] == "REGRESI"]
+    if regressions:
+        print(f"❌ {len(regressions)} regresi: {', '.join(regressions)}")
+        return 1
+    print("✅ Tidak ada regresi")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""
+Benchmark jalur panas dashboard (headless, platform Qt offscreen).
+
+Hasil disimpan sebagai JSON agar bisa dibandingkan antar commit:
+    python benchmarks/run_benchmarks.py                      # -> benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py -o before.json
+    python benchmarks/run_benchmarks.py -k graphs -k mqtt    # hanya benchmark yang namanya cocok
+    python benchmarks/compare.py before.json after.json      # gagal jika ada regresi
+
+Semua file (history, DataStore) ditulis ke folder sementara, bukan ke data/.
+"""
+import os
+import sys
+import io
+import json
+import time
+import math
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+ROUND_TARGET = 0.05   # Detik minimal per ronde (jumlah iterasi dikalibrasi)
+
+# =========================================================================
+# REGISTRY
+# =========================================================================
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """Daftarkan fungsi setup: setup(ctx) -> callable tanpa argumen yang diukur"""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+class Context:
+    """Objek bersama antar benchmark, dibuat saat pertama dibutuhkan"""
+
+    def __init__(self, graph_points):
+        self.graph_points = graph_points
+        self._service = None
+        self._controller = None
+        self._window = None
+        self._app = None
+
+    @property
+    def app(self):
+        if self._app is None:
+            from PyQt6.QtWidgets import QApplication
+            self._app = QApplication.instance() or QApplication(sys.argv)
+        return self._app
+
+    def process_events(self, seconds=0.0):
+        deadline = time.perf_counter() + seconds
+        while True:
+            self.app.processEvents()
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(0.01)
+
+    @property
+    def service(self):
+        if self._service is None:
+            self.app
+            from src.services.mqtt_service import MqttService
+            self._service = MqttService()
+        return self._service
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            self.app
+            from src.controllers.main_controller import MainController
+            self._controller = MainController()
+            self._controller.view_ready = True
+        return self._controller
+
+    @property
+    def window(self):
+        if self._window is None:
+            self.app
+            from src.views.main_window import KartelMainWindow
+            # Sinkronisasi profil awal membuka dialog modal; tidak relevan untuk benchmark
+            KartelMainWindow.force_sync_current_profile = lambda window: None
+            self._window = KartelMainWindow()
+            self._window.show()
+            # Panel grafik dibangun setelah frame pertama
+            while self._window.graphs_helper is None:
+                self.process_events(0.05)
+            self._fill_graph(self._window)
+        return self._window
+
+    def _fill_graph(self, window):
+        import numpy as np
+        rng = np.random.default_rng(0)
+        n = self.graph_points
+        now = time.time()
+        window.graph_data.extend({
+            "timestamps": now - (n - np.arange(n)) * 2.0,
+            "temperature": 37.5 + rng.normal(0, 0.2, n),
+            "humidity": 60.0 + rng.normal(0, 1.0, n),
+        })
+
+    def close(self):
+        for obj in (self._window, self._controller):
+            if obj is not None:
+                controller = getattr(obj, "controller", obj)
+                controller.cleanup()
+        if self._service is not None:
+            self._service.disconnect()
+
+# =========================================================================
+# BENCHMARKS
+# =========================================================================
+
+def _payloads(count=1000):
+    return [
+        {"temperature": 37.5 + (i % 20) * 0.05, "humidity": 60.0 + (i % 10) * 0.3,
+         "power": 40 + i % 20, "rotate_on": 120 - i % 120, "SET": 37.5}
+        for i in range(count)
+    ]
+
+@benchmark("mqtt.process_sensor_data")
+def bench_process_sensor_data(ctx):
+    service = ctx.service
+    payloads = _payloads()
+    index = [0]
+
+    def run():
+        index[0] = (index[0] + 1) % len(payloads)
+        service._process_sensor_data(payloads[index[0]])
+    return run
+
+@benchmark("mqtt.update_history")
+def bench_update_history(ctx):
+    service = ctx.service
+    clock = [time.time()]
+
+    def run():
+        clock[0] += 2.0
+        service._update_history(37.5, 60.0, clock[0])
+    return run
+
+@benchmark("mqtt.get_device_status")
+def bench_get_device_status(ctx):
+    service = ctx.service
+    service._process_sensor_data(_payloads(1)[0])
+    return service.get_device_status
+
+@benchmark("controller.on_real_data_received")
+def bench_on_real_data_received(ctx):
+    from src.services.records import SensorSample
+    controller = ctx.controller
+    sample = SensorSample(time.time(), 37.5, 60.0, 40, 120, 37.5, 60.0, "incubator")
+    return lambda: controller.on_real_data_received(sample)
+
+@benchmark("batch_stats.add")
+def bench_batch_stats_add(ctx):
+    from src.services.batch_stats import BatchStats
+    stats = BatchStats("bench")
+    clock = [time.time()]
+
+    def run():
+        clock[0] += 2.0
+        stats.add(clock[0], 37.6, 60.5, 37.5, 60.0)
+    return run
+
+@benchmark("anomaly.ingest")
+def bench_anomaly_ingest(ctx):
+    from src.services.anomaly_detection import FleetAnomalyDetector
+    detector = FleetAnomalyDetector()
+    clock = [time.time()]
+
+    def run():
+        clock[0] += 2.0
+        detector.ingest("incubator", clock[0], 37.6, 60.5, 40.0, 37.5)
+    return run
+
+@benchmark("anomaly.update_5000")
+def bench_anomaly_update(ctx):
+    import numpy as np
+    from src.services.anomaly_detection import FleetAnomalyDetector
+    # Satu tick saat blok 5000 device selesai bersamaan (kasus terburuk)
+    n = 5000
+    detector = FleetAnomalyDetector()
+    rng = np.random.default_rng(0)
+    now = time.time()
+    for i in range(n):
+        detector.ingest(f"dev-{i}", now, 37.5, 60.0, 40.0, 37.5)
+    state = detector._state
+
+    def run():
+        state["last_time"][:n] += 60.0
+        state["last_temperature"][:n] = 37.5 + rng.normal(0, 0.1, n)
+        state["block_n"][:n] = state["power_n"][:n] = 30
+        state["sum_temperature"][:n] = rng.normal(0, 3.0, n)
+        state["sum_humidity"][:n] = 1800 + rng.normal(0, 30, n)
+        state["sum_power"][:n] = 1200 + rng.normal(0, 60, n)
+        detector.update()
+    return run
+
+@benchmark("control.analyze_day")
+def bench_control_analyze_day(ctx):
+    import numpy as np
+    from src.services.control_analysis import analyze_arrays
+    # Satu hari @ 1 sampel / 2 detik, SET berubah di tengah hari, jendela 1 jam
+    rng = np.random.default_rng(0)
+    n = 43200
+    timestamps = time.time() + np.arange(n) * 2.0
+    setpoint = np.where(np.arange(n) < n // 2, 37.5, 38.0)
+    temperature = setpoint + rng.normal(0, 0.2, n)
+    power = rng.uniform(0, 60, n)
+    return lambda: analyze_arrays(timestamps, temperature, power, setpoint, 3600)
+
+@benchmark("graphs.update_graph_plot")
+def bench_update_graph_plot(ctx):
+    window = ctx.window
+    graphs = window.graphs_helper
+    clock = [float(window.graph_data["timestamps"][-1])]
+
+    def run():
+        # Satu sampel baru per frame, seperti saat live
+        clock[0] += 2.0
+        window.graph_data.append(clock[0], 37.5, 60.0)
+        graphs.update_graph_plot()
+    return run
+
+@benchmark("graphs.update_x_axis")
+def bench_update_x_axis(ctx):
+    return ctx.window.graphs_helper.update_x_axis
+
+@benchmark("auth.encrypt")
+def bench_encrypt(ctx):
+    from src.services.auth_service import AuthService
+    AuthService._get_key()   # Penurunan kunci PBKDF2 tidak ikut diukur
+    return lambda: AuthService._encrypt_data("operator-kandang-01")
+
+@benchmark("auth.decrypt")
+def bench_decrypt(ctx):
+    from src.services.auth_service import AuthService
+    token = AuthService._encrypt_data("operator-kandang-01")
+    return lambda: AuthService._decrypt_data(token)
+
+@benchmark("datastore.save")
+def bench_datastore_save(ctx):
+    from src.services.data_store import DataStore
+    store = DataStore("bench/incubation_data.json")
+    start = datetime.now()
+    return lambda: store.save_incubation_data(start, 21)
+
+@benchmark("datastore.load")
+def bench_datastore_load(ctx):
+    from src.services.data_store import DataStore
+    store = DataStore("bench/incubation_data.json")
+    store.save_incubation_data(datetime.now(), 21)
+    return store.load_incubation_data
+
+@benchmark("fleet.advance_5000")
+def bench_fleet_advance(ctx):
+    from fleet_simulation import FleetState
+    fleet = FleetState(5000, seed=0, now=0.0)
+    clock = [0.0]
+
+    def run():
+        # Satu tick fisika untuk 5000 device (load_generator)
+        clock[0] += FleetState.TICK
+        fleet.advance(clock[0])
+    return run
+
+# =========================================================================
+# RUNNER
+# =========================================================================
+
+def measure(fn, rounds):
+    """Kalibrasi jumlah iterasi per ronde lalu ukur waktu per operasi"""
+    fn()   # Warm-up (cache, import lazy)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= ROUND_TARGET:
+            break
+        number = max(number * 2, int(number * ROUND_TARGET / max(elapsed, 1e-9)))
+
+    per_op = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_op.append((time.perf_counter() - start) / number * 1e6)
+
+    median = statistics.median(per_op)
+    return {
+        "median_us": median,
+        "min_us": min(per_op),
+        "mean_us": statistics.fmean(per_op),
+        "stdev_us": statistics.stdev(per_op) if rounds > 1 else 0.0,
+        "ops_per_sec": 1e6 / median if median else math.inf,
+        "rounds": rounds,
+        "number": number,
+    }
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _metadata(args):
+    from PyQt6.QtCore import QT_VERSION_STR
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "qt": QT_VERSION_STR,
+        "qpa": os.environ.get("QT_QPA_PLATFORM"),
+        "graph_points": args.graph_points,
+        "rounds": args.rounds,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur panas dashboard KARTEL")
+    parser.add_argument("-o", "--output", help="File JSON hasil (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="Jalankan benchmark yang namanya mengandung teks ini (bisa berulang)")
+    parser.add_argument("--rounds", type=int, default=7, help="Jumlah ronde per benchmark (default: %(default)s)")
+    parser.add_argument("--graph-points", type=int, default=100000,
+                        help="Jumlah titik di buffer grafik (default: %(default)s)")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar benchmark lalu keluar")
+    args = parser.parse_args()
+
+    selected = [(name, setup) for name, setup in BENCHMARKS
+                if not args.filter or any(f in name for f in args.filter)]
+    if args.list or not selected:
+        for name, _ in (selected or BENCHMARKS):
+            print(name)
+        return 0 if selected else 1
+
+    run_id = _git_commit() or datetime.now().strftime("%Y%m%d-%H%M%S")
+    output = os.path.abspath(args.output or os.path.join(RESULTS_DIR, f"{run_id}.json"))
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="kartel-bench-") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        ctx = Context(args.graph_points)
+        try:
+            for name, setup in selected:
+                # Output print dari kode aplikasi dibisukan selama pengukuran
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = measure(setup(ctx), args.rounds)
+                r = results[name]
+                print(f"{name:36} {r['median_us']:11.2f} us  (min {r['min_us']:.2f}, ±{r['stdev_us']:.2f}, n={r['number']})")
+            meta = _metadata(args)
+        finally:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ctx.close()
+            os.chdir(previous_cwd)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"💾 Hasil disimpan ke {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Soak test dipercepat: satu batch inkubasi penuh (default 28 hari) diputar
+dalam hitungan menit dengan VirtualClock (src/utils/clock.py).
+
+Paket sensor dari FleetState (fleet_simulation.py) dimasukkan lewat jalur
+yang sama dengan paket MQTT asli (_on_message -> MqttService -> Controller ->
+jendela dashboard), lalu jendela digambar ulang secara berkala. Setiap
+--sample-hours jam simulasi dicatat RSS, jumlah objek Python, memori
+tracemalloc (opsional), serta latensi per paket & per frame, sehingga kebocoran memori
+atau perlambatan terlihat sebelum batch sungguhan berjalan.
+
+    python benchmarks/soak_test.py                          # 28 hari, paket tiap 2 detik
+    python benchmarks/soak_test.py --days 3 --devices 4 -o soak.json
+    python benchmarks/soak_test.py --tracemalloc            # + rincian alokasi (~5x lebih lambat)
+
+Exit code 1 jika RSS / jumlah objek / latensi tumbuh melewati batas, atau
+hitungan hari & batas history tidak sesuai. Semua file ditulis ke folder sementara.
+"""
+import os
+import sys
+import io
+import gc
+import json
+import time
+import argparse
+import resource
+import tempfile
+import statistics
+import contextlib
+import tracemalloc
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from fleet_simulation import FleetState
+from src.utils.clock import VirtualClock, set_clock
+
+WARMUP_DAYS = 1.0   # Baseline pertumbuhan diambil setelah hari pertama (cache & buffer terisi)
+
+# =========================================================================
+# PENGUKURAN
+# =========================================================================
+
+def rss_mb():
+    """RSS saat ini (Linux: /proc), selain itu puncak RSS dari getrusage"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class SoakRecorder:
+    """Kumpulkan latensi per jendela sampel dan snapshot sumber daya"""
+
+    def __init__(self, use_tracemalloc):
+        self.use_tracemalloc = use_tracemalloc
+        self.samples = []
+        self.message_us = []
+        self.frame_ms = []
+        self.started = time.perf_counter()
+        self.baseline_snapshot = None
+
+    def record(self, day):
+        gc.collect()
+        sample = {
+            "day": round(day, 3),
+            "real_s": round(time.perf_counter() - self.started, 1),
+            "rss_mb": round(rss_mb(), 1),
+            "objects": len(gc.get_objects()),
+            "msg_p50_us": round(statistics.median(self.message_us), 1) if self.message_us else 0.0,
+            "msg_p99_us": round(percentile(self.message_us, 0.99), 1),
+            "msg_max_us": round(max(self.message_us, default=0.0), 1),
+            "frame_p50_ms": round(statistics.median(self.frame_ms), 2) if self.frame_ms else 0.0,
+            "frame_max_ms": round(max(self.frame_ms, default=0.0), 2),
+        }
+        if self.use_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            sample["traced_mb"] = round(current / 2**20, 2)
+            sample["traced_peak_mb"] = round(peak / 2**20, 2)
+            if self.baseline_snapshot is None and day >= WARMUP_DAYS:
+                self.baseline_snapshot = tracemalloc.take_snapshot()
+
+        self.samples.append(sample)
+        self.message_us.clear()
+        self.frame_ms.clear()
+        return sample
+
+    def top_growth(self, limit=10):
+        """Baris kode dengan pertambahan alokasi terbesar sejak baseline"""
+        if not self.use_tracemalloc or self.baseline_snapshot is None:
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self.baseline_snapshot, "lineno")
+        return [
+            {"where": str(stat.traceback[0]), "size_diff_kb": round(stat.size_diff / 1024, 1),
+             "count_diff": stat.count_diff}
+            for stat in stats[:limit] if stat.size_diff > 0
+        ]
+
+def print_sample(sample, file=None):
+    traced = f" | traced {sample['traced_mb']:7.2f} MB" if "traced_mb" in sample else ""
+    print(f"📊 hari {sample['day']:6.2f} ({sample['real_s']:6.1f}s) | RSS {sample['rss_mb']:7.1f} MB | "
+          f"objek {sample['objects']:8d}{traced} | paket p50 {sample['msg_p50_us']:7.1f}us "
+          f"p99 {sample['msg_p99_us']:7.1f}us | frame p50 {sample['frame_p50_ms']:6.2f}ms "
+          f"max {sample['frame_max_ms']:7.2f}ms", file=file)
+
+# =========================================================================
+# SIMULASI
+# =========================================================================
+
+def open_dashboard(app):
+    from src.views.main_window import KartelMainWindow
+    # Sinkronisasi profil awal membuka dialog modal; tidak relevan untuk soak test
+    KartelMainWindow.force_sync_current_profile = lambda window: None
+    window = KartelMainWindow()
+    window.show()
+    while window.graphs_helper is None:   # Panel grafik dibangun setelah frame pertama
+        app.processEvents()
+        time.sleep(0.01)
+    return window
+
+def ingest_interval(clock, interval, service, fleet, device_ids, recorder):
+    """Satu interval paket: fisika armada maju, lalu paket semua device diproses service"""
+    now = clock.advance(interval)
+    fleet.advance(now)
+    rows = zip(device_ids, fleet.temp.round(1).tolist(), fleet.hum.round(1).tolist(),
+               fleet.power.tolist(), fleet.rotate_values(now).tolist(), fleet.target.tolist())
+
+    for device_id, temp, hum, power, rotate, target in rows:
+        msg = SimpleNamespace(payload=json.dumps({
+            "device_id": device_id, "temperature": temp, "humidity": hum,
+            "power": power, "rotate_on": rotate, "SET": target,
+        }).encode())
+        started = time.perf_counter()
+        service._on_message(None, None, msg)
+        recorder.message_us.append((time.perf_counter() - started) * 1e6)
+
+def run_soak(args, clock):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        window = open_dashboard(app)
+        service = window.controller.mqtt_service
+        start = clock.now()
+        service.set_manual_start_date(start.year, start.month, start.day)
+        service.device_settings["total_days"] = args.days
+        service.day_inputs_changed.emit()
+
+    recorder = SoakRecorder(args.tracemalloc)
+    fleet = FleetState(args.devices, seed=args.seed, now=clock.time())
+    fleet.TICK = args.interval   # Satu langkah fisika per paket
+    device_ids = [f"soak-{i:03d}" for i in range(args.devices)]
+
+    start_time = clock.time()
+    end_time = start_time + args.days * 86400
+    next_day = service.incubation_start_date + timedelta(days=service.current_day)
+    next_sample = clock.time() + args.sample_hours * 3600
+    intervals = 0
+    errors = []
+    console = sys.stdout
+
+    # Print dari kode aplikasi (alarm, log) dibisukan selama simulasi
+    with contextlib.redirect_stdout(io.StringIO()) as app_output:
+        while clock.time() < end_time:
+            ingest_interval(clock, args.interval, service, fleet, device_ids, recorder)
+            app_output.seek(0)
+            app_output.truncate()
+
+            intervals += 1
+            if intervals % args.render_every == 0:
+                started = time.perf_counter()
+                window.render_scheduler.flush()
+                app.processEvents()
+                recorder.frame_ms.append((time.perf_counter() - started) * 1000)
+
+            if clock.now() >= next_day:
+                # Timer hari berjalan di jam nyata; di sini dipicu oleh jam virtual
+                service._refresh_incubation_day()
+                expected = (clock.now() - service.incubation_start_date).days + 1
+                if service.current_day != expected:
+                    errors.append(f"hari ke-{service.current_day}, seharusnya {expected}")
+                next_day = service.incubation_start_date + timedelta(days=service.current_day)
+
+            if clock.time() >= next_sample:
+                next_sample += args.sample_hours * 3600
+                print_sample(recorder.record((clock.time() - start_time) / 86400), file=console)
+
+        errors.extend(check_limits(service, window))
+        growth = recorder.top_growth()
+        window.controller.cleanup()
+        window.close()
+    return recorder.samples, growth, errors
+
+def check_limits(service, window):
+    """History di memori harus tetap dibatasi setelah satu batch penuh"""
+    errors = []
+    history = service.get_historical_data()
+    if len(history["timestamps"]) > history["max_points"]:
+        errors.append(f"historical_data {len(history['timestamps'])} > max_points {history['max_points']}")
+    graph = window.graph_data
+    if len(graph) > graph.max_points * (1 + graph.TRIM_SLACK) + 1:
+        errors.append(f"graph_data {len(graph)} > batas {graph.max_points}")
+    return errors
+
+def check_growth(samples, args):
+    """Bandingkan sampel pertama setelah warm-up dengan sampel terakhir"""
+    baseline = next((s for s in samples if s["day"] >= WARMUP_DAYS), None)
+    last = samples[-1] if samples else None
+    if baseline is None or last is baseline:
+        return {}, []
+
+    growth = {
+        "rss_mb": round(last["rss_mb"] - baseline["rss_mb"], 1),
+        "objects": last["objects"] - baseline["objects"],
+        "msg_p50_ratio": round(last["msg_p50_us"] / baseline["msg_p50_us"], 2) if baseline["msg_p50_us"] else 1.0,
+    }
+    errors = []
+    if growth["rss_mb"] > args.max_rss_growth:
+        errors.append(f"RSS naik {growth['rss_mb']} MB (batas {args.max_rss_growth} MB)")
+    if growth["objects"] > args.max_object_growth:
+        errors.append(f"jumlah objek naik {growth['objects']} (batas {args.max_object_growth})")
+    if growth["msg_p50_ratio"] > 1 + args.max_latency_growth:
+        errors.append(f"latensi paket p50 naik {growth['msg_p50_ratio']}x")
+    return growth, errors
+
+# =========================================================================
+# MAIN
+# =========================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test batch inkubasi dengan jam virtual")
+    parser.add_argument("--days", type=int, default=28, help="Lama batch simulasi, hari (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Jeda antar paket per device, detik simulasi (default: %(default)s)")
+    parser.add_argument("--devices", type=int, default=1, help="Jumlah device (default: %(default)s)")
+    parser.add_argument("--render-every", type=int, default=300,
+                        help="Gambar ulang jendela tiap N interval paket (default: %(default)s)")
+    parser.add_argument("--sample-hours", type=float, default=12.0,
+                        help="Jarak antar sampel pengukuran, jam simulasi (default: %(default)s)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Lacak alokasi dengan tracemalloc (baris kode yang memorinya terus bertambah)")
+    parser.add_argument("--max-rss-growth", type=float, default=64.0,
+                        help="Kenaikan RSS maksimal setelah warm-up, MB (default: %(default)s)")
+    parser.add_argument("--max-object-growth", type=int, default=20000,
+                        help="Kenaikan jumlah objek Python maksimal (default: %(default)s)")
+    parser.add_argument("--max-latency-growth", type=float, default=0.5,
+                        help="Kenaikan latensi paket p50 maksimal, 0.5 = 50%% (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed simulasi (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="Simpan hasil (JSON)")
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    # Batch dimulai jam 08:00 hari ini; jam virtual dipasang sebelum service dibuat
+    start = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+    clock = VirtualClock(start)
+    previous_clock = set_clock(clock)
+
+    print(f"🧪 Soak test {args.days} hari, {args.devices} device, paket tiap {args.interval:g}s "
+          f"({int(args.days * 86400 / args.interval) * args.devices} paket)")
+
+    with tempfile.TemporaryDirectory(prefix="kartel-soak-") as workdir:
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            samples, top_growth, errors = run_soak(args, clock)
+        finally:
+            os.chdir(previous_cwd)
+            set_clock(previous_clock)
+
+    growth, growth_errors = check_growth(samples, args)
+    errors.extend(growth_errors)
+
+    if top_growth:
+        print("🔎 Alokasi yang paling bertambah sejak warm-up:")
+        for item in top_growth:
+            print(f"   {item['size_diff_kb']:+10.1f} KB {item['count_diff']:+8d} blok  {item['where']}")
+    if growth:
+        print(f"📈 Pertumbuhan setelah warm-up: RSS {growth['rss_mb']:+.1f} MB, "
+              f"objek {growth['objects']:+d}, latensi paket p50 x{growth['msg_p50_ratio']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "samples": samples, "growth": growth,
+                       "top_growth": top_growth, "errors": errors}, f, indent=2)
+        print(f"💾 Hasil disimpan ke {args.output}")
+
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        return 1
+    print("✅ Soak test lolos")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
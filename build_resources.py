@@ -0,0 +1,149 @@
+"""
+Build bundle resource Qt (.rcc) dari folder asset/.
+
+PyQt6 tidak menyertakan tool `rcc`, jadi file biner .rcc (format versi 2,
+sama dengan output `rcc -binary`) ditulis langsung dari Python.
+Bundle di-register saat runtime oleh src/utils/assets.py.
+
+Cara pakai:
+    python build_resources.py                 # -> kartel_assets.rcc
+    python build_resources.py -o dist/app.rcc
+
+Untuk build PyInstaller, sertakan bundle ini (--add-data "kartel_assets.rcc;.")
+sebagai pengganti folder asset/.
+"""
+import os
+import sys
+import struct
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT_DIR)
+
+from src.config.settings import ASSET_BUNDLE
+
+RCC_VERSION = 2
+FLAG_DIRECTORY = 0x02
+LOCALE_ANY_TERRITORY = 0
+LOCALE_C = 1
+SKIP_EXTENSIONS = {".ico"}   # Ikon .ico hanya dipakai oleh installer/EXE
+
+def qt_hash(name):
+    """Hash nama node (sama dengan qt_hash() di QtCore), dipakai untuk binary search"""
+    encoded = name.encode('utf-16-be')
+    h = 0
+    for unit in struct.unpack(f">{len(encoded) // 2}H", encoded):
+        h = ((h << 4) + unit) & 0xFFFFFFFF
+        h ^= (h & 0xF0000000) >> 23
+        h &= 0x0FFFFFFF
+    return h
+
+class _Node:
+    def __init__(self, name, path=None):
+        self.name = name
+        self.path = path          # None untuk direktori
+        self.children = {}
+        self.mtime_ms = 0
+
+    @property
+    def is_dir(self):
+        return self.path is None
+
+    def sorted_children(self):
+        return sorted(self.children.values(), key=lambda n: qt_hash(n.name))
+
+def collect_tree(asset_dir):
+    """Susun pohon node: root -> asset/ -> subfolder -> file"""
+    root = _Node("")
+    asset_node = _Node("asset")
+    root.children["asset"] = asset_node
+
+    for folder, dirs, files in os.walk(asset_dir):
+        dirs.sort()
+        rel = os.path.relpath(folder, asset_dir)
+        node = asset_node
+        if rel != ".":
+            for part in rel.split(os.sep):
+                node = node.children.setdefault(part, _Node(part))
+
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1].lower() in SKIP_EXTENSIONS:
+                continue
+            path = os.path.join(folder, filename)
+            child = _Node(filename, path)
+            child.mtime_ms = int(os.path.getmtime(path) * 1000)
+            node.children[filename] = child
+    return root
+
+def build_rcc(asset_dir, output_file):
+    root = collect_tree(asset_dir)
+
+    # Urutan node breadth-first; anak satu direktori harus bersebelahan
+    # dan terurut berdasarkan hash nama (QResource memakai binary search)
+    ordered = [root]
+    first_child = {}
+    index = 0
+    while index < len(ordered):
+        node = ordered[index]
+        if node.is_dir:
+            first_child[id(node)] = len(ordered)
+            ordered.extend(node.sorted_children())
+        index += 1
+
+    names = bytearray()
+    name_offsets = {}
+    payloads = bytearray()
+    data_offsets = {}
+
+    for node in ordered[1:]:
+        if node.name not in name_offsets:
+            name_offsets[node.name] = len(names)
+            encoded = node.name.encode('utf-16-be')
+            names += struct.pack(">HI", len(encoded) // 2, qt_hash(node.name)) + encoded
+
+        if not node.is_dir:
+            with open(node.path, 'rb') as f:
+                content = f.read()
+            data_offsets[id(node)] = len(payloads)
+            payloads += struct.pack(">I", len(content)) + content
+
+    tree = bytearray()
+    for node in ordered:
+        name_offset = name_offsets.get(node.name, 0)
+        if node.is_dir:
+            tree += struct.pack(">iHii", name_offset, FLAG_DIRECTORY,
+                                len(node.children), first_child[id(node)])
+        else:
+            # territory=AnyTerritory(0), language=C(1): berlaku untuk semua locale
+            tree += struct.pack(">iHHHi", name_offset, 0, LOCALE_ANY_TERRITORY,
+                                LOCALE_C, data_offsets[id(node)])
+        tree += struct.pack(">q", node.mtime_ms)
+
+    header_size = 4 + 4 * 4
+    tree_offset = header_size
+    data_offset = tree_offset + len(tree)
+    names_offset = data_offset + len(payloads)
+
+    with open(output_file, 'wb') as f:
+        f.write(b"qres")
+        f.write(struct.pack(">iiii", RCC_VERSION, tree_offset, data_offset, names_offset))
+        f.write(tree)
+        f.write(payloads)
+        f.write(names)
+
+    file_count = sum(1 for n in ordered if not n.is_dir)
+    return file_count, names_offset + len(names)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build bundle aset Qt (.rcc) untuk KARTEL")
+    parser.add_argument("-o", "--output", default=os.path.join(ROOT_DIR, ASSET_BUNDLE["file"]),
+                        help="File output (default: %(default)s)")
+    parser.add_argument("--asset-dir", default=os.path.join(ROOT_DIR, "asset"),
+                        help="Folder aset sumber (default: %(default)s)")
+    args = parser.parse_args()
+
+    file_count, size = build_rcc(args.asset_dir, args.output)
+    print(f"📦 {file_count} aset ditulis ke {args.output} ({size / 1024:.1f} KiB)")
+
+if __name__ == "__main__":
+    main()
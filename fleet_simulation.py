@@ -0,0 +1,116 @@
+"""
+Simulasi fisika banyak inkubator sekaligus (vektor NumPy).
+
+Model per device sama dengan IncubatorState di incubator_simulation.py
+(pemanas P-control, pendinginan, noise sensor, timer relay motor), tetapi
+state seluruh armada disimpan sebagai array sehingga satu tick untuk ribuan
+device hanya beberapa operasi NumPy. Dipakai oleh load_generator.py.
+
+    fleet = FleetState(5000, seed=42)
+    fleet.advance(time.time())              # maju ke waktu sekarang (per tick 0.1 detik)
+    fleet.temp, fleet.hum, fleet.power      # array hasil
+    fleet.rotate_values(now)                # nilai "rotate_on" yang dikirim device
+
+Seed yang sama (dan urutan advance() yang sama) menghasilkan data yang sama.
+"""
+import time
+
+import numpy as np
+
+class FleetState:
+    TICK = 0.1            # Detik, langkah fisika (sama dengan loop simulator ESP32)
+    MAX_CATCHUP = 600     # Maks. tick yang dikejar per advance() (sisanya dilompati)
+    KP = 40               # Gain P-control pemanas (%/°C)
+    HEATER_GAIN = 0.05    # °C per tick per 1% daya
+    COOLING = 0.02        # °C per tick kehilangan panas
+    TEMP_NOISE = 0.05
+    HUM_NOISE = 0.5
+    HUM_RANGE = (30.0, 95.0)
+
+    def __init__(self, size, seed=None, now=None, target=37.5,
+                 relay_interval=3 * 3600, relay_on_duration=6):
+        now = time.time() if now is None else now
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+
+        # Variasi antar device: suhu awal, kekuatan pemanas & isolasi berbeda
+        self.temp = self.rng.uniform(26.0, 30.0, size)
+        self.hum = self.rng.uniform(55.0, 65.0, size)
+        self.target = np.full(size, float(target))
+        self.power = np.zeros(size, dtype=np.int64)
+        self.heater_gain = self.HEATER_GAIN * self.rng.uniform(0.9, 1.1, size)
+        self.cooling = self.COOLING * self.rng.uniform(0.8, 1.2, size)
+
+        # Timer relay motor pembalik (detik); jadwal awal disebar agar tidak serentak
+        self.relay_interval = np.full(size, float(relay_interval))
+        self.relay_on_duration = np.full(size, float(relay_on_duration))
+        self.relay_on = np.zeros(size, dtype=bool)
+        self.last_relay_run = np.zeros(size)
+        self.next_rotate = now + self.rng.uniform(0, relay_interval, size)
+
+        self.boot_time = now
+        self.time = now
+
+    def step(self):
+        """Satu tick fisika untuk semua device"""
+        error = self.target - self.temp
+        np.floor(np.clip(error * self.KP, 0, 100), out=error)
+        self.power[:] = error
+        self.temp += error * self.heater_gain - self.cooling
+        self.temp += self.rng.uniform(-self.TEMP_NOISE, self.TEMP_NOISE, self.size)
+        self.hum += self.rng.uniform(-self.HUM_NOISE, self.HUM_NOISE, self.size)
+        np.clip(self.hum, *self.HUM_RANGE, out=self.hum)
+
+    def check_relays(self, now):
+        """Nyalakan relay yang jatuh tempo, matikan yang sudah berputar cukup lama"""
+        start = now >= self.next_rotate
+        if start.any():
+            self.relay_on |= start
+            self.last_relay_run[start] = now
+            self.next_rotate[start] = now + self.relay_interval[start]
+        self.relay_on &= (now - self.last_relay_run) < self.relay_on_duration
+
+    def advance(self, now):
+        """Jalankan tick fisika sampai `now`, lalu perbarui status relay"""
+        steps = int((now - self.time) / self.TICK)
+        if steps > self.MAX_CATCHUP:
+            # Tertinggal jauh (mis. proses sempat berhenti): lompati sisa waktu
+            self.time += (steps - self.MAX_CATCHUP) * self.TICK
+            steps = self.MAX_CATCHUP
+        for _ in range(steps):
+            self.step()
+        self.time += steps * self.TICK
+        self.check_relays(now)
+
+    def rotate_values(self, now, index=None):
+        """
+        Nilai "rotate_on" per device: sisa detik berputar (>= 1) saat relay ON,
+        atau sisa detik menuju putaran berikutnya saat diam.
+        """
+        index = slice(None) if index is None else index
+        relay_on = self.relay_on[index]
+        remaining_on = np.maximum(1, (self.last_relay_run[index] + self.relay_on_duration[index] - now).astype(np.int64))
+        until_next = np.maximum(0, (self.next_rotate[index] - now).astype(np.int64))
+        return np.where(relay_on, remaining_on, until_next)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Ukur kecepatan simulasi armada inkubator")
+    parser.add_argument("-n", "--devices", type=int, default=5000, help="Jumlah device (default: %(default)s)")
+    parser.add_argument("--ticks", type=int, default=1000, help="Jumlah tick (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fleet = FleetState(args.devices, seed=args.seed, now=0.0)
+    start = time.perf_counter()
+    for tick in range(1, args.ticks + 1):
+        fleet.advance(tick * FleetState.TICK)
+    elapsed = time.perf_counter() - start
+    print(f"⚡ {args.devices} device x {args.ticks} tick dalam {elapsed:.3f}s "
+          f"({args.devices * args.ticks / elapsed / 1e6:.1f} juta device-tick/detik)")
+    print(f"🌡 Suhu rata-rata {fleet.temp.mean():.2f}°C (min {fleet.temp.min():.2f}, max {fleet.temp.max():.2f}), "
+          f"relay ON: {int(fleet.relay_on.sum())}")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
+import os
+import sys
 import time
 import json
 import random
+import argparse
 import paho.mqtt.client as mqtt
 import re  # Diperlukan untuk parsing regex
 
 # ================= KONFIGURASI =================
 BROKER = "mqtt.teknohole.com"
 PORT = 1884
+
+# Override broker (sama dengan dashboard): KARTEL_BROKER=host[:port]
+if os.environ.get("KARTEL_BROKER"):
+    BROKER, _, _port = os.environ["KARTEL_BROKER"].partition(":")
+    PORT = int(_port) if _port else PORT
 USERNAME = ""
 PASSWORD = ""
 
@@ -131,7 +139,32 @@ def on_message(client, userdata, msg):
 
 # ================= MAIN PROGRAM =================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulator ESP32 inkubator KARTEL")
+    parser.add_argument("--broker", default=BROKER, help="Alamat broker (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=PORT, help="Port broker (default: %(default)s)")
+    parser.add_argument("--local-broker", action="store_true",
+                        help="Jalankan broker MQTT lokal di proses ini (uji offline)")
+    return parser.parse_args()
+
+def start_local_broker(port):
+    """Broker lokal di thread daemon; dashboard connect ke port yang sama"""
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from src.services.local_broker import LocalBroker
+    broker = LocalBroker(port=port)
+    broker.start_in_thread()
+    print(f"🛰 Broker lokal aktif di {broker.host}:{broker.port} "
+          f"(jalankan dashboard dengan KARTEL_BROKER={broker.host}:{broker.port})")
+    return broker
+
 def main():
+    global BROKER, PORT
+    args = parse_args()
+    BROKER, PORT = args.broker, args.port
+    if args.local_broker:
+        broker = start_local_broker(PORT)
+        BROKER = broker.host
+
     # Menambahkan mqtt.CallbackAPIVersion.VERSION1 agar kompatibel
     client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, "ESP32_Simulator_Python")
     
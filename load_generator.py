@@ -0,0 +1,413 @@
+"""
+Load generator: mensimulasikan banyak inkubator (1 - 5000) sekaligus.
+
+Berbeda dengan incubator_simulation.py (satu ESP32, loop sleep 0.1 detik),
+device dibagi ke beberapa proses worker. Tiap worker menjalankan satu event
+loop asyncio yang menggerakkan semua client paho miliknya (tanpa thread per
+client): socket didaftarkan ke loop lewat callback on_socket_*. Fisika semua
+device milik worker dihitung sekaligus per tick oleh FleetState
+(fleet_simulation.py); dengan --seed, data yang dihasilkan dapat diulang.
+
+Contoh:
+    python load_generator.py --devices 500 --rate 1 --broker localhost --port 1883
+    python load_generator.py --devices 5000 --workers 8 --rate 2 --jitter 0.3 \\
+        --format verbose --churn 6 --churn-downtime 15 --duration 300
+
+Payload memakai field yang sama dengan ESP32 (temperature, humidity, power,
+rotate_on, SET) ditambah "device_id" agar dashboard bisa membedakan device.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import signal
+import asyncio
+import argparse
+import itertools
+import multiprocessing as mp
+from queue import Empty
+
+import numpy as np
+import paho.mqtt.client as mqtt
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT_DIR)
+
+from src.config.settings import MQTT_SETTINGS
+from fleet_simulation import FleetState
+
+MAX_DEVICES = 5000
+DEVICES_PER_WORKER = 250      # Default pembagian device per proses
+RECONNECT_BACKOFF = (1.0, 30.0)
+WORKER_REPORT_INTERVAL = 1.0  # Detik, worker -> proses utama
+
+# ================= PAYLOAD =================
+# Satu baris = (device_id, temperature, humidity, power, rotate_on, SET, uptime),
+# nilai sudah berupa tipe Python (hasil .tolist() dari array armada)
+
+def _payload_esp32(row, rng):
+    device_id, temp, hum, power, rotate, target, _ = row
+    return (f'{{"device_id": "{device_id}", "temperature": {temp}, "humidity": {hum}, '
+            f'"power": {power}, "rotate_on": {rotate}, "SET": {target}}}')
+
+def _payload_compact(row, rng):
+    # Hanya sensor utama, tanpa spasi (ukuran paket minimum)
+    return f'{{"device_id":"{row[0]}","temperature":{row[1]},"humidity":{row[2]}}}'
+
+def _payload_verbose(row, rng):
+    # Field diagnostik tambahan: menguji parsing & bandwidth dengan paket besar
+    device_id, temp, hum, power, rotate, target, uptime = row
+    return json.dumps({
+        "device_id": device_id,
+        "temperature": temp,
+        "humidity": hum,
+        "power": power,
+        "rotate_on": rotate,
+        "SET": target,
+        "humidifier_power": 0,
+        "rssi": rng.randint(-90, -40),
+        "uptime": uptime,
+        "heap_free": rng.randint(90000, 120000),
+        "firmware": "kartel-esp32-sim/1.0",
+        "sensor": {"type": "SHT31", "status": "ok", "raw": [temp, hum]},
+    })
+
+PAYLOAD_FORMATS = {
+    "esp32": _payload_esp32,
+    "compact": _payload_compact,
+    "verbose": _payload_verbose,
+}
+
+# ================= ASYNCIO <-> PAHO =================
+
+class AsyncioClientDriver:
+    """Menggerakkan client paho non-threaded dari event loop asyncio"""
+
+    MISC_INTERVAL = 1.0
+
+    def __init__(self, loop, client):
+        self.loop = loop
+        self.client = client
+        self.misc_task = None
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_register_write
+        client.on_socket_unregister_write = self._on_unregister_write
+
+    def _on_socket_open(self, client, userdata, sock):
+        self.loop.add_reader(sock, client.loop_read)
+        self.misc_task = self.loop.create_task(self._misc_loop())
+
+    def _on_socket_close(self, client, userdata, sock):
+        self.loop.remove_reader(sock)
+        if self.misc_task:
+            self.misc_task.cancel()
+            self.misc_task = None
+
+    def _on_register_write(self, client, userdata, sock):
+        self.loop.add_writer(sock, client.loop_write)
+
+    def _on_unregister_write(self, client, userdata, sock):
+        self.loop.remove_writer(sock)
+
+    async def _misc_loop(self):
+        # Keepalive / retry QoS
+        while self.client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(self.MISC_INTERVAL)
+
+# ================= WORKER =================
+
+class WorkerStats:
+    __slots__ = ("published", "connected", "connects", "connect_failures", "disconnects", "churned")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class WorkerFleet:
+    """
+    Semua device milik satu worker: fisika dihitung sekaligus oleh FleetState,
+    jadwal publish disimpan sebagai array, dan tiap tick hanya device yang
+    jatuh tempo (dan terhubung) yang dikirimi payload.
+    """
+
+    def __init__(self, worker_id, indices, config, stats):
+        seed = [config["seed"], worker_id] if config["seed"] is not None else None
+        now = time.time()
+        self.config = config
+        self.stats = stats
+        self.device_ids = [f"{config['client_prefix']}-{i:05d}" for i in indices]
+        self.fleet = FleetState(len(self.device_ids), seed=seed, now=now)
+        self.rng = random.Random(None if seed is None else config["seed"] * 1000 + worker_id)
+
+        self.clients = [None] * len(self.device_ids)
+        self.connected = np.zeros(len(self.device_ids), dtype=bool)
+        self.next_publish = np.full(len(self.device_ids), np.inf)
+
+        self.interval = 1.0 / config["rate"]
+        self.tick = min(FleetState.TICK, self.interval / 2)
+        self.make_payload = PAYLOAD_FORMATS[config["format"]]
+
+    def schedule_first_publish(self, k, now):
+        # Fase awal acak agar publish device tidak serentak
+        self.next_publish[k] = now + self.rng.uniform(0, self.interval)
+
+    def publish_due(self, now):
+        fleet = self.fleet
+        fleet.advance(now)
+        due = np.flatnonzero(self.connected & (self.next_publish <= now))
+        if not len(due):
+            return
+
+        rows = zip(
+            [self.device_ids[k] for k in due.tolist()],
+            np.round(fleet.temp[due], 1).tolist(),
+            np.round(fleet.hum[due], 1).tolist(),
+            fleet.power[due].tolist(),
+            fleet.rotate_values(now, due).tolist(),
+            fleet.target[due].tolist(),
+            itertools.repeat(int(now - fleet.boot_time)),
+        )
+        topic, qos = self.config["topic"], self.config["qos"]
+        for k, row in zip(due.tolist(), rows):
+            self.clients[k].publish(topic, self.make_payload(row, self.rng), qos=qos)
+        self.stats.published += len(due)
+
+        # Jadwal berikutnya (+ jitter); jika tertinggal, lanjut dari sekarang
+        jitter = self.config["jitter"]
+        steps = self.interval * (1.0 + fleet.rng.uniform(-jitter, jitter, len(due)))
+        upcoming = self.next_publish[due] + steps
+        lagging = upcoming <= now
+        upcoming[lagging] = now + steps[lagging]
+        self.next_publish[due] = upcoming
+
+    async def run_publisher(self, stop):
+        while not stop.is_set():
+            started = time.time()
+            self.publish_due(started)
+            await asyncio.sleep(max(0.0, self.tick - (time.time() - started)))
+
+
+async def run_connection(k, fleet, stop):
+    """Siklus koneksi satu device: connect, churn, reconnect dengan backoff"""
+    loop = asyncio.get_running_loop()
+    config, stats, rng = fleet.config, fleet.stats, fleet.rng
+    device_id = fleet.device_ids[k]
+    churn_rate = config["churn"] / 3600.0   # Putus per detik per device
+    dropped = False   # Koneksi ditolak / putus tanpa diminta
+
+    def on_connect(client, userdata, flags, rc):
+        nonlocal dropped
+        if rc == 0:
+            fleet.connected[k] = True
+            fleet.schedule_first_publish(k, time.time())
+            stats.connected += 1
+        else:
+            dropped = True
+            stats.connect_failures += 1
+
+    def on_disconnect(client, userdata, rc):
+        nonlocal dropped
+        if rc != 0:
+            dropped = True
+        if fleet.connected[k]:
+            fleet.connected[k] = False
+            stats.connected -= 1
+            stats.disconnects += 1
+
+    # Ramp-up: koneksi awal disebar agar broker tidak dibanjiri CONNECT
+    await asyncio.sleep(rng.uniform(0, config["ramp"]))
+    backoff = RECONNECT_BACKOFF[0]
+
+    while not stop.is_set():
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, device_id)
+        if config["username"]:
+            client.username_pw_set(config["username"], config["password"])
+        client.on_connect = on_connect
+        client.on_disconnect = on_disconnect
+        AsyncioClientDriver(loop, client)
+        fleet.clients[k] = client
+        dropped = False
+
+        try:
+            client.connect(config["broker"], config["port"], MQTT_SETTINGS["keepalive"])
+            stats.connects += 1
+            backoff = RECONNECT_BACKOFF[0]
+        except OSError:
+            stats.connect_failures += 1
+            await asyncio.sleep(backoff * rng.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, RECONNECT_BACKOFF[1])
+            continue
+
+        session_end = time.time() + (rng.expovariate(churn_rate) if churn_rate > 0 else math.inf)
+        while not stop.is_set() and not dropped and time.time() < session_end:
+            await asyncio.sleep(min(1.0, max(0.0, session_end - time.time())))
+
+        if dropped:
+            # Broker memutus koneksi: connect ulang dengan backoff
+            client.disconnect()
+            await asyncio.sleep(backoff * rng.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, RECONNECT_BACKOFF[1])
+            continue
+
+        if fleet.connected[k]:
+            # Berhenti publish sebelum DISCONNECT dikirim; on_disconnect tidak
+            # lagi melihat flag ini, jadi hitungan koneksi dikurangi di sini
+            fleet.connected[k] = False
+            stats.connected -= 1
+            stats.disconnects += 1
+        client.disconnect()
+        await asyncio.sleep(0.1)   # Beri waktu paket DISCONNECT terkirim
+        if stop.is_set():
+            break
+
+        # Churn: device offline sebentar lalu connect ulang (client baru)
+        stats.churned += 1
+        await asyncio.sleep(config["churn_downtime"] * rng.uniform(0.5, 1.5))
+
+
+async def run_worker_async(worker_id, indices, config, stop_event, report_queue):
+    stats = WorkerStats()
+    stop = asyncio.Event()
+    fleet = WorkerFleet(worker_id, indices, config, stats)
+    tasks = [asyncio.create_task(run_connection(k, fleet, stop)) for k in range(len(fleet.device_ids))]
+    tasks.append(asyncio.create_task(fleet.run_publisher(stop)))
+
+    last_report = time.time()
+    while not stop_event.is_set():
+        await asyncio.sleep(0.5)
+        if time.time() - last_report >= WORKER_REPORT_INTERVAL:
+            last_report = time.time()
+            report_queue.put((worker_id, stats.as_dict()))
+
+    stop.set()
+    await asyncio.wait(tasks, timeout=5)
+    report_queue.put((worker_id, stats.as_dict()))
+
+
+def run_worker(worker_id, indices, config, stop_event, report_queue):
+    # Ctrl+C ditangani proses utama; worker berhenti lewat stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(run_worker_async(worker_id, indices, config, stop_event, report_queue))
+
+
+# ================= MAIN =================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load generator multi-inkubator untuk dashboard KARTEL")
+    parser.add_argument("-n", "--devices", type=int, default=10, help=f"Jumlah device (1-{MAX_DEVICES}, default: %(default)s)")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Jumlah proses worker (default: otomatis)")
+    parser.add_argument("--rate", type=float, default=0.5, help="Publish per detik per device (default: %(default)s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Variasi acak interval, 0-1 (default: %(default)s)")
+    parser.add_argument("--format", choices=sorted(PAYLOAD_FORMATS), default="esp32", help="Format payload (default: %(default)s)")
+    parser.add_argument("--churn", type=float, default=0.0, help="Rata-rata putus koneksi per device per jam (default: %(default)s)")
+    parser.add_argument("--churn-downtime", type=float, default=10.0, help="Rata-rata lama offline saat churn, detik (default: %(default)s)")
+    parser.add_argument("--ramp", type=float, default=None, help="Lama penyebaran koneksi awal, detik (default: devices/200)")
+    parser.add_argument("--duration", type=float, default=0, help="Lama tes, detik (0 = sampai Ctrl+C)")
+    parser.add_argument("--broker", default=MQTT_SETTINGS["broker"], help="Alamat broker (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=MQTT_SETTINGS["port"], help="Port broker (default: %(default)s)")
+    parser.add_argument("--topic", default=MQTT_SETTINGS["topics"]["sensor_data"], help="Topic publish (default: %(default)s)")
+    parser.add_argument("--qos", type=int, choices=(0, 1), default=0, help="QoS publish (default: %(default)s)")
+    parser.add_argument("--username", default=MQTT_SETTINGS["username"])
+    parser.add_argument("--password", default=MQTT_SETTINGS["password"])
+    parser.add_argument("--client-prefix", default="kartel-sim", help="Prefix client ID / device_id (default: %(default)s)")
+    parser.add_argument("--report", type=float, default=5.0, help="Interval laporan, detik (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed RNG agar run dapat diulang")
+    parser.add_argument("--local-broker", action="store_true",
+                        help="Jalankan broker MQTT lokal di proses utama pada --port (uji offline)")
+    args = parser.parse_args()
+
+    if not 1 <= args.devices <= MAX_DEVICES:
+        parser.error(f"--devices harus antara 1 dan {MAX_DEVICES}")
+    if args.rate <= 0:
+        parser.error("--rate harus > 0")
+    if not 0 <= args.jitter < 1:
+        parser.error("--jitter harus antara 0 dan 1")
+    if args.ramp is None:
+        args.ramp = args.devices / 200.0
+    if args.workers <= 0:
+        args.workers = min(os.cpu_count() or 1, math.ceil(args.devices / DEVICES_PER_WORKER))
+    args.workers = min(args.workers, args.devices)
+    return args
+
+def print_report(totals, elapsed, last_published, interval):
+    rate = (totals["published"] - last_published) / interval if interval > 0 else 0.0
+    print(f"📊 {elapsed:6.0f}s | terhubung {totals['connected']:5d} | {rate:8.1f} msg/s | "
+          f"total {totals['published']:9d} | putus {totals['disconnects']} | "
+          f"churn {totals['churned']} | gagal connect {totals['connect_failures']}")
+
+def main():
+    args = parse_args()
+    if args.local_broker:
+        from src.services.local_broker import LocalBroker
+        broker = LocalBroker(port=args.port)
+        args.broker, args.port = broker.host, broker.start_in_thread()
+        print(f"🛰 Broker lokal aktif di {args.broker}:{args.port}")
+    config = {
+        "broker": args.broker, "port": args.port, "topic": args.topic, "qos": args.qos,
+        "username": args.username, "password": args.password,
+        "client_prefix": args.client_prefix, "format": args.format,
+        "rate": args.rate, "jitter": args.jitter, "churn": args.churn,
+        "churn_downtime": args.churn_downtime, "ramp": args.ramp,
+        "report": args.report, "seed": args.seed,
+    }
+
+    print(f"🚀 {args.devices} device, {args.workers} worker, {args.rate} msg/s/device "
+          f"(target {args.devices * args.rate:.0f} msg/s) -> {args.broker}:{args.port} [{args.format}]")
+
+    stop_event = mp.Event()
+    report_queue = mp.Queue()
+    workers = [
+        mp.Process(target=run_worker, daemon=True,
+                   args=(w, range(w, args.devices, args.workers), config, stop_event, report_queue))
+        for w in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    latest = {}
+    start = last_report = time.time()
+    last_published = 0
+    try:
+        while args.duration <= 0 or time.time() - start < args.duration:
+            try:
+                worker_id, stats = report_queue.get(timeout=0.5)
+                latest[worker_id] = stats
+            except Empty:
+                pass
+            now = time.time()
+            if latest and now - last_report >= args.report:
+                totals = {key: sum(s[key] for s in latest.values()) for key in WorkerStats.__slots__}
+                print_report(totals, now - start, last_published, now - last_report)
+                last_published = totals["published"]
+                last_report = now
+    except KeyboardInterrupt:
+        print("\n🛑 Menghentikan load generator...")
+
+    elapsed = time.time() - start
+    stop_event.set()
+    deadline = time.time() + 10
+    while any(w.is_alive() for w in workers) and time.time() < deadline:
+        try:
+            worker_id, stats = report_queue.get(timeout=0.5)
+            latest[worker_id] = stats
+        except Empty:
+            pass
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+
+    if latest:
+        totals = {key: sum(s[key] for s in latest.values()) for key in WorkerStats.__slots__}
+        print(f"✅ Selesai: {totals['published']} pesan dalam {elapsed:.0f}s "
+              f"({totals['published'] / elapsed:.1f} msg/s rata-rata), {totals['connects']} connect, "
+              f"{totals['churned']} churn")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
 import sys
 import os
 import signal
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import qInstallMessageHandler, QtMsgType 
-import pyqtgraph as pg
+import multiprocessing
 
 # Tambahkan path root ke sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Profiler startup di-import paling awal (hanya stdlib) agar fase import ikut tercatat
+from src.utils.startup_profiler import startup_profiler, relaunch_with_importtime, PROFILE_FLAG
+
+if __name__ == "__main__" and PROFILE_FLAG in sys.argv:
+    # Jalankan ulang dengan `-X importtime`; proses ini hanya menunggu hasilnya
+    exit_code = relaunch_with_importtime()
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import qInstallMessageHandler, QtMsgType 
+startup_profiler.mark("import PyQt6")
+
 from src.views.main_window import KartelMainWindow
+from src.config.settings import MQTT_SETTINGS, parse_broker_address
+startup_profiler.mark("import main_window")
 
 # =========================================================
 # HANDLER UNTUK MEMBISUKAN WARNING QT YANG MENGGANGGU
@@ -34,24 +47,44 @@ def qt_message_handler(mode, context, message):
     
     print(f"{msg_type_str}: {message}")
 
+def configure_broker(argv):
+    """--broker host[:port] atau --local-broker (broker MQTT lokal di thread ini)"""
+    if "--broker" in argv and argv.index("--broker") + 1 < len(argv):
+        value = argv[argv.index("--broker") + 1]
+        MQTT_SETTINGS["broker"], MQTT_SETTINGS["port"] = parse_broker_address(value, MQTT_SETTINGS["port"])
+
+    if "--local-broker" in argv:
+        from src.services.local_broker import LocalBroker
+        broker = LocalBroker()
+        MQTT_SETTINGS["broker"], MQTT_SETTINGS["port"] = broker.host, broker.start_in_thread()
+        print(f"🛰 Broker lokal aktif di {broker.host}:{broker.port}")
+        return broker
+    return None
+
 def main():
     # Pasang handler kustom KITA SEBELUM membuat QApplication
     qInstallMessageHandler(qt_message_handler)
 
-    # Setup PyqtGraph
-    pg.setConfigOptions(antialias=True)
-    
     # Enable CTRL+C
     signal.signal(signal.SIGINT, signal.SIG_DFL)
     
+    # Opt-in: connect otomatis dengan kredensial tersimpan saat UI dibangun
+    if "--auto-connect" in sys.argv:
+        MQTT_SETTINGS["auto_connect"] = True
+    
+    # Uji offline: arahkan dashboard ke broker lain / broker lokal
+    local_broker = configure_broker(sys.argv)
+    
     app = QApplication(sys.argv)
     
     # Set Font Default
     app.setFont(QFont("Manrope", 10))
+    startup_profiler.mark("QApplication")
     
     # Init Window
     window = KartelMainWindow()
     window.show()
+    startup_profiler.mark("window.show()")
     
     try:
         sys.exit(app.exec())
@@ -59,4 +92,6 @@ def main():
         sys.exit(0)
 
 if __name__ == "__main__":
+    # Laporan batch memakai process pool ("spawn"); wajib untuk build PyInstaller
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -6,5 +6,18 @@ from .settings import (
     DEFAULT_SETTINGS,
     CONNECTION_RETRY,
     APP_NAME,
-    CREDENTIALS_FILE
+    CREDENTIALS_FILE,
+    RENDER_SETTINGS,
+    GRAPH_SETTINGS,
+    ICON_CACHE,
+    STARTUP_PROFILE,
+    ASSET_BUNDLE,
+    ALARM_SETTINGS,
+    BATCH_STATS,
+    CONTROL_ANALYSIS,
+    ANOMALY_SETTINGS,
+    BATCH_REPORT,
+    SCHEDULER_SETTINGS,
+    LOCAL_BROKER,
+    parse_broker_address
 )
@@ -31,9 +31,25 @@ MQTT_SETTINGS = {
         "command": "topic/penetasan/command"
     },
     "keepalive": 60,
-    "qos": 1
+    "qos": 1,
+    "auto_connect": False,    # Opt-in (atau `python main.py --auto-connect`): connect saat startup
+    "early_buffer_size": 500  # Paket yang ditahan sampai tampilan siap
 }
 
+def parse_broker_address(value, default_port):
+    """'host' atau 'host:port' -> (host, port)"""
+    host, sep, port = value.strip().rpartition(":")
+    if not sep:
+        return port, default_port
+    return host, int(port)
+
+# Arahkan dashboard/simulator ke broker lain tanpa mengubah file ini,
+# mis. KARTEL_BROKER=127.0.0.1:1883 untuk broker lokal
+if os.environ.get("KARTEL_BROKER"):
+    MQTT_SETTINGS["broker"], MQTT_SETTINGS["port"] = parse_broker_address(
+        os.environ["KARTEL_BROKER"], MQTT_SETTINGS["port"]
+    )
+
 # --- SENSOR DATA FORMAT ---
 DATA_FORMAT = {
     "sensor_keys": ["temperature", "humidity", "power", "rotate_on", "SET"],
@@ -57,4 +73,124 @@ CONNECTION_RETRY = {
     "max_attempts": 5,
     "retry_delay": 5,      
     "reconnect_delay": 30  
-}
\ No newline at end of file
+}
+# --- RENDER CONFIG ---
+RENDER_SETTINGS = {
+    "max_fps": 20,         # Batas repaint grafik & label per detik
+    "stats_interval": 1000 # ms, kartu statistik batch digambar ulang paling sering sekali per interval
+}
+
+# --- GRAPH CONFIG ---
+GRAPH_SETTINGS = {
+    "history_max_points": 21600,    # Buffer live di memori (~12 jam @ 1 sampel / 2 detik)
+    "live_window_seconds": 3600,    # Rentang sumbu X saat mengikuti data live
+    "symbol_max_density": 0.1       # Simbol per titik hanya jika <= 0.1 titik/piksel
+}
+
+
+# --- ICON CACHE ---
+ICON_CACHE = {
+    "max_entries": 128,                  # Batas pixmap di cache (LRU)
+    "warm_up": True,                     # Render semua ikon SVG setelah panel bertahap selesai
+    "warm_up_sizes": [20, 24, 40, 50]    # Ukuran ikon yang dipakai dashboard
+}
+# --- STARTUP PROFILING (python main.py --profile-startup) ---
+STARTUP_PROFILE = {
+    "report_file": "data/startup_profile.txt",      # Ringkasan fase init + import terlama
+    "importtime_log": "data/startup_importtime.log", # Output mentah `-X importtime`
+    "top_imports": 25                                # Jumlah modul terlama di laporan
+}
+
+# --- ASSET BUNDLE (hasil `python build_resources.py`) ---
+ASSET_BUNDLE = {
+    "enabled": True,              # Pakai bundle .rcc jika ada (fallback: file di asset/)
+    "file": "kartel_assets.rcc",  # Relatif ke root aplikasi / folder _MEIPASS
+    "prefix": "/kartel"           # Root path di dalam bundle -> ":/kartel/asset/..."
+}
+
+# --- ALARM ENGINE ---
+# Tipe rule: threshold | rate | band | stale
+# (rule "band" dengan `tolerance` memakai setpoint (SET) terakhir dari device sebagai titik tengah)
+ALARM_SETTINGS = {
+    "rules": [
+        {"id": "temp_high", "type": "threshold", "metric": "temperature", "op": ">", "limit": 39.5, "severity": "critical"},
+        {"id": "temp_low", "type": "threshold", "metric": "temperature", "op": "<", "limit": 35.0, "severity": "critical"},
+        {"id": "humidity_low", "type": "threshold", "metric": "humidity", "op": "<", "limit": 40.0, "severity": "warning"},
+        {"id": "humidity_high", "type": "threshold", "metric": "humidity", "op": ">", "limit": 80.0, "severity": "warning"},
+        {"id": "temp_rate", "type": "rate", "metric": "temperature", "window": 300, "max_delta": 1.5, "severity": "warning"},
+        {"id": "temp_band", "type": "band", "metric": "temperature", "target": "SET", "tolerance": 0.5, "max_seconds": 600, "severity": "warning"},
+        {"id": "sensor_stale", "type": "stale", "max_age": 60, "severity": "critical"},
+    ],
+    "cooldown_seconds": 300,       # Alarm yang sama (device + rule) maksimal sekali per cooldown
+    "max_alarms_per_minute": 30,   # Batas global semua device (token bucket)
+    "stale_check_interval": 10000  # ms, satu timer untuk semua device
+}
+
+# --- STATISTIK BATCH ---
+# Mean/varian, min/max & waktu dalam band sejak batch dimulai (disimpan di DataStore)
+BATCH_STATS = {
+    "temperature_tolerance": 0.5,   # °C dari setpoint (SET) = dalam band
+    "humidity_tolerance": 5.0,      # % dari target kelembaban = dalam band
+    "max_gap_seconds": 60,          # Jeda antar sampel lebih lama = device offline, tidak dihitung
+    "save_interval": 60000          # ms, simpan ke DataStore paling sering sekali per interval
+}
+
+# --- ANALISIS KONTROL PEMANAS ---
+# Overshoot, settling time, steady-state error & duty cycle dari history batch
+CONTROL_ANALYSIS = {
+    "band": 0.5,                 # °C, suhu dianggap settle jika |suhu - SET| <= band
+    "setpoint_step": 0.05,       # °C, perubahan SET yang dianggap step baru
+    "max_gap_seconds": 60,       # Jeda antar sampel lebih lama = device offline (segmen baru)
+    "window_seconds": 3600,      # Ukuran jendela cache
+    "settle_lookahead": 7200,    # Detik data setelah jendela ikut dibaca untuk settling
+    "reload_after": 60,          # Detik sebelum jendela yang belum lengkap dihitung ulang
+    "max_cached_windows": 256,
+    "dashboard_hours": 24        # Rentang ringkasan di kartu statistik batch
+}
+
+# --- LAPORAN AKHIR BATCH ---
+# HTML (grafik tren, statistik, analisis kontrol, alarm & perintah) dibuat sekali
+# setelah hari ke-total_days lewat, di proses terpisah (matplotlib Agg)
+BATCH_REPORT = {
+    "enabled": True,
+    "filename": "report.html",   # Disimpan di folder batch (data/history/<batch>/)
+    "max_workers": 2,            # Proses paralel di pool (CLI: banyak batch sekaligus)
+    "check_delay": 15,           # Detik setelah UI tampil sebelum cek batch selesai (pool tidak ikut startup)
+    "rollup_seconds": 3600,      # Resolusi grafik tren (mean & min-max per jam)
+    "max_table_rows": 500,       # Baris tabel alarm / perintah maksimal
+    "dpi": 100
+}
+
+# --- DETEKSI ANOMALI (EWMA & CUSUM) ---
+# Pergeseran pelan suhu/kelembaban & respons pemanas per device, sebelum batas alarm tercapai
+ANOMALY_SETTINGS = {
+    "enabled": True,
+    "tick_interval": 5000,       # ms, satu update vektor untuk semua device
+    "block_seconds": 60,         # Sampel dirata-rata per blok sebelum dinilai (meredam autokorelasi)
+    "warmup_blocks": 60,         # Blok per device untuk belajar baseline sebelum alarm aktif
+    "baseline_alpha": 0.005,     # Bobot EWMA lambat baseline mean/varian blok
+    "ewma_lambda": 0.1,          # Bobot EWMA skor z
+    "ewma_limit": 4.0,           # L, alarm jika |EWMA| > L * sigma_EWMA
+    "cusum_k": 0.75,             # Slack CUSUM (dalam sigma)
+    "cusum_h": 12.0,             # Ambang CUSUM (dalam sigma)
+    "z_clip": 6.0,               # Batasi skor z agar satu blok rusak tidak langsung alarm
+    # Sigma minimum per kanal: pergeseran yang lebih kecil tidak dianggap bermakna
+    "min_std": {"temperature": 0.1, "humidity": 1.0, "heater": 2.0},
+    "max_gap_seconds": 60,       # Jeda antar sampel lebih lama = blok dimulai ulang
+    "severity": "warning",
+    "initial_capacity": 64       # Baris array awal (berlipat dua saat device bertambah)
+}
+
+# --- TIMER SCHEDULER ---
+SCHEDULER_SETTINGS = {
+    "coalesce_ms": 1000,    # Job boleh dijalankan lebih awal s/d nilai ini agar wakeup digabung
+    "report_interval": 0    # Detik; >0 = cetak statistik wakeup/detik secara berkala
+}
+
+# --- BROKER LOKAL (uji offline & benchmark) ---
+# `python main.py --local-broker` atau `python -m src.services.local_broker`
+LOCAL_BROKER = {
+    "host": "127.0.0.1",
+    "port": 1883,
+    "max_pending_bytes": 8 * 1024 * 1024   # Buffer tulis per subscriber sebelum pesan dibuang
+}
@@ -198,11 +198,33 @@ class DashboardEventHandlers:
 
     def attempt_mqtt_connection(self):
         """Handle tombol Connect"""
+        self.view.panels_helper.ensure_sections_built()
+        form_empty = not self.view.user_input.text().strip() and not self.view.pass_input.text().strip()
+        if form_empty:
+            loaded, saved_creds = AuthService.cached_credentials()
+            if not loaded:
+                # Kredensial tersimpan masih didekripsi di background:
+                # connect dilanjutkan setelah form terisi
+                self.view.connect_btn.setText("Memuat kredensial...")
+                self.view.connect_btn.setEnabled(False)
+                AuthService.load_credentials_async(on_done=self._on_credentials_loaded)
+                return
+            # Sudah di cache tapi callback pengisian form belum tiba: isi sekarang
+            self.view.panels_helper.apply_saved_credentials(saved_creds)
+        self.connect_with_form()
+
+    def _on_credentials_loaded(self, saved_creds):
+        self.view.panels_helper.apply_saved_credentials(saved_creds)
+        self.connect_with_form()
+
+    def connect_with_form(self):
+        """Validasi isi form login lalu connect ke broker"""
         username = self.view.user_input.text().strip()
         password = self.view.pass_input.text().strip()
         remember_me = self.view.remember_checkbox.isChecked()
         
         if not username or not password:
+            self.reset_connect_button()
             self.show_message("Error", "Username dan password tidak boleh kosong!")
             return
         
@@ -210,6 +232,7 @@ class DashboardEventHandlers:
         valid_p = "kartel123"
         
         if username != valid_u or password != valid_p:
+            self.reset_connect_button()
             self.show_message("Error", "Username atau password salah!")
             return
         
@@ -222,8 +245,8 @@ class DashboardEventHandlers:
         
         if success:
             if remember_me:
-                # MENGGUNAKAN SERVICE BARU
-                AuthService.save_credentials(username, password)
+                # Enkripsi & simpan di worker thread (GUI tidak menunggu PBKDF2)
+                AuthService.save_credentials_async(username, password)
             else:
                 # Jika user uncheck remember me, hapus kredensial lama jika ada
                 AuthService.clear_credentials()
@@ -232,11 +255,15 @@ class DashboardEventHandlers:
         else:
             self.show_message("Error", "Gagal terhubung ke broker MQTT!")
         
+        self.reset_connect_button()
+
+    def reset_connect_button(self):
         self.view.connect_btn.setText("Hubungkan Ke Broker")
         self.view.connect_btn.setEnabled(True)
 
     def reset_mqtt_settings(self):
         """Handle tombol Disconnect / Reset"""
+        self.view.panels_helper.ensure_sections_built()
         try:
             # Panggil disconnect logic di controller
             if self.controller.data_manager.is_connected:
@@ -256,12 +283,11 @@ class DashboardEventHandlers:
         # Hapus kredensial tersimpan (MENGGUNAKAN SERVICE BARU)
         AuthService.clear_credentials()
         
-        # Update UI Indicator
+        # Update UI Indicator (lewat jalur yang sama dengan update status koneksi)
         if hasattr(self.view, 'status_connect_btn'):
-            self.view.status_connect_btn.setText(" Tidak Terhubung")
-            self.view.status_connect_btn.setObjectName("statusNotConnected")
-            # Refresh style
-            self.view.setStyleSheet(self.view.styleSheet()) 
+            status = self.controller.mqtt_service.get_connection_status()
+            status["connected"] = False
+            self.view.update_connection_display(status)
 
     # =========================================================================
     # 5. UTILITIES
@@ -1,11 +1,14 @@
 import sys
-from PyQt6.QtCore import QTimer, QObject, pyqtSignal
+from collections import deque
+from PyQt6.QtCore import QObject, pyqtSignal
 
 # Import Config
 from src.config.settings import MQTT_SETTINGS
 
 # Import Service
 from src.services.mqtt_service import MqttService 
+from src.services.auth_service import AuthService
+from src.utils.workers import run_in_background
 
 class MainController(QObject):
     """
@@ -14,10 +17,11 @@ class MainController(QObject):
     """
     
     # Sinyal untuk pembaruan GUI
-    data_updated = pyqtSignal(dict)       # Emit data sensor baru
-    status_updated = pyqtSignal(dict)     # Emit status perangkat (ON/OFF)
+    data_updated = pyqtSignal(object)     # Emit SensorSample baru
+    status_updated = pyqtSignal(object)   # Emit DeviceStatus (ON/OFF)
     connection_updated = pyqtSignal(dict) # Emit status koneksi MQTT
     error_occurred = pyqtSignal(str)      # Emit pesan error
+    alarm_raised = pyqtSignal(dict)       # Emit event alarm (raised/cleared)
     
     def __init__(self):
         super().__init__()
@@ -25,7 +29,18 @@ class MainController(QObject):
         # Inisialisasi Service
         self.mqtt_service = MqttService()
         
+        # Paket yang datang sebelum tampilan siap ditahan, lalu dikirim sekaligus
+        self.view_ready = False
+        self._early_packets = deque(maxlen=MQTT_SETTINGS["early_buffer_size"])
+        
         self.setup_service_connections()
+        
+        if MQTT_SETTINGS["auto_connect"]:
+            # Load kredensial + connect berjalan paralel dengan pembangunan UI
+            self.start_auto_connect()
+        else:
+            # Kunci enkripsi kredensial diturunkan di background sejak awal
+            AuthService.prewarm_key()
         print("✅ MainController initialized with MqttService")
     
     def setup_service_connections(self):
@@ -34,22 +49,13 @@ class MainController(QObject):
         self.mqtt_service.connection_changed.connect(self.on_connection_changed)
         self.mqtt_service.error_occurred.connect(self.on_error_occurred)
         self.mqtt_service.status_updated.connect(self.emit_status_update)
-        
-        # Timer Heartbeat UI
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_connection_status)
-        self.status_timer.start(5000)
-        
-        # Timer Realtime Status
-        self.device_status_timer = QTimer()
-        self.device_status_timer.timeout.connect(self.update_device_status_realtime)
-        self.device_status_timer.start(1000) 
+        self.mqtt_service.alarm_raised.connect(self.on_alarm_raised)
+        # Tanpa timer polling: status dikirim saat data masuk, koneksi berubah,
+        # hari inkubasi berganti, atau profil/target diubah
     
     def cleanup(self):
         try:
             print("🔄 Controller cleanup...")
-            if self.status_timer.isActive(): self.status_timer.stop()
-            if self.device_status_timer.isActive(): self.device_status_timer.stop()
             self.mqtt_service.disconnect()
         except Exception as e:
             print(f"⚠ Cleanup error: {e}")
@@ -58,24 +64,50 @@ class MainController(QObject):
     # LOGIC HANDLERS
     # =========================================================================
 
-    def on_real_data_received(self, data):
-        target_values = self.mqtt_service.get_target_values()
+    def start_auto_connect(self):
+        """Connect otomatis memakai kredensial tersimpan (dekripsi di worker thread)"""
+        run_in_background(
+            self._auto_connect_worker,
+            on_done=self._on_auto_connect_done,
+            on_error=lambda msg: print(f"⚠ Auto-connect gagal: {msg}")
+        )
+
+    def _auto_connect_worker(self):
+        """Worker thread: hanya dekripsi kredensial (connect tetap di thread GUI)"""
+        creds = AuthService.load_credentials()
+        if not creds or not creds.get("username") or not creds.get("password"):
+            return None
+        return creds
+
+    def _on_auto_connect_done(self, creds):
+        if not creds:
+            print("⏭ Auto-connect dilewati (tidak ada kredensial tersimpan)")
+            return
+        self.mqtt_service.set_credentials(creds["username"], creds["password"])
+        if self.mqtt_service.connect():
+            print(f"⚡ Auto-connect dimulai untuk: {creds['username']}")
+
+    def mark_view_ready(self):
+        """Dipanggil View setelah panel utama terbangun: kirim paket yang tertahan"""
+        if self.view_ready: return
+        self.view_ready = True
         
-        data_packet = {
-            "current": {
-                "temperature": data.get("temperature", 0.0),
-                "humidity": data.get("humidity", 0.0)
-            },
-            "target": {
-                "temperature": target_values["temperature"],
-                "humidity": target_values["humidity"]
-            },
-            "extra": {
-                "power": data.get("power", 0),
-                "rotate_on": data.get("rotate_on", 0)
-            }
-        }
-        self.data_updated.emit(data_packet)
+        early = list(self._early_packets)
+        self._early_packets.clear()
+        for packet in early:
+            self.data_updated.emit(packet)
+        if early:
+            print(f"📦 {len(early)} paket awal dikirim ke tampilan")
+        self.update_device_status_realtime()
+        self.update_connection_status()
+        self.mqtt_service.enable_batch_reports()
+
+    def on_real_data_received(self, sample):
+        # SensorSample sudah memuat target; diteruskan apa adanya ke View
+        if not self.view_ready:
+            self._early_packets.append(sample)
+            return
+        self.data_updated.emit(sample)
         self.update_device_status_realtime()
 
     def update_device_status_realtime(self):
@@ -88,6 +120,7 @@ class MainController(QObject):
     def on_connection_changed(self, connected):
         status = self.mqtt_service.get_connection_status()
         self.connection_updated.emit(status)
+        self.update_device_status_realtime()
 
     def update_connection_status(self):
         status = self.mqtt_service.get_connection_status()
@@ -96,6 +129,11 @@ class MainController(QObject):
     def on_error_occurred(self, error_message):
         self.error_occurred.emit(error_message)
 
+    def on_alarm_raised(self, event):
+        icon = "🚨" if event["state"] == "raised" else "✅"
+        print(f"{icon} [{event['severity']}] {event['device_id']}/{event['rule_id']}: {event['message']}")
+        self.alarm_raised.emit(event)
+
     # =========================================================================
     # PUBLIC METHODS (Dipanggil oleh View/EventHandlers)
     # =========================================================================
@@ -104,6 +142,14 @@ class MainController(QObject):
         """Mengambil data historis dari service untuk grafik"""
         return self.mqtt_service.get_historical_data()
 
+    def get_batch_stats(self):
+        """Ringkasan statistik batch (mean, varian, min/max, waktu dalam band)"""
+        return self.mqtt_service.get_batch_stats()
+
+    def get_history_store(self):
+        """Store history persisten (untuk zoom/pan grafik di luar buffer live)"""
+        return self.mqtt_service.get_history_store()
+
     def simulate_mqtt_connection(self, username, password):
         try:
             self.mqtt_service.set_credentials(username, password)
@@ -119,10 +165,14 @@ class MainController(QObject):
         self.mqtt_service.disconnect()
 
     def set_target_temperature(self, temperature: float):
-        return self.mqtt_service.set_target_temperature(temperature)
+        result = self.mqtt_service.set_target_temperature(temperature)
+        self.update_device_status_realtime()
+        return result
 
     def apply_profile(self, profile_name: str):
-        return self.mqtt_service.apply_profile(profile_name)
+        result = self.mqtt_service.apply_profile(profile_name)
+        self.update_device_status_realtime()
+        return result
 
     def get_incubation_profiles(self):
         return self.mqtt_service.get_incubation_profiles()
@@ -1,4 +1,12 @@
 # src/services/__init__.py
 from .auth_service import AuthService
 from .data_store import DataStore
-from .mqtt_service import MqttService
\ No newline at end of file
+from .history_store import HistoryStore
+from .mqtt_service import MqttService
+from .alarm_engine import AlarmEngine
+from .batch_stats import BatchStats
+# ControlAnalyzer sengaja tidak di-import di sini: main_window memuatnya
+# setelah frame pertama (from src.services.control_analysis import ...)
+from .anomaly_detection import FleetAnomalyDetector
+from .batch_report import BatchReportService
+from .records import SensorSample, DeviceStatus
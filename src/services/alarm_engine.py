@@ -0,0 +1,350 @@
+import threading
+from collections import deque, OrderedDict
+
+from src.config.settings import ALARM_SETTINGS
+
+METRIC_LABELS = {
+    "temperature": ("Suhu", "°C"),
+    "humidity": ("Kelembaban", "%"),
+}
+
+def _describe(metric, value):
+    label, unit = METRIC_LABELS.get(metric, (metric, ""))
+    return f"{label} {value:.1f}{unit}"
+
+# =========================================================================
+# RULES (state per device disimpan di dalam rule, update O(1) per sampel)
+# =========================================================================
+
+class ThresholdRule:
+    """Nilai metrik melewati batas tetap (op: '>' atau '<')"""
+
+    def __init__(self, rule_id, metric, op, limit, severity="warning"):
+        self.rule_id = rule_id
+        self.metric = metric
+        self.op = op
+        self.limit = float(limit)
+        self.severity = severity
+
+    def evaluate(self, device_id, sample, now):
+        value = sample.get(self.metric)
+        if value is None:
+            return None
+        active = value > self.limit if self.op == ">" else value < self.limit
+        return active, value, f"{_describe(self.metric, value)} {self.op} {self.limit:g}"
+
+    def reset(self):
+        pass
+
+
+class RateOfChangeRule:
+    """
+    Perubahan nilai dalam jendela `window` detik melebihi `max_delta`.
+    Min/max jendela dijaga dengan dua monotonic deque per device:
+    tiap sampel masuk & keluar deque paling banyak sekali (O(1) amortized).
+    """
+
+    def __init__(self, rule_id, metric, window, max_delta, severity="warning"):
+        self.rule_id = rule_id
+        self.metric = metric
+        self.window = float(window)
+        self.max_delta = float(max_delta)
+        self.severity = severity
+        self._windows = {}   # device_id -> (deque_min, deque_max) berisi (t, nilai)
+
+    def evaluate(self, device_id, sample, now):
+        value = sample.get(self.metric)
+        if value is None:
+            return None
+
+        window = self._windows.get(device_id)
+        if window is None:
+            window = self._windows[device_id] = (deque(), deque())
+        lows, highs = window
+
+        while lows and lows[-1][1] >= value:
+            lows.pop()
+        lows.append((now, value))
+        while highs and highs[-1][1] <= value:
+            highs.pop()
+        highs.append((now, value))
+
+        cutoff = now - self.window
+        while lows[0][0] < cutoff:
+            lows.popleft()
+        while highs[0][0] < cutoff:
+            highs.popleft()
+
+        rise = value - lows[0][1]
+        fall = highs[0][1] - value
+        delta = rise if rise >= fall else -fall
+        active = abs(delta) > self.max_delta
+        return active, delta, (
+            f"{_describe(self.metric, value)} berubah {delta:+.1f} "
+            f"dalam {self.window / 60:g} menit"
+        )
+
+    def reset(self):
+        self._windows.clear()
+
+
+class OutOfBandRule:
+    """
+    Nilai berada di luar pita [low, high] lebih lama dari `max_seconds`.
+    Jika `target` diisi (mis. "SET"), pita = target ± tolerance; nilai target
+    terakhir per device dipakai untuk pesan yang tidak membawa target.
+    Cukup simpan waktu mulai keluar pita & target terakhir per device (O(1)).
+    """
+
+    def __init__(self, rule_id, metric, max_seconds, low=None, high=None,
+                 target=None, tolerance=None, severity="warning"):
+        self.rule_id = rule_id
+        self.metric = metric
+        self.max_seconds = float(max_seconds)
+        self.low = low
+        self.high = high
+        self.target = target
+        self.tolerance = tolerance
+        self.severity = severity
+        self._outside_since = {}   # device_id -> timestamp pertama keluar pita
+        self._last_target = {}     # device_id -> nilai target terakhir yang diterima
+
+    def _band(self, device_id, sample):
+        if self.target is not None:
+            center = sample.get(self.target)
+            if center is None:
+                center = self._last_target.get(device_id)
+                if center is None:
+                    return None
+            else:
+                self._last_target[device_id] = center
+            return center - self.tolerance, center + self.tolerance
+        return self.low, self.high
+
+    def evaluate(self, device_id, sample, now):
+        value = sample.get(self.metric)
+        band = self._band(device_id, sample)
+        if value is None or band is None:
+            return None
+
+        low, high = band
+        if (low is None or value >= low) and (high is None or value <= high):
+            self._outside_since.pop(device_id, None)
+            return False, value, ""
+
+        since = self._outside_since.setdefault(device_id, now)
+        duration = now - since
+        return duration >= self.max_seconds, value, (
+            f"{_describe(self.metric, value)} di luar {low:.1f}-{high:.1f} "
+            f"selama {duration / 60:.0f} menit"
+        )
+
+    def reset(self):
+        self._outside_since.clear()
+        self._last_target.clear()
+
+
+class StaleRule:
+    """
+    Device tidak mengirim data lebih dari `max_age` detik.
+    Device diurutkan menurut waktu terakhir terlihat (OrderedDict): pengecekan
+    hanya membaca dari depan sampai ketemu device yang masih segar.
+    """
+
+    def __init__(self, rule_id, max_age, severity="critical"):
+        self.rule_id = rule_id
+        self.max_age = float(max_age)
+        self.severity = severity
+        self._last_seen = OrderedDict()   # device_id -> timestamp (terlama di depan)
+        self._stale = set()
+
+    def touch(self, device_id, now):
+        """Catat sampel masuk. True jika device sebelumnya dianggap stale"""
+        recovered = device_id in self._stale
+        if recovered:
+            self._stale.discard(device_id)
+        self._last_seen[device_id] = now
+        self._last_seen.move_to_end(device_id)
+        return recovered
+
+    def expired(self, now):
+        """Device yang baru saja melewati max_age: [(device_id, umur detik)]"""
+        cutoff = now - self.max_age
+        result = []
+        while self._last_seen:
+            device_id, last_seen = next(iter(self._last_seen.items()))
+            if last_seen >= cutoff:
+                break
+            self._last_seen.popitem(last=False)
+            self._stale.add(device_id)
+            result.append((device_id, now - last_seen))
+        return result
+
+    def reset(self):
+        self._last_seen.clear()
+        self._stale.clear()
+
+
+RULE_TYPES = {
+    "threshold": ThresholdRule,
+    "rate": RateOfChangeRule,
+    "band": OutOfBandRule,
+    "stale": StaleRule,
+}
+
+def build_rule(config):
+    config = dict(config)
+    rule_type = config.pop("type")
+    config["rule_id"] = config.pop("id")
+    return RULE_TYPES[rule_type](**config)
+
+# =========================================================================
+# ENGINE
+# =========================================================================
+
+class AlarmEngine:
+    """
+    Mengevaluasi rule alarm pada aliran data sensor (tanpa timer per device
+    dan tanpa membaca ulang history).
+    - Dedup: alarm hanya dikirim saat transisi normal -> alarm (dan sebaliknya)
+    - Rate limit: cooldown per (device, rule) + token bucket global. Alarm
+      yang tertahan rate limit tetap pending dan dikirim begitu diizinkan
+      selama kondisinya masih aktif
+    Thread-safe: ingest dipanggil dari thread MQTT, check_stale dari timer GUI.
+    """
+
+    def __init__(self, rules=None, cooldown_seconds=None, max_alarms_per_minute=None):
+        rules = ALARM_SETTINGS["rules"] if rules is None else rules
+        self.cooldown = float(cooldown_seconds if cooldown_seconds is not None
+                              else ALARM_SETTINGS["cooldown_seconds"])
+        self.rate_per_minute = float(max_alarms_per_minute if max_alarms_per_minute is not None
+                                     else ALARM_SETTINGS["max_alarms_per_minute"])
+
+        built = [r if hasattr(r, "rule_id") else build_rule(r) for r in rules]
+        self.stale_rules = [r for r in built if isinstance(r, StaleRule)]
+        self.sample_rules = [r for r in built if not isinstance(r, StaleRule)]
+
+        self._active = {}        # (device, rule) -> timestamp mulai alarm
+        self._notified = set()   # alarm aktif yang sudah dikirim (akan dikirim 'cleared')
+        self._last_raised = {}   # (device, rule) -> timestamp alarm terakhir dikirim
+        self._pending = {}       # alarm aktif yang tertahan rate limit -> (rule, nilai, pesan)
+        self._tokens = self.rate_per_minute
+        self._tokens_at = None
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def ingest(self, device_id, sample, now):
+        """Evaluasi satu sampel. Mengembalikan daftar event alarm (bisa kosong)"""
+        events = []
+        with self._lock:
+            for rule in self.stale_rules:
+                if rule.touch(device_id, now):
+                    self._transition(events, device_id, rule, False, None, "Data sensor kembali diterima", now)
+
+            for rule in self.sample_rules:
+                result = rule.evaluate(device_id, sample, now)
+                if result is not None:
+                    active, value, message = result
+                    if not active:
+                        message = "Kembali normal"
+                    self._transition(events, device_id, rule, active, value, message, now)
+        return events
+
+    def check_stale(self, now):
+        """Dipanggil berkala (satu timer untuk semua device); sekaligus kirim ulang alarm pending"""
+        events = []
+        with self._lock:
+            for rule in self.stale_rules:
+                for device_id, age in rule.expired(now):
+                    message = f"Tidak ada data sensor selama {age:.0f} detik"
+                    self._transition(events, device_id, rule, True, age, message, now)
+            for key, (rule, value, message) in list(self._pending.items()):
+                self._raise(events, key, rule, value, message, now)
+        return events
+
+    def report(self, detections, now):
+        """
+        Status dari detektor eksternal (mis. deteksi anomali) melewati dedup &
+        rate limit yang sama. detections: [(device_id, rule, aktif, nilai, pesan)]
+        """
+        events = []
+        with self._lock:
+            for device_id, rule, active, value, message in detections:
+                self._transition(events, device_id, rule, active, value, message, now)
+        return events
+
+    def reset(self):
+        """Lupakan semua state (mis. saat user memutus koneksi)"""
+        with self._lock:
+            for rule in self.stale_rules + self.sample_rules:
+                rule.reset()
+            self._active.clear()
+            self._notified.clear()
+            self._pending.clear()
+
+    def has_tracked_devices(self):
+        """True jika masih ada device yang dipantau rule stale"""
+        with self._lock:
+            return any(rule._last_seen for rule in self.stale_rules)
+
+    def active_alarms(self):
+        with self._lock:
+            return [
+                {"device_id": device_id, "rule_id": rule_id, "since": since}
+                for (device_id, rule_id), since in self._active.items()
+            ]
+
+    def _transition(self, events, device_id, rule, active, value, message, now):
+        key = (device_id, rule.rule_id)
+        was_active = key in self._active
+
+        if active:
+            if not was_active:
+                self._active[key] = now
+            if key not in self._notified:
+                self._raise(events, key, rule, value, message, now)
+        elif was_active:
+            del self._active[key]
+            self._pending.pop(key, None)
+            if key in self._notified:
+                self._notified.discard(key)
+                events.append(self._event("cleared", device_id, rule, value, message, now))
+
+    def _raise(self, events, key, rule, value, message, now):
+        """Kirim alarm jika rate limit mengizinkan; jika tidak, simpan sebagai pending"""
+        if not self._allow(key, now):
+            if key not in self._pending:
+                self.suppressed += 1
+            self._pending[key] = (rule, value, message)
+            return
+        self._pending.pop(key, None)
+        self._notified.add(key)
+        self._last_raised[key] = now
+        events.append(self._event("raised", key[0], rule, value, message, now))
+
+    def _allow(self, key, now):
+        last = self._last_raised.get(key)
+        if last is not None and now - last < self.cooldown:
+            return False
+
+        # Token bucket global: kapasitas & laju isi = rate_per_minute
+        if self._tokens_at is not None:
+            refill = (now - self._tokens_at) * self.rate_per_minute / 60.0
+            self._tokens = min(self.rate_per_minute, self._tokens + refill)
+        self._tokens_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    @staticmethod
+    def _event(state, device_id, rule, value, message, now):
+        return {
+            "state": state,
+            "device_id": device_id,
+            "rule_id": rule.rule_id,
+            "severity": rule.severity,
+            "value": value,
+            "message": message,
+            "timestamp": now,
+        }
@@ -0,0 +1,296 @@
+import math
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from src.config.settings import ANOMALY_SETTINGS
+
+class DetectorRule(NamedTuple):
+    """Identitas detektor untuk AlarmEngine (dedup, cooldown, rate limit)"""
+    rule_id: str
+    severity: str
+
+
+# Kanal yang dipantau per device (nilai per blok)
+#   temperature : rata-rata suhu - SET (suhu mentah jika perangkat tidak mengirim SET)
+#   humidity    : rata-rata kelembaban
+#   heater      : residual daya rata-rata blok terhadap laju suhu blok (°C/menit),
+#                 dari regresi EWMA per device. Saat stabil (laju ~0) ini adalah daya
+#                 yang dibutuhkan menahan suhu; pemanas melemah / insulasi bocor = naik
+CHANNELS = ("temperature", "humidity", "heater")
+CHANNEL_LABELS = {
+    "temperature": "Pergeseran suhu terhadap SET",
+    "humidity": "Pergeseran kelembaban",
+    "heater": "Respons pemanas berubah",
+}
+METHODS = ("ewma", "cusum")
+
+class FleetAnomalyDetector:
+    """
+    Deteksi perubahan online (EWMA & CUSUM) untuk seluruh device sekaligus.
+
+    State tiap device adalah satu baris pada array kontigu (device x kanal).
+    ingest() dari thread MQTT hanya menambah sampel ke akumulator blok device
+    (O(1)); update() dipanggil per tick dan menilai semua blok yang sudah
+    lengkap dalam satu rangkaian operasi NumPy. Hanya device yang status
+    alarmnya berubah yang dikembalikan sebagai daftar Python.
+
+    Suhu inkubator sangat berautokorelasi antar sampel, sehingga yang dinilai
+    adalah rata-rata per blok (`block_seconds`), dengan varian blok dipelajari
+    langsung dari data. Per kanal: baseline mean/varian dipelajari dengan EWMA
+    lambat (dibekukan selama alarm), nilai blok dinormalisasi ke skor z, lalu
+      - EWMA  : e = λ·z + (1-λ)·e, alarm jika |e| > L·sqrt(λ/(2-λ))
+      - CUSUM : S± = max(0, S± ± z - k), alarm jika S+ atau S- > h
+    Alarm baru aktif setelah `warmup_blocks` blok per device.
+    """
+
+    _ROW_FIELDS = {
+        # Akumulator blok yang sedang berjalan
+        "fresh": (bool, False), "block_n": (np.float64, 0.0), "power_n": (np.float64, 0.0),
+        "sum_temperature": (np.float64, 0.0), "sum_humidity": (np.float64, 0.0), "sum_power": (np.float64, 0.0),
+        "start_time": (np.float64, np.nan), "start_temperature": (np.float64, np.nan),
+        "last_time": (np.float64, np.nan), "last_temperature": (np.float64, np.nan),
+        # SET terakhir device: kanal suhu selalu suhu - SET (NaN = belum pernah dikirim)
+        "setpoint": (np.float64, np.nan),
+        # Regresi EWMA laju suhu -> daya (kanal heater)
+        "reg_x": (np.float64, 0.0), "reg_y": (np.float64, 0.0),
+        "reg_xx": (np.float64, 0.0), "reg_xy": (np.float64, 0.0), "reg_n": (np.float64, 0.0),
+    }
+    _CHANNEL_FIELDS = {
+        "count": (np.float64, 0.0), "mean": (np.float64, 0.0), "var": (np.float64, 0.0),
+        "ewma": (np.float64, 0.0), "cusum_pos": (np.float64, 0.0), "cusum_neg": (np.float64, 0.0),
+        "alarm_ewma": (bool, False), "alarm_cusum": (bool, False),
+    }
+
+    def __init__(self, settings=None, capacity=None):
+        self.settings = settings or ANOMALY_SETTINGS
+        s = self.settings
+        self.block_seconds = float(s["block_seconds"])
+        self.max_gap = float(s["max_gap_seconds"])
+        self.warmup = int(s["warmup_blocks"])
+        self.alpha = float(s["baseline_alpha"])
+        self.lam = float(s["ewma_lambda"])
+        self.ewma_limit = float(s["ewma_limit"]) * math.sqrt(self.lam / (2.0 - self.lam))
+        self.cusum_k = float(s["cusum_k"])
+        self.cusum_h = float(s["cusum_h"])
+        self.z_clip = float(s["z_clip"])
+        self.min_var = np.array([s["min_std"][c] for c in CHANNELS]) ** 2
+
+        self.rules = {
+            (channel, method): DetectorRule(f"{channel}_{method}", s["severity"])
+            for channel in CHANNELS for method in METHODS
+        }
+
+        self._index = {}        # device_id -> baris
+        self.device_ids = []
+        self._state = None
+        self._lock = threading.Lock()
+        self._allocate(max(1, int(capacity or s["initial_capacity"])))
+
+    # =========================================================================
+    # STATE (array kontigu, kapasitas berlipat saat device bertambah)
+    # =========================================================================
+
+    def _allocate(self, capacity):
+        old = self._state
+        state = {}
+        for name, (dtype, fill) in self._ROW_FIELDS.items():
+            state[name] = np.full(capacity, fill, dtype=dtype)
+        for name, (dtype, fill) in self._CHANNEL_FIELDS.items():
+            state[name] = np.full((capacity, len(CHANNELS)), fill, dtype=dtype)
+        if old is not None:
+            rows = len(self.device_ids)
+            for name, values in old.items():
+                state[name][:rows] = values[:rows]
+        self._state = state
+        self.capacity = capacity
+
+    def _row(self, device_id):
+        row = self._index.get(device_id)
+        if row is None:
+            row = len(self.device_ids)
+            if row >= self.capacity:
+                self._allocate(self.capacity * 2)
+            self._index[device_id] = row
+            self.device_ids.append(device_id)
+        return row
+
+    def __len__(self):
+        return len(self.device_ids)
+
+    # =========================================================================
+    # INGEST (thread MQTT, per sampel)
+    # =========================================================================
+
+    def ingest(self, device_id, timestamp, temperature, humidity, power=None, setpoint=None):
+        """Tambahkan satu sampel ke blok device; dinilai pada update() berikutnya"""
+        with self._lock:
+            row = self._row(device_id)
+            st = self._state
+            if setpoint is not None:
+                st["setpoint"][row] = setpoint
+            # Tanpa SET yang pernah diterima, blok kanal suhu bernilai NaN (tidak dinilai)
+            offset = temperature - st["setpoint"][row]
+            # Device sempat offline / jam mundur: blok dimulai ulang dari sampel ini
+            if not (0 <= timestamp - st["last_time"][row] <= self.max_gap):
+                self._clear_block(row)
+                st["start_time"][row] = timestamp
+                st["start_temperature"][row] = temperature
+
+            st["fresh"][row] = True
+            st["block_n"][row] += 1
+            st["sum_temperature"][row] += offset
+            st["sum_humidity"][row] += humidity
+            if power is not None:
+                st["power_n"][row] += 1
+                st["sum_power"][row] += power
+            st["last_time"][row] = timestamp
+            st["last_temperature"][row] = temperature
+
+    def _clear_block(self, rows):
+        st = self._state
+        for name in ("block_n", "power_n", "sum_temperature", "sum_humidity", "sum_power"):
+            st[name][rows] = 0.0
+
+    def has_pending(self):
+        """True jika ada sampel baru sejak tick sebelumnya"""
+        with self._lock:
+            return bool(self._state["fresh"][:len(self.device_ids)].any())
+
+    # =========================================================================
+    # UPDATE (per tick, vektor untuk semua device)
+    # =========================================================================
+
+    def update(self):
+        """
+        Nilai semua blok yang sudah lengkap.
+        Mengembalikan perubahan status: [(device_id, DetectorRule, aktif, nilai, pesan)]
+        """
+        with self._lock:
+            st = self._state
+            count = len(self.device_ids)
+            st["fresh"][:count] = False
+            span = st["last_time"][:count] - st["start_time"][:count]
+            rows = np.flatnonzero((span >= self.block_seconds) & (st["block_n"][:count] > 0))
+            if not len(rows):
+                return []
+
+            x, valid = self._block_values(rows)
+            changes = self._update_detectors(rows, x, valid)
+            device_ids = self.device_ids
+            return [
+                (device_ids[row], self.rules[(CHANNELS[ch], method)], active, value,
+                 self._message(CHANNELS[ch], method, active, value))
+                for row, ch, method, active, value in changes
+            ]
+
+    def _block_values(self, rows):
+        """Nilai per kanal (baris x kanal) dari blok yang ditutup, beserta mask valid"""
+        st = self._state
+        n, power_n = st["block_n"][rows], st["power_n"][rows]
+        span = st["last_time"][rows] - st["start_time"][rows]
+
+        x = np.empty((len(rows), len(CHANNELS)))
+        x[:, 0] = st["sum_temperature"][rows] / n
+        x[:, 1] = st["sum_humidity"][rows] / n
+
+        # Daya rata-rata blok terhadap laju suhu blok (°C/menit)
+        has_power = power_n > 0
+        power = st["sum_power"][rows] / np.maximum(power_n, 1.0)
+        rate = (st["last_temperature"][rows] - st["start_temperature"][rows]) / span * 60.0
+
+        mx, my = st["reg_x"][rows], st["reg_y"][rows]
+        vxx, cxy, reg_n = st["reg_xx"][rows], st["reg_xy"][rows], st["reg_n"][rows]
+        slope = cxy / np.where(vxx > 1e-9, vxx, np.inf)
+        x[:, 2] = power - (my + slope * (rate - mx))
+
+        # Model laju -> daya hanya belajar saat kanal heater tidak alarm
+        learn = has_power & ~(st["alarm_ewma"][rows, 2] | st["alarm_cusum"][rows, 2])
+        a = np.where(learn, np.maximum(self.alpha, 1.0 / (reg_n + 1.0)), 0.0)
+        dx, dy = rate - mx, power - my
+        st["reg_x"][rows] = mx + a * dx
+        st["reg_y"][rows] = my + a * dy
+        st["reg_xx"][rows] = (1.0 - a) * (vxx + a * dx * dx)
+        st["reg_xy"][rows] = (1.0 - a) * (cxy + a * dx * dy)
+        st["reg_n"][rows] = reg_n + learn
+
+        # Blok berikutnya dimulai dari sampel terakhir blok ini (laju tetap bersambung)
+        self._clear_block(rows)
+        st["start_time"][rows] = st["last_time"][rows]
+        st["start_temperature"][rows] = st["last_temperature"][rows]
+
+        valid = np.isfinite(x)
+        # Residual heater baru bermakna setelah regresi punya cukup blok
+        valid[:, 2] &= has_power & (reg_n >= self.warmup)
+        return np.where(valid, x, 0.0), valid
+
+    def _update_detectors(self, rows, x, valid):
+        st = self._state
+        count, mean, var = st["count"][rows], st["mean"][rows], st["var"][rows]
+        ewma, s_pos, s_neg = st["ewma"][rows], st["cusum_pos"][rows], st["cusum_neg"][rows]
+        old_ewma, old_cusum = st["alarm_ewma"][rows], st["alarm_cusum"][rows]
+
+        sigma = np.sqrt(np.maximum(var, self.min_var))
+        z = np.where(valid, np.clip((x - mean) / sigma, -self.z_clip, self.z_clip), 0.0)
+        armed = valid & (count >= self.warmup)
+
+        ewma = np.where(armed, self.lam * z + (1.0 - self.lam) * ewma, 0.0)
+        s_pos = np.where(armed, np.maximum(0.0, s_pos + z - self.cusum_k), 0.0)
+        s_neg = np.where(armed, np.maximum(0.0, s_neg - z - self.cusum_k), 0.0)
+
+        # Kanal tanpa nilai valid di blok ini mempertahankan status alarmnya
+        alarm_ewma = np.where(valid, armed & (np.abs(ewma) > self.ewma_limit), old_ewma)
+        alarm_cusum = np.where(valid, armed & ((s_pos > self.cusum_h) | (s_neg > self.cusum_h)), old_cusum)
+
+        # Baseline belajar cepat di awal (1/n), lalu EWMA lambat; dibekukan selama alarm
+        learn = valid & ~(alarm_ewma | alarm_cusum)
+        a = np.where(learn, np.maximum(self.alpha, 1.0 / (count + 1.0)), 0.0)
+        delta = x - mean
+        st["mean"][rows] = mean + a * delta
+        st["var"][rows] = (1.0 - a) * (var + a * delta * delta)
+        st["count"][rows] = count + learn
+        st["ewma"][rows], st["cusum_pos"][rows], st["cusum_neg"][rows] = ewma, s_pos, s_neg
+        st["alarm_ewma"][rows], st["alarm_cusum"][rows] = alarm_ewma, alarm_cusum
+
+        changes = []
+        cusum_value = np.where(s_pos >= s_neg, s_pos, -s_neg)
+        for method, new, old, value in (("ewma", alarm_ewma, old_ewma, ewma),
+                                        ("cusum", alarm_cusum, old_cusum, cusum_value)):
+            for i, ch in zip(*np.nonzero(new != old)):
+                changes.append((int(rows[i]), int(ch), method, bool(new[i, ch]), float(value[i, ch])))
+        return changes
+
+    @staticmethod
+    def _message(channel, method, active, value):
+        if not active:
+            return "Kembali normal"
+        return f"{CHANNEL_LABELS[channel]} ({method.upper()} {value:+.2f}σ)"
+
+    def reset(self):
+        """Lupakan semua device & baseline (mis. saat user memutus koneksi)"""
+        with self._lock:
+            self._index.clear()
+            self.device_ids = []
+            self._state = None
+            self._allocate(max(1, int(self.settings["initial_capacity"])))
+
+    def device_state(self, device_id):
+        """Ringkasan state detektor satu device"""
+        with self._lock:
+            row = self._index.get(device_id)
+            if row is None:
+                return None
+            st = self._state
+            return {
+                channel: {
+                    "blocks": int(st["count"][row, ch]),
+                    "mean": float(st["mean"][row, ch]),
+                    "std": float(np.sqrt(st["var"][row, ch])),
+                    "ewma": float(st["ewma"][row, ch]),
+                    "cusum_pos": float(st["cusum_pos"][row, ch]),
+                    "cusum_neg": float(st["cusum_neg"][row, ch]),
+                    "alarm": bool(st["alarm_ewma"][row, ch] or st["alarm_cusum"][row, ch]),
+                }
+                for ch, channel in enumerate(CHANNELS)
+            }
@@ -6,23 +6,29 @@ import base64
 import socket
 import getpass
 import platform
-
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import threading
 
 # Import variabel konfigurasi dari settings
+# (cryptography & keyring di-import saat pertama dipakai, bukan saat startup)
 from src.config.settings import APP_NAME, CREDENTIALS_FILE
+from src.utils.workers import run_in_background
+
+_keyring_module = None
+_keyring_checked = False
+_NOT_LOADED = object()
 
-# Cek ketersediaan Keyring (Windows Credential Manager)
-try:
-    if platform.system() == "Windows":
-        import keyring
-        KEYRING_AVAILABLE = True
-    else:
-        KEYRING_AVAILABLE = False
-except ImportError:
-    KEYRING_AVAILABLE = False
+def _get_keyring():
+    """Modul keyring (Windows Credential Manager) atau None jika tidak tersedia"""
+    global _keyring_module, _keyring_checked
+    if not _keyring_checked:
+        _keyring_checked = True
+        try:
+            if platform.system() == "Windows":
+                import keyring
+                _keyring_module = keyring
+        except ImportError:
+            _keyring_module = None
+    return _keyring_module
 
 class AuthService:
     """
@@ -30,10 +36,41 @@ class AuthService:
     kredensial user secara aman.
     """
 
+    # Kunci hasil PBKDF2 (100.000 iterasi) cukup diturunkan sekali per proses
+    _cached_key = None
+    _key_lock = threading.Lock()
+    # Hasil load/save/clear terakhir: form login bisa diisi tanpa dekripsi ulang
+    _cached_credentials = _NOT_LOADED
+
+    @classmethod
+    def _get_key(cls):
+        """Kunci enkripsi dari cache; thread lain menunggu jika sedang diturunkan"""
+        with cls._key_lock:
+            if cls._cached_key is None:
+                cls._cached_key = cls._generate_key_from_machine()
+            return cls._cached_key
+
+    @classmethod
+    def cached_credentials(cls):
+        """(sudah_dimuat, kredensial | None) tanpa I/O; aman dipanggil di thread GUI"""
+        creds = cls._cached_credentials
+        if creds is _NOT_LOADED:
+            return False, None
+        return True, creds
+
+    @classmethod
+    def prewarm_key(cls):
+        """Turunkan kunci di worker thread (dipanggil saat startup)"""
+        if cls._cached_key is None:
+            run_in_background(cls._get_key)
+
     @staticmethod
     def _generate_key_from_machine():
         """Private: Membuat kunci enkripsi unik berdasarkan hardware ID mesin"""
         try:
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
             machine_id = f"{socket.gethostname()}_{getpass.getuser()}"
             salt = machine_id.encode()[:16].ljust(16, b'0')  # Padding 16 bytes
             
@@ -53,7 +90,8 @@ class AuthService:
     def _encrypt_data(cls, data: str) -> str:
         """Private: Enkripsi string data"""
         try:
-            key = cls._generate_key_from_machine()
+            from cryptography.fernet import Fernet
+            key = cls._get_key()
             f = Fernet(key)
             encrypted = f.encrypt(data.encode())
             return base64.urlsafe_b64encode(encrypted).decode()
@@ -65,7 +103,8 @@ class AuthService:
     def _decrypt_data(cls, encrypted_data: str) -> str:
         """Private: Dekripsi string data"""
         try:
-            key = cls._generate_key_from_machine()
+            from cryptography.fernet import Fernet
+            key = cls._get_key()
             f = Fernet(key)
             decoded = base64.urlsafe_b64decode(encrypted_data.encode())
             decrypted = f.decrypt(decoded)
@@ -78,15 +117,21 @@ class AuthService:
     def save_credentials(cls, username, password, method="auto"):
         """Simpan username/password ke Keyring atau File Terenkripsi"""
         try:
+            keyring = _get_keyring()
+            
             # Logika pemilihan metode penyimpanan
             if method == "auto":
-                method = "keyring" if KEYRING_AVAILABLE else "encrypted_file"
+                method = "keyring" if keyring else "encrypted_file"
             
             # OPSI 1: Windows Credential Manager (Paling Aman)
-            if method == "keyring" and KEYRING_AVAILABLE:
+            if method == "keyring" and keyring:
                 keyring.set_password(APP_NAME, "username", username)
                 keyring.set_password(APP_NAME, "password", password)
                 keyring.set_password(APP_NAME, "remember", "true")
+                cls._cached_credentials = {
+                    "username": username, "password": password,
+                    "remember": True, "method": "keyring"
+                }
                 print(f"🔐 Credentials saved securely in Windows Credential Manager")
                 return True
                 
@@ -104,6 +149,7 @@ class AuthService:
                 
                 with open(CREDENTIALS_FILE, 'w') as f:
                     f.write(encrypted_data)
+                cls._cached_credentials = credentials
                 
                 print(f"🔐 Credentials saved with encryption")
                 return True
@@ -118,10 +164,17 @@ class AuthService:
 
     @classmethod
     def load_credentials(cls):
-        """Ambil username/password yang tersimpan"""
+        """Ambil username/password yang tersimpan (hasilnya ikut di-cache)"""
+        creds = cls._read_credentials()
+        cls._cached_credentials = creds
+        return creds
+
+    @classmethod
+    def _read_credentials(cls):
         try:
             # 1. Coba baca dari Keyring
-            if KEYRING_AVAILABLE:
+            keyring = _get_keyring()
+            if keyring:
                 try:
                     u = keyring.get_password(APP_NAME, "username")
                     p = keyring.get_password(APP_NAME, "password")
@@ -158,12 +211,28 @@ class AuthService:
             print(f"❌ Error loading credentials: {e}")
             return None
 
-    @staticmethod
-    def clear_credentials():
+    # =========================================================================
+    # VERSI ASYNC (enkripsi/dekripsi & keyring di worker thread)
+    # =========================================================================
+
+    @classmethod
+    def save_credentials_async(cls, username, password, method="auto", on_done=None):
+        """Simpan kredensial di background; `on_done(bool)` dipanggil di thread GUI"""
+        return run_in_background(cls.save_credentials, username, password, method, on_done=on_done)
+
+    @classmethod
+    def load_credentials_async(cls, on_done):
+        """Muat kredensial di background; `on_done(dict | None)` dipanggil di thread GUI"""
+        return run_in_background(cls.load_credentials, on_done=on_done)
+
+    @classmethod
+    def clear_credentials(cls):
         """Hapus semua data login yang tersimpan"""
+        cls._cached_credentials = None
         try:
             # Hapus Keyring
-            if KEYRING_AVAILABLE:
+            keyring = _get_keyring()
+            if keyring:
                 try:
                     keyring.delete_password(APP_NAME, "username")
                     keyring.delete_password(APP_NAME, "password")
@@ -0,0 +1,376 @@
+"""
+Laporan akhir batch (HTML satu file, grafik PNG tertanam).
+
+Isi: grafik tren (rollup per jam dari history), statistik suhu & kelembaban,
+analisis kontrol pemanas, riwayat alarm dan log perintah batch tersebut.
+
+Render berjalan di proses terpisah (ProcessPoolExecutor, matplotlib Agg)
+sehingga dashboard tidak tersendat. Antar proses hanya dikirim root folder,
+ID batch dan opsi kecil; proses pekerja membaca kolom history lewat
+memory-map sendiri, bukan menerima data lewat pickle.
+
+    python -m src.services.batch_report                        # semua batch tanpa laporan
+    python -m src.services.batch_report --batch 20250101_000000 --force
+"""
+import base64
+import html
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.config.settings import BATCH_REPORT, BATCH_STATS, DEFAULT_SETTINGS
+
+# =========================================================================
+# DATA (NumPy di atas memory-map)
+# =========================================================================
+
+def rollup(timestamps, columns, seconds):
+    """Mean/min/max per ember waktu `seconds` (sampel urut waktu, reduceat per ember)"""
+    ts = np.asarray(timestamps, dtype=np.float64)
+    if not len(ts):
+        return None
+    bucket = np.floor(ts / seconds).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, len(ts)])
+    result = {"time": bucket[starts] * seconds + seconds / 2.0}
+    for name, values in columns.items():
+        values = np.asarray(values, dtype=np.float64)
+        result[name] = np.add.reduceat(values, starts) / counts
+        result[f"{name}_min"] = np.minimum.reduceat(values, starts)
+        result[f"{name}_max"] = np.maximum.reduceat(values, starts)
+    return result
+
+def summarize(timestamps, values, target, tolerance, max_gap):
+    """Statistik satu metrik, termasuk persentase waktu dalam band (seperti BatchStats)"""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return None
+    ts = np.asarray(timestamps, dtype=np.float64)
+    i_min, i_max = int(np.argmin(values)), int(np.argmax(values))
+
+    # Selang dihitung menurut status sampel sebelumnya; jeda > max_gap diabaikan
+    elapsed = np.diff(ts)
+    observed = (elapsed > 0) & (elapsed <= max_gap)
+    inside = np.abs(values - target) <= tolerance
+    total = float(elapsed[observed].sum())
+    in_band = float(elapsed[observed & inside[:-1]].sum())
+
+    return {
+        "count": len(values),
+        "mean": float(values.mean()),
+        "stdev": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "min": float(values[i_min]), "min_time": float(ts[i_min]),
+        "max": float(values[i_max]), "max_time": float(ts[i_max]),
+        "in_band_percent": 100.0 * in_band / total if total else None,
+        "tolerance": tolerance,
+    }
+
+def _batch_start(batch_id, first_timestamp):
+    """Waktu mulai batch dari ID (tanggal mulai inkubasi), atau sampel pertama"""
+    try:
+        return datetime.strptime(batch_id, "%Y%m%d_%H%M%S").timestamp()
+    except (TypeError, ValueError):
+        return first_timestamp
+
+# =========================================================================
+# RENDER (dijalankan di proses pekerja)
+# =========================================================================
+
+def _trend_chart(trend, start, target_humidity, dpi):
+    """Tiga panel (suhu, kelembaban, daya) dengan sumbu hari inkubasi -> PNG base64"""
+    # Import di sini: proses utama dashboard tidak pernah memuat matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    days = (trend["time"] - start) / 86400.0 + 1.0
+    fig = Figure(figsize=(10, 8), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax_temp, ax_hum, ax_power = fig.subplots(3, 1, sharex=True)
+
+    for ax, name, color, label in ((ax_temp, "temperature", "#e4572e", "Suhu (°C)"),
+                                   (ax_hum, "humidity", "#2e86ab", "Kelembaban (%)")):
+        ax.fill_between(days, trend[f"{name}_min"], trend[f"{name}_max"], color=color, alpha=0.2, linewidth=0)
+        ax.plot(days, trend[name], color=color, linewidth=1.2)
+        ax.set_ylabel(label)
+        ax.grid(alpha=0.3)
+    ax_temp.plot(days, trend["setpoint"], color="#333333", linewidth=1, linestyle="--", label="SET")
+    ax_temp.legend(loc="lower right")
+    ax_hum.axhline(target_humidity, color="#333333", linewidth=1, linestyle="--")
+
+    ax_power.plot(days, trend["power"], color="#f3a712", linewidth=1.2)
+    ax_power.set_ylabel("Daya (%)")
+    ax_power.set_xlabel("Hari inkubasi")
+    ax_power.grid(alpha=0.3)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+def _fmt(value, spec=".2f", unit=""):
+    return "-" if value is None else f"{value:{spec}}{unit}"
+
+def _time(timestamp):
+    return "-" if timestamp is None else datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M:%S")
+
+def _table(headers, rows):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+def _limited(rows, limit):
+    """Baris terakhir sebanyak `limit` beserta catatan jumlah yang dipotong"""
+    if len(rows) <= limit:
+        return rows, ""
+    return rows[-limit:], f"<p class='note'>{len(rows) - limit} baris lebih awal tidak ditampilkan.</p>"
+
+_STYLE = """
+body { font-family: 'Manrope', 'Segoe UI', sans-serif; margin: 32px; color: #222; }
+h1 { margin-bottom: 4px; } h2 { margin-top: 32px; border-bottom: 2px solid #eee; padding-bottom: 4px; }
+table { border-collapse: collapse; margin: 8px 0; font-size: 13px; }
+th, td { border: 1px solid #ddd; padding: 4px 10px; text-align: left; }
+th { background: #f5f5f5; } .note, .meta { color: #777; font-size: 13px; }
+img { max-width: 100%; }
+"""
+
+def render_report(root_dir, batch_id, options=None):
+    """
+    Susun laporan satu batch dan tulis ke `<root_dir>/<batch_id>/<filename>`.
+    Fungsi level modul agar bisa dikirim ke ProcessPoolExecutor. Mengembalikan path.
+    """
+    from src.services.history_store import HistoryStore
+    from src.services.control_analysis import analyze_batch, finalize, merge
+
+    options = options or {}
+    settings = {**BATCH_REPORT, **options.get("settings", {})}
+    target_humidity = float(options.get("target_humidity", DEFAULT_SETTINGS["target_humidity"]))
+    total_days = options.get("total_days")
+    started = time.perf_counter()
+
+    store = HistoryStore(root_dir=root_dir)
+    columns = store.memmap_columns(batch_id=batch_id)
+    ts = columns["timestamps"]
+    sections = []
+
+    # --- Tren & statistik ---
+    if len(ts):
+        start = _batch_start(batch_id, float(ts[0]))
+        trend = rollup(ts, {name: columns[name] for name in ("temperature", "humidity", "power", "setpoint")},
+                       float(settings["rollup_seconds"]))
+        chart = _trend_chart(trend, start, target_humidity, settings["dpi"])
+        sections.append(f"<h2>Tren</h2><img alt='Grafik tren' src='data:image/png;base64,{chart}'>")
+
+        max_gap = float(BATCH_STATS["max_gap_seconds"])
+        stats = {
+            "Suhu": (summarize(ts, columns["temperature"], np.asarray(columns["setpoint"], dtype=np.float64),
+                               float(BATCH_STATS["temperature_tolerance"]), max_gap), "°C"),
+            "Kelembaban": (summarize(ts, columns["humidity"], target_humidity,
+                                     float(BATCH_STATS["humidity_tolerance"]), max_gap), "%"),
+        }
+        rows = [
+            (label, s["count"], _fmt(s["mean"], ".2f", unit), _fmt(s["stdev"], ".3f"),
+             f"{_fmt(s['min'], '.1f', unit)} ({_time(s['min_time'])})",
+             f"{_fmt(s['max'], '.1f', unit)} ({_time(s['max_time'])})",
+             f"{_fmt(s['in_band_percent'], '.1f', '%')} (±{s['tolerance']:g}{unit})")
+            for label, (s, unit) in stats.items()
+        ]
+        sections.append("<h2>Statistik</h2>" + _table(
+            ("Metrik", "Sampel", "Rata-rata", "Std dev", "Minimum", "Maksimum", "Dalam band"), rows))
+        period = f"{_time(float(ts[0]))} s/d {_time(float(ts[-1]))}"
+    else:
+        sections.append("<h2>Tren</h2><p class='note'>Tidak ada data history untuk batch ini.</p>")
+        period = "-"
+
+    # --- Analisis kontrol pemanas ---
+    partials = analyze_batch(store, batch_id)
+    control = finalize(merge(partials.values())) if partials else None
+    if control:
+        settling = control["settling_time"]
+        settling_max = control["settling_time_max"]
+        sections.append("<h2>Kontrol Pemanas</h2>" + _table(("Metrik", "Nilai"), [
+            ("Duty cycle", _fmt(control["duty_cycle"], ".1f", "%")),
+            ("Pemanas menyala", _fmt(control["heater_on_percent"], ".1f", "%")),
+            ("Error tunak", _fmt(control["steady_state_error"], "+.3f", " °C")),
+            ("Error tunak absolut", _fmt(control["steady_state_abs_error"], ".3f", " °C")),
+            ("Overshoot maksimum", _fmt(control["overshoot"], ".2f", " °C")),
+            ("Settling rata-rata", _fmt(settling / 60 if settling is not None else None, ".1f", " menit")),
+            ("Settling terlama", _fmt(settling_max / 60 if settling_max is not None else None, ".1f", " menit")),
+            ("Perubahan SET", f"{control['steps']} (belum settle {control['unsettled_steps']})"),
+        ]))
+
+    # --- Alarm ---
+    limit = int(settings["max_table_rows"])
+    alarms = store.read_events("alarms", batch_id)
+    raised = [event for event in alarms if event.get("state") == "raised"]
+    counts = {}
+    for event in raised:
+        key = (event.get("rule_id"), event.get("severity"))
+        counts[key] = counts.get(key, 0) + 1
+    if alarms:
+        summary = _table(("Rule", "Severity", "Jumlah"),
+                         [(rule, severity, count) for (rule, severity), count
+                          in sorted(counts.items(), key=lambda item: -item[1])])
+        rows, note = _limited([
+            (_time(event.get("timestamp")), event.get("state"), event.get("device_id"),
+             event.get("rule_id"), event.get("severity"), event.get("message"))
+            for event in alarms
+        ], limit)
+        sections.append(f"<h2>Riwayat Alarm ({len(raised)} alarm)</h2>" + summary + note + _table(
+            ("Waktu", "Status", "Device", "Rule", "Severity", "Pesan"), rows))
+    else:
+        sections.append("<h2>Riwayat Alarm</h2><p class='note'>Tidak ada alarm.</p>")
+
+    # --- Perintah ---
+    commands = store.read_events("commands", batch_id)
+    if commands:
+        rows, note = _limited([
+            (_time(command.get("timestamp")),
+             ", ".join(f"{key}={value}" for key, value in command.get("command", {}).items()))
+            for command in commands
+        ], limit)
+        sections.append(f"<h2>Log Perintah ({len(commands)})</h2>" + note + _table(("Waktu", "Perintah"), rows))
+    else:
+        sections.append("<h2>Log Perintah</h2><p class='note'>Tidak ada perintah terkirim.</p>")
+
+    meta = (f"Periode: {html.escape(period)}"
+            + (f" | Durasi inkubasi: {int(total_days)} hari" if total_days else "")
+            + f" | Dibuat {datetime.now().strftime('%d/%m/%Y %H:%M')} dalam {time.perf_counter() - started:.1f}s")
+    document = (
+        "<!DOCTYPE html><html lang='id'><head><meta charset='utf-8'>"
+        f"<title>Laporan Batch {html.escape(batch_id)}</title><style>{_STYLE}</style></head><body>"
+        f"<h1>Laporan Batch {html.escape(batch_id)}</h1><p class='meta'>{meta}</p>"
+        + "".join(sections) + "</body></html>"
+    )
+
+    # Tulis atomik: laporan setengah jadi tidak pernah terlihat sebagai laporan selesai
+    path = os.path.join(store.batch_dir(batch_id), settings["filename"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+    os.replace(tmp_path, path)
+    return path
+
+def _process_pool(max_workers):
+    # "spawn": proses pekerja bersih (tanpa state Qt/thread dari dashboard), sama di semua OS
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+# =========================================================================
+# SERVICE (dashboard)
+# =========================================================================
+
+class BatchReportService(QObject):
+    """
+    Antrean laporan batch di process pool. Pool dibuat saat ada permintaan
+    dan dimatikan lagi setelah antrean kosong (laporan jarang dibuat, proses
+    pekerja tidak perlu hidup terus). Tiap batch hanya dibuat sekali per sesi;
+    batch yang sudah punya file laporan dilewati.
+    """
+
+    report_ready = pyqtSignal(str, str)    # batch_id, path laporan
+    report_failed = pyqtSignal(str, str)   # batch_id, pesan error
+    _job_done = pyqtSignal(str, object)    # Internal: dari thread executor ke thread GUI
+
+    def __init__(self, root_dir, settings=None, parent=None):
+        super().__init__(parent)
+        self.root_dir = root_dir
+        self.settings = settings or BATCH_REPORT
+        self._executor = None
+        self._pending = set()
+        self._attempted = set()
+        self._job_done.connect(self._on_job_done)
+
+    def report_path(self, batch_id):
+        return os.path.join(self.root_dir, batch_id, self.settings["filename"])
+
+    def has_report(self, batch_id):
+        return os.path.exists(self.report_path(batch_id))
+
+    def request(self, batch_id, **options):
+        """Antrekan laporan batch. False jika sudah ada / sedang / pernah dicoba di sesi ini"""
+        if batch_id in self._attempted or self.has_report(batch_id):
+            return False
+        self._attempted.add(batch_id)
+        self._pending.add(batch_id)
+        if self._executor is None:
+            self._executor = _process_pool(self.settings["max_workers"])
+        future = self._executor.submit(render_report, self.root_dir, batch_id,
+                                       {**options, "settings": self.settings})
+        future.add_done_callback(lambda f, b=batch_id: self._job_done.emit(b, f))
+        print(f"📄 Membuat laporan batch {batch_id} di proses terpisah...")
+        return True
+
+    def _on_job_done(self, batch_id, future):
+        self._pending.discard(batch_id)
+        try:
+            path = future.result()
+        except Exception as e:
+            print(f"❌ Laporan batch {batch_id} gagal: {e}")
+            self.report_failed.emit(batch_id, str(e))
+        else:
+            print(f"📄 Laporan batch {batch_id} tersimpan: {path}")
+            self.report_ready.emit(batch_id, path)
+
+        if not self._pending and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# =========================================================================
+# CLI (banyak batch paralel)
+# =========================================================================
+
+def generate_reports(root_dir, batch_ids, max_workers=None, options=None):
+    """Render banyak batch sekaligus di process pool. Mengembalikan {batch_id: path atau Exception}"""
+    results = {}
+    with _process_pool(max_workers or BATCH_REPORT["max_workers"]) as pool:
+        futures = {pool.submit(render_report, root_dir, batch_id, options): batch_id for batch_id in batch_ids}
+        for future in as_completed(futures):
+            batch_id = futures[future]
+            try:
+                results[batch_id] = future.result()
+                print(f"📄 {batch_id:24} -> {results[batch_id]}")
+            except Exception as e:
+                results[batch_id] = e
+                print(f"❌ {batch_id:24} gagal: {e}")
+    return results
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Buat laporan HTML akhir batch dari history")
+    parser.add_argument("--root", default="data/history", help="Folder history (default: %(default)s)")
+    parser.add_argument("--batch", action="append", default=[], help="ID batch (bisa berulang; default: semua)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Jumlah proses paralel (default: %(default)s)")
+    parser.add_argument("--target-humidity", type=float, default=DEFAULT_SETTINGS["target_humidity"],
+                        help="Target kelembaban untuk band (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="Buat ulang walau laporan sudah ada")
+    args = parser.parse_args()
+
+    batches = args.batch or (sorted(name for name in os.listdir(args.root)
+                                    if os.path.isdir(os.path.join(args.root, name)))
+                             if os.path.isdir(args.root) else [])
+    if not args.force:
+        batches = [b for b in batches
+                   if not os.path.exists(os.path.join(args.root, b, BATCH_REPORT["filename"]))]
+    if not batches:
+        print("Tidak ada batch yang perlu dibuatkan laporan (pakai --force untuk membuat ulang)")
+        return
+
+    started = time.perf_counter()
+    results = generate_reports(args.root, batches, args.workers, {"target_humidity": args.target_humidity})
+    failed = sum(isinstance(result, Exception) for result in results.values())
+    print(f"⚡ {len(batches) - failed}/{len(batches)} laporan dalam {time.perf_counter() - started:.1f}s")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
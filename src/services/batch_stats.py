@@ -0,0 +1,193 @@
+import math
+import threading
+
+from src.config.settings import BATCH_STATS
+
+# =========================================================================
+# AKUMULATOR (update O(1) per sampel, state kecil & bisa diserialisasi)
+# =========================================================================
+
+class RunningStat:
+    """
+    Mean & varian streaming (algoritma Welford) ditambah nilai minimum/maksimum
+    beserta waktunya. Stabil secara numerik walau jumlah sampel jutaan.
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "min_time", "max", "max_time")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0          # Jumlah kuadrat selisih terhadap mean
+        self.min = None
+        self.min_time = None
+        self.max = None
+        self.max_time = None
+
+    def add(self, value, timestamp):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.min is None or value < self.min:
+            self.min, self.min_time = value, timestamp
+        if self.max is None or value > self.max:
+            self.max, self.max_time = value, timestamp
+
+    @property
+    def variance(self):
+        """Varian sampel (n - 1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        stat = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(stat, name, data[name])
+        return stat
+
+
+class BandTimer:
+    """
+    Lama waktu nilai berada di dalam band (setpoint ± toleransi).
+    Selang antar sampel dihitung menurut status sampel sebelumnya; jeda yang
+    lebih lama dari `max_gap` (device offline) tidak ikut dihitung.
+    """
+
+    __slots__ = ("in_band", "total", "last_time", "last_in_band")
+
+    def __init__(self):
+        self.in_band = 0.0     # Detik di dalam band
+        self.total = 0.0       # Detik yang teramati
+        self.last_time = None
+        self.last_in_band = False
+
+    def add(self, inside, timestamp, max_gap):
+        if self.last_time is not None:
+            elapsed = timestamp - self.last_time
+            if 0 < elapsed <= max_gap:
+                self.total += elapsed
+                if self.last_in_band:
+                    self.in_band += elapsed
+        self.last_time = timestamp
+        self.last_in_band = inside
+
+    @property
+    def percent(self):
+        return 100.0 * self.in_band / self.total if self.total else None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        band = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(band, name, data[name])
+        return band
+
+# =========================================================================
+# STATISTIK PER BATCH
+# =========================================================================
+
+class BatchStats:
+    """
+    Statistik sejak batch dimulai: mean/varian, min/max (dengan waktu) dan
+    persentase waktu dalam band untuk suhu & kelembaban.
+    Diperbarui dari thread MQTT, dibaca dari thread GUI (dijaga lock).
+    State disimpan di DataStore sehingga tetap utuh setelah aplikasi restart
+    tanpa memproses ulang history mentah.
+    """
+
+    METRICS = ("temperature", "humidity")
+
+    def __init__(self, batch_id=None, settings=None):
+        settings = settings or BATCH_STATS
+        self.tolerance = {
+            "temperature": float(settings["temperature_tolerance"]),
+            "humidity": float(settings["humidity_tolerance"]),
+        }
+        self.max_gap = float(settings["max_gap_seconds"])
+        self._lock = threading.Lock()
+        self.reset(batch_id)
+
+    def reset(self, batch_id=None):
+        """Mulai akumulasi baru (batch baru)"""
+        with self._lock:
+            self.batch_id = batch_id
+            self._stats = {metric: RunningStat() for metric in self.METRICS}
+            self._bands = {metric: BandTimer() for metric in self.METRICS}
+            self.dirty = True
+
+    def add(self, timestamp, temperature, humidity, setpoint, target_humidity):
+        """Masukkan satu sampel"""
+        with self._lock:
+            for metric, value, target in (("temperature", temperature, setpoint),
+                                          ("humidity", humidity, target_humidity)):
+                self._stats[metric].add(value, timestamp)
+                inside = abs(value - target) <= self.tolerance[metric]
+                self._bands[metric].add(inside, timestamp, self.max_gap)
+            self.dirty = True
+
+    def snapshot(self):
+        """Ringkasan untuk tampilan: {metric: {mean, stdev, min, ..., in_band_percent}}"""
+        with self._lock:
+            summary = {"batch_id": self.batch_id}
+            for metric in self.METRICS:
+                stat, band = self._stats[metric], self._bands[metric]
+                summary[metric] = {
+                    "count": stat.count,
+                    "mean": stat.mean if stat.count else None,
+                    "stdev": stat.stdev,
+                    "variance": stat.variance,
+                    "min": stat.min, "min_time": stat.min_time,
+                    "max": stat.max, "max_time": stat.max_time,
+                    "in_band_percent": band.percent,
+                    "tolerance": self.tolerance[metric],
+                }
+            return summary
+
+    # =========================================================================
+    # PERSISTENSI
+    # =========================================================================
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "batch_id": self.batch_id,
+                "metrics": {
+                    metric: {"stat": self._stats[metric].to_dict(), "band": self._bands[metric].to_dict()}
+                    for metric in self.METRICS
+                },
+            }
+
+    def load_dict(self, data, batch_id):
+        """Pulihkan state tersimpan; diabaikan jika milik batch lain atau rusak"""
+        if not data or data.get("batch_id") != batch_id:
+            self.reset(batch_id)
+            return False
+        try:
+            metrics = data["metrics"]
+            stats = {metric: RunningStat.from_dict(metrics[metric]["stat"]) for metric in self.METRICS}
+            bands = {metric: BandTimer.from_dict(metrics[metric]["band"]) for metric in self.METRICS}
+        except (KeyError, TypeError) as e:
+            print(f"⚠️ Statistik batch tersimpan tidak valid, mulai ulang: {e}")
+            self.reset(batch_id)
+            return False
+
+        with self._lock:
+            self.batch_id = batch_id
+            self._stats = stats
+            self._bands = bands
+            self.dirty = False
+        return True
@@ -0,0 +1,314 @@
+"""
+Analisis kualitas kontrol pemanas dari history (power & SET ikut tersimpan).
+
+Semua perhitungan berupa operasi NumPy atas seluruh sampel sekaligus
+(reduceat / bincount per segmen & per jendela waktu), tanpa loop Python per
+sampel, sehingga satu batch penuh (~1 juta sampel) selesai dalam puluhan ms.
+
+Metrik:
+    overshoot           simpangan terjauh melewati setpoint setelah perubahan SET / pemanasan awal (°C)
+    settling time       waktu sampai suhu masuk band (SET ± band) dan tidak keluar lagi (detik)
+    steady-state error  rata-rata (suhu - SET) setelah settle (°C)
+    duty cycle          rata-rata daya dimmer berbobot waktu (%), plus persentase waktu pemanas menyala
+
+    python -m src.services.control_analysis                   # semua batch di data/history
+    python -m src.services.control_analysis --batch 20250101_000000 --window-hours 24
+"""
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.config.settings import CONTROL_ANALYSIS
+from src.utils.workers import run_in_background
+
+# Akumulator per jendela yang bisa dijumlahkan antar jendela (merge O(1))
+_SUM_FIELDS = ("samples", "seconds", "power_seconds", "on_seconds",
+               "steady_count", "steady_error", "steady_abs_error",
+               "steps", "unsettled", "settled", "settling_total")
+_MAX_FIELDS = ("overshoot", "settling_max")
+
+# =========================================================================
+# ANALISIS (NumPy)
+# =========================================================================
+
+def analyze_arrays(timestamps, temperature, power, setpoint, window_seconds=None, settings=None):
+    """
+    Analisis satu deret sampel (urut waktu).
+    Mengembalikan {indeks jendela: akumulator} dengan indeks = floor(t / window_seconds)
+    (satu jendela berindeks 0 jika window_seconds None). Gunakan finalize() untuk metrik.
+    """
+    settings = settings or CONTROL_ANALYSIS
+    band = float(settings["band"])
+    max_gap = float(settings["max_gap_seconds"])
+
+    ts = np.asarray(timestamps, dtype=np.float64)
+    n = len(ts)
+    if n == 0:
+        return {}
+    temp = np.asarray(temperature, dtype=np.float64)
+    setp = np.asarray(setpoint, dtype=np.float64)
+    pwr = np.asarray(power, dtype=np.float64)
+    err = temp - setp
+    idx = np.arange(n)
+
+    # Segmen = rentang dengan SET tetap tanpa jeda data (device offline)
+    step_dt = np.diff(ts)
+    gaps = step_dt > max_gap
+    setpoint_changes = np.abs(np.diff(setp)) > float(settings["setpoint_step"])
+    breaks = np.empty(n, dtype=bool)
+    breaks[0] = True
+    breaks[1:] = gaps | setpoint_changes
+    starts = np.flatnonzero(breaks)
+    ends = np.append(starts[1:], n)
+    lengths = ends - starts
+
+    # Bobot waktu tiap sampel = selang ke sampel berikutnya (0 jika melewati jeda)
+    weight = np.zeros(n)
+    weight[:-1] = np.where(gaps, 0.0, step_dt)
+
+    # Respons step: segmen yang dimulai oleh perubahan SET atau dimulai di luar band
+    start_error = err[starts]
+    is_step = np.abs(start_error) > band
+    is_step[1:] |= setpoint_changes[starts[1:] - 1]
+
+    # Overshoot: simpangan melewati SET searah datangnya suhu
+    direction = -np.sign(start_error)
+    overshoot = np.maximum(np.maximum.reduceat(err * np.repeat(direction, lengths), starts), 0.0)
+
+    # Settling: indeks terakhir di luar band; sesudahnya suhu tetap di dalam band
+    last_outside = np.maximum.reduceat(np.where(np.abs(err) > band, idx, -1), starts)
+    settled = last_outside < ends - 1
+    settle_idx = np.maximum(last_outside + 1, starts)
+    settling_time = ts[np.minimum(settle_idx, ends - 1)] - ts[starts]
+    steady = (idx >= np.repeat(settle_idx, lengths)) & np.repeat(settled, lengths)
+
+    # Atribusi ke jendela: sampel menurut waktunya, metrik step menurut awal segmennya
+    if window_seconds:
+        window_index = np.floor(ts / window_seconds).astype(np.int64)
+    else:
+        window_index = np.zeros(n, dtype=np.int64)
+    keys, win = np.unique(window_index, return_inverse=True)
+    m = len(keys)
+    seg_win = win[starts]
+    steps = is_step
+    settled_steps = is_step & settled
+
+    def per_window(weights, at=win):
+        return np.bincount(at, weights=weights, minlength=m)
+
+    sums = {
+        "samples": np.bincount(win, minlength=m).astype(np.float64),
+        "seconds": per_window(weight),
+        "power_seconds": per_window(pwr * weight),
+        "on_seconds": per_window((pwr > 0) * weight),
+        "steady_count": per_window(steady.astype(np.float64)),
+        "steady_error": per_window(err * steady),
+        "steady_abs_error": per_window(np.abs(err) * steady),
+        "steps": per_window(steps.astype(np.float64), seg_win),
+        "unsettled": per_window((steps & ~settled).astype(np.float64), seg_win),
+        "settled": per_window(settled_steps.astype(np.float64), seg_win),
+        "settling_total": per_window(np.where(settled_steps, settling_time, 0.0), seg_win),
+    }
+    maxes = {"overshoot": np.zeros(m), "settling_max": np.zeros(m)}
+    np.maximum.at(maxes["overshoot"], seg_win[steps], overshoot[steps])
+    np.maximum.at(maxes["settling_max"], seg_win[settled_steps], settling_time[settled_steps])
+
+    columns = {**sums, **maxes}
+    keys = keys.tolist()
+    return {key: {name: float(values[i]) for name, values in columns.items()}
+            for i, key in enumerate(keys)}
+
+def merge(partials):
+    """Gabungkan akumulator beberapa jendela"""
+    total = {name: 0.0 for name in _SUM_FIELDS + _MAX_FIELDS}
+    for partial in partials:
+        for name in _SUM_FIELDS:
+            total[name] += partial[name]
+        for name in _MAX_FIELDS:
+            total[name] = max(total[name], partial[name])
+    return total
+
+def finalize(partial):
+    """Akumulator -> metrik (None jika tidak ada data untuk metrik tersebut)"""
+    if not partial or not partial["samples"]:
+        return None
+
+    def ratio(num, den, scale=1.0):
+        return scale * num / den if den else None
+
+    return {
+        "samples": int(partial["samples"]),
+        "seconds": partial["seconds"],
+        "duty_cycle": ratio(partial["power_seconds"], partial["seconds"]),
+        "heater_on_percent": ratio(partial["on_seconds"], partial["seconds"], 100.0),
+        "steady_state_error": ratio(partial["steady_error"], partial["steady_count"]),
+        "steady_state_abs_error": ratio(partial["steady_abs_error"], partial["steady_count"]),
+        "overshoot": partial["overshoot"] if partial["steps"] else None,
+        "settling_time": ratio(partial["settling_total"], partial["settled"]),
+        "settling_time_max": partial["settling_max"] if partial["settled"] else None,
+        "steps": int(partial["steps"]),
+        "unsettled_steps": int(partial["unsettled"]),
+    }
+
+def analyze_batch(store, batch_id=None, window_seconds=None, settings=None):
+    """Baca satu batch dari HistoryStore (memory-map) lalu analisis"""
+    data = store.read_range(-math.inf, math.inf, ["timestamps", "temperature", "power", "setpoint"],
+                            batch_id=batch_id)
+    return analyze_arrays(data["timestamps"], data["temperature"], data["power"], data["setpoint"],
+                          window_seconds, settings)
+
+# =========================================================================
+# CACHE PER JENDELA (dihitung di worker thread)
+# =========================================================================
+
+class ControlAnalyzer(QObject):
+    """
+    Hasil analisis per jendela waktu (window_seconds) dari batch aktif.
+    Jendela yang belum ada di cache dihitung di worker thread dalam satu
+    pembacaan; jendela yang datanya belum lengkap dihitung ulang paling
+    cepat tiap `reload_after` detik. Sinyal `analysis_ready` dipancarkan
+    setelah hasil baru masuk cache.
+    """
+
+    analysis_ready = pyqtSignal()
+
+    def __init__(self, store, window_seconds=None, settings=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.settings = settings or CONTROL_ANALYSIS
+        self.window_seconds = float(window_seconds or self.settings["window_seconds"])
+        self.max_windows = self.settings["max_cached_windows"]
+        self._windows = OrderedDict()   # (batch, indeks) -> {"partial", "until", "loaded_at"}
+        self._pending = set()
+
+    def fetch(self, t_start, t_end):
+        """
+        Metrik gabungan untuk [t_start, t_end] dari jendela yang sudah di-cache
+        (None jika belum ada). Jendela yang kurang/basi dimuat di background.
+        """
+        batch = self.store.batch_id
+        first = int(math.floor(t_start / self.window_seconds))
+        last = int(math.floor(t_end / self.window_seconds))
+
+        now = time.monotonic()
+        missing = []
+        partials = []
+        for index in range(first, last + 1):
+            key = (batch, index)
+            entry = self._windows.get(key)
+            if entry is None:
+                missing.append(index)
+                continue
+            self._windows.move_to_end(key)
+
+            needed_until = min((index + 1) * self.window_seconds, t_end)
+            if entry["until"] < needed_until and now - entry["loaded_at"] >= self.settings["reload_after"]:
+                missing.append(index)
+            if entry["partial"] is not None:
+                partials.append(entry["partial"])
+
+        if missing:
+            self._request(batch, missing[0], missing[-1])
+        return finalize(merge(partials)) if partials else None
+
+    def clear(self):
+        self._windows.clear()
+
+    def _request(self, batch, first, last):
+        key = (batch, first, last)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        run_in_background(
+            self._compute, batch, first, last,
+            on_done=lambda result, key=key: self._on_computed(key, result),
+            on_error=lambda msg, key=key: self._on_failed(key, msg)
+        )
+
+    def _compute(self, batch, first, last):
+        """Worker thread: baca jendela [first, last] (+ lookahead untuk settling) lalu analisis"""
+        w = self.window_seconds
+        t_start, t_end = first * w, (last + 1) * w
+        data = self.store.read_range(
+            t_start, t_end + self.settings["settle_lookahead"],
+            ["timestamps", "temperature", "power", "setpoint"], batch_id=batch
+        )
+        partials = analyze_arrays(data["timestamps"], data["temperature"], data["power"],
+                                  data["setpoint"], w, self.settings)
+
+        span = self.store.time_span(batch)
+        until = span[1] if span else t_start
+        return {index: partials.get(index) for index in range(first, last + 1)}, until
+
+    def _on_computed(self, key, result):
+        self._pending.discard(key)
+        batch = key[0]
+        partials, until = result
+        loaded_at = time.monotonic()
+        for index, partial in partials.items():
+            self._windows[(batch, index)] = {"partial": partial, "until": until, "loaded_at": loaded_at}
+            self._windows.move_to_end((batch, index))
+        while len(self._windows) > self.max_windows:
+            self._windows.popitem(last=False)
+        self.analysis_ready.emit()
+
+    def _on_failed(self, key, message):
+        self._pending.discard(key)
+        print(f"⚠ Gagal menganalisis kontrol pemanas: {message}")
+
+# =========================================================================
+# CLI
+# =========================================================================
+
+def _fmt(value, spec, suffix=""):
+    return f"{value:{spec}}{suffix}" if value is not None else "-"
+
+def _print_summary(label, summary):
+    if summary is None:
+        print(f"{label:24} (tidak ada data)")
+        return
+    settling = summary["settling_time"]
+    print(f"{label:24} {summary['samples']:>9} sampel | duty {_fmt(summary['duty_cycle'], '.1f', '%')} "
+          f"(nyala {_fmt(summary['heater_on_percent'], '.0f', '%')}) | "
+          f"error tunak {_fmt(summary['steady_state_error'], '+.3f', '°C')} | "
+          f"overshoot {_fmt(summary['overshoot'], '.2f', '°C')} | "
+          f"settling {_fmt(settling / 60 if settling is not None else None, '.1f', ' mnt')} | "
+          f"step {summary['steps']} (belum settle {summary['unsettled_steps']})")
+
+def main():
+    import os
+    import argparse
+    from datetime import datetime
+    from src.services.history_store import HistoryStore
+
+    parser = argparse.ArgumentParser(description="Analisis kontrol pemanas dari history batch")
+    parser.add_argument("--root", default="data/history", help="Folder history (default: %(default)s)")
+    parser.add_argument("--batch", action="append", default=[], help="ID batch (bisa berulang; default: semua)")
+    parser.add_argument("--window-hours", type=float, default=None,
+                        help="Tampilkan juga metrik per jendela N jam")
+    args = parser.parse_args()
+
+    store = HistoryStore(root_dir=args.root)
+    batches = args.batch or (sorted(os.listdir(args.root)) if os.path.isdir(args.root) else [])
+    window_seconds = args.window_hours * 3600 if args.window_hours else None
+
+    started = time.perf_counter()
+    total_samples = 0
+    for batch_id in batches:
+        partials = analyze_batch(store, batch_id, window_seconds)
+        summary = finalize(merge(partials.values())) if partials else None
+        total_samples += summary["samples"] if summary else 0
+        _print_summary(batch_id, summary)
+        if window_seconds:
+            for index, partial in sorted(partials.items()):
+                label = datetime.fromtimestamp(index * window_seconds).strftime("  %d/%m %H:%M")
+                _print_summary(label, finalize(partial))
+
+    elapsed = time.perf_counter() - started
+    print(f"⚡ {len(batches)} batch, {total_samples} sampel dalam {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import json
 import os
+import threading
+import uuid
 from datetime import datetime
 
+from src.utils.clock import get_clock
+
 class DataStore:
     """
     Service khusus untuk menangani penyimpanan data persisten (File JSON).
@@ -11,6 +15,8 @@ class DataStore:
     def __init__(self, filename="data/incubation_data.json"):
         # Kita simpan di folder 'data' agar rapi
         self.filename = filename
+        # Read-modify-write dari thread GUI & worker (simpan statistik) berurutan
+        self._lock = threading.Lock()
         self._ensure_data_dir()
         
     def _ensure_data_dir(self):
@@ -19,42 +25,85 @@ class DataStore:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
 
+    def _read(self):
+        """Isi file JSON sebagai dict (kosong jika belum ada)"""
+        if not os.path.exists(self.filename):
+            return {}
+        with open(self.filename, 'r') as f:
+            return json.load(f)
+
+    def _write(self, data):
+        # Tulis ke file sementara (nama unik) lalu ganti: file lama tetap utuh
+        # jika proses mati di tengah jalan. Mode 0o666 agar umask tetap berlaku
+        # (NamedTemporaryFile/mkstemp selalu 0600)
+        tmp_path = f"{self.filename}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        try:
+            os.replace(tmp_path, self.filename)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def _update(self, changes):
+        """Gabungkan `changes` ke isi file (baca-ubah-tulis di bawah lock)"""
+        with self._lock:
+            try:
+                data = self._read()
+            except ValueError:
+                data = {}
+            data.update(changes)
+            self._write(data)
+
     def load_incubation_data(self):
         """Muat data tanggal mulai inkubasi"""
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    start_date_str = data.get('start_date')
-                    
-                    if start_date_str:
-                        return datetime.fromisoformat(start_date_str)
+            start_date_str = self._read().get('start_date')
+            if start_date_str:
+                return datetime.fromisoformat(start_date_str)
             return None
         except Exception as e:
             print(f"⚠️ Error loading incubation data: {e}")
             return None
 
     def save_incubation_data(self, start_date, total_days):
-        """Simpan data inkubasi ke file"""
+        """Simpan data inkubasi ke file (statistik batch yang sudah ada tetap disimpan)"""
         try:
-            data = {
+            self._update({
                 'start_date': start_date.isoformat() if start_date else None,
                 'total_days': total_days,
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=2)
+                'last_updated': get_clock().now().isoformat()
+            })
             print(f"💾 Incubation data saved to {self.filename}")
             return True
         except Exception as e:
             print(f"❌ Error saving incubation data: {e}")
             return False
 
+    def load_batch_stats(self):
+        """Muat state statistik batch (dict BatchStats.to_dict) atau None"""
+        try:
+            return self._read().get('stats')
+        except Exception as e:
+            print(f"⚠️ Error loading batch stats: {e}")
+            return None
+
+    def save_batch_stats(self, stats):
+        """Simpan state statistik batch di bawah key 'stats' pada record batch"""
+        try:
+            self._update({'stats': stats})
+            return True
+        except Exception as e:
+            print(f"❌ Error saving batch stats: {e}")
+            return False
+
     def reset_data(self):
         """Hapus file data (Reset Batch)"""
         try:
-            if os.path.exists(self.filename):
-                os.remove(self.filename)
+            with self._lock:
+                if os.path.exists(self.filename):
+                    os.remove(self.filename)
             return True
         except Exception as e:
             print(f"❌ Error resetting data: {e}")
@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+class HistoryStore:
+    """
+    Penyimpanan history sensor per batch dalam format kolumnar (satu file biner
+    per kolom, append-only). Pembacaan memakai memory-map sehingga rentang waktu
+    tertentu bisa diambil tanpa memuat seluruh batch ke memori.
+    """
+
+    COLUMNS = {
+        "timestamps": np.float64,
+        "temperature": np.float32,
+        "humidity": np.float32,
+        "power": np.float32,
+        "setpoint": np.float32,
+    }
+
+    def __init__(self, root_dir="data/history", flush_every=50, flush_interval=10.0):
+        self.root_dir = root_dir
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self.batch_id = None
+        self._pending = {name: [] for name in self.COLUMNS}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        # Swap + tulis satu blok berurutan (flush dari thread MQTT & GUI tidak
+        # boleh menyisipkan blok di tengah kolom milik flush lain)
+        self._write_lock = threading.Lock()
+
+    # =========================================================================
+    # BATCH
+    # =========================================================================
+
+    @staticmethod
+    def batch_id_for(start_date):
+        """ID batch diturunkan dari tanggal mulai inkubasi"""
+        if not start_date:
+            return "default"
+        return start_date.strftime("%Y%m%d_%H%M%S")
+
+    def batch_dir(self, batch_id=None):
+        return os.path.join(self.root_dir, batch_id or self.batch_id or "default")
+
+    def open_batch(self, batch_id):
+        """Pindah ke batch lain (data pending batch lama disimpan dulu)"""
+        if batch_id == self.batch_id:
+            return
+        self.flush()
+        with self._lock:
+            self.batch_id = batch_id
+            directory = self.batch_dir(batch_id)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            meta_path = os.path.join(directory, "meta.json")
+            if not os.path.exists(meta_path):
+                with open(meta_path, 'w') as f:
+                    meta = {name: np.dtype(dtype).str for name, dtype in self.COLUMNS.items()}
+                    json.dump({"batch_id": batch_id, "columns": meta}, f, indent=2)
+
+    # =========================================================================
+    # WRITE
+    # =========================================================================
+
+    def append(self, timestamp, temperature, humidity, power, setpoint):
+        """Tambah satu sampel (disimpan ke disk per blok)"""
+        with self._lock:
+            pending = self._pending
+            pending["timestamps"].append(timestamp)
+            pending["temperature"].append(temperature)
+            pending["humidity"].append(humidity)
+            pending["power"].append(power)
+            pending["setpoint"].append(setpoint)
+            count = len(pending["timestamps"])
+
+        if count >= self.flush_every or (time.monotonic() - self._last_flush) >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Tulis sampel pending ke file kolom masing-masing"""
+        with self._write_lock:
+            # append() hanya menunggu _lock (swap singkat), bukan I/O di bawah
+            with self._lock:
+                self._last_flush = time.monotonic()
+                if not self._pending["timestamps"] or self.batch_id is None:
+                    return
+                pending = self._pending
+                self._pending = {name: [] for name in self.COLUMNS}
+                directory = self.batch_dir()
+
+            try:
+                # Timestamp ditulis terakhir: pembaca memakai jumlah baris terkecil
+                for name in list(self.COLUMNS)[1:] + ["timestamps"]:
+                    values = np.asarray(pending[name], dtype=self.COLUMNS[name])
+                    with open(os.path.join(directory, f"{name}.bin"), 'ab') as f:
+                        values.tofile(f)
+            except Exception as e:
+                print(f"❌ Error writing history: {e}")
+
+    # =========================================================================
+    # EVENT LOG (alarm & perintah, satu baris JSON per event)
+    # =========================================================================
+
+    def append_event(self, name, record):
+        """Tambah satu event ke `<batch>/<name>.jsonl`"""
+        with self._lock:
+            if self.batch_id is None:
+                return
+            path = os.path.join(self.batch_dir(), f"{name}.jsonl")
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"❌ Error writing {name} log: {e}")
+
+    def read_events(self, name, batch_id=None):
+        """Semua event `<name>.jsonl` suatu batch (baris rusak dilewati)"""
+        path = os.path.join(self.batch_dir(batch_id), f"{name}.jsonl")
+        if not os.path.exists(path):
+            return []
+        events = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass
+        return events
+
+    # =========================================================================
+    # READ (aman dipanggil dari worker thread)
+    # =========================================================================
+
+    def _open_columns(self, batch_id=None, columns=None):
+        directory = self.batch_dir(batch_id)
+        columns = columns or list(self.COLUMNS)
+        maps = {}
+        rows = None
+        for name in set(columns) | {"timestamps"}:
+            path = os.path.join(directory, f"{name}.bin")
+            if not os.path.exists(path):
+                return {}, 0
+            itemsize = np.dtype(self.COLUMNS[name]).itemsize
+            count = os.path.getsize(path) // itemsize
+            rows = count if rows is None else min(rows, count)
+            if count:
+                maps[name] = np.memmap(path, dtype=self.COLUMNS[name], mode='r', shape=(count,))
+        return maps, rows or 0
+
+    def time_span(self, batch_id=None):
+        """(timestamp pertama, timestamp terakhir) yang sudah tersimpan, atau None"""
+        maps, rows = self._open_columns(batch_id, ["timestamps"])
+        if not rows:
+            return None
+        ts = maps["timestamps"]
+        return float(ts[0]), float(ts[rows - 1])
+
+    def read_range(self, t_start, t_end, columns=None, batch_id=None):
+        """
+        Ambil sampel dengan t_start <= timestamp <= t_end.
+        Pencarian batas memakai binary search di atas memory-map (O(log n)).
+        """
+        columns = columns or list(self.COLUMNS)
+        maps, rows = self._open_columns(batch_id, columns)
+        if not rows:
+            return {name: np.empty(0, dtype=self.COLUMNS[name]) for name in columns}
+
+        ts = maps["timestamps"][:rows]
+        i0 = int(np.searchsorted(ts, t_start, side="left"))
+        i1 = int(np.searchsorted(ts, t_end, side="right"))
+        return {name: np.array(maps[name][i0:i1]) for name in columns}
+
+    def memmap_columns(self, columns=None, batch_id=None):
+        """Seluruh kolom batch sebagai memory-map read-only (tanpa salinan ke memori)"""
+        columns = columns or list(self.COLUMNS)
+        maps, rows = self._open_columns(batch_id, columns)
+        if not rows:
+            return {name: np.empty(0, dtype=self.COLUMNS[name]) for name in columns}
+        return {name: maps[name][:rows] for name in columns}
@@ -0,0 +1,519 @@
+import asyncio
+import itertools
+import struct
+import threading
+import time
+
+from src.config.settings import LOCAL_BROKER
+
+# Tipe paket MQTT 3.1.1 (4 bit atas byte pertama)
+CONNECT, CONNACK, PUBLISH, PUBACK, PUBREC, PUBREL, PUBCOMP = 1, 2, 3, 4, 5, 6, 7
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK, PINGREQ, PINGRESP, DISCONNECT = 8, 9, 10, 11, 12, 13, 14
+
+# Return code CONNACK
+CONNACK_ACCEPTED = 0
+CONNACK_BAD_PROTOCOL = 1
+CONNACK_ID_REJECTED = 2
+CONNACK_BAD_CREDENTIALS = 4
+
+CONNECT_TIMEOUT = 10.0   # Detik menunggu paket CONNECT pertama
+KEEPALIVE_SWEEP = 2.0    # Detik, interval cek client yang melewati keepalive
+
+class ProtocolError(Exception):
+    pass
+
+# =========================================================================
+# ENCODING
+# =========================================================================
+
+def _encode_length(length):
+    out = bytearray()
+    while True:
+        byte = length % 128
+        length //= 128
+        out.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(out)
+
+def _encode_str(value):
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    return struct.pack(">H", len(data)) + data
+
+def _packet(packet_type, flags, body=b""):
+    return bytes(((packet_type << 4) | flags,)) + _encode_length(len(body)) + body
+
+def _publish_packet(topic, payload, qos, retain, packet_id=None):
+    body = _encode_str(topic)
+    if qos:
+        body += struct.pack(">H", packet_id)
+    return _packet(PUBLISH, (qos << 1) | int(retain), body + payload)
+
+class _Reader:
+    """Pembaca field berurutan dari body paket"""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def u8(self):
+        if self.pos >= len(self.data):
+            raise ProtocolError("Paket terpotong")
+        self.pos += 1
+        return self.data[self.pos - 1]
+
+    def u16(self):
+        if self.pos + 2 > len(self.data):
+            raise ProtocolError("Paket terpotong")
+        self.pos += 2
+        return struct.unpack_from(">H", self.data, self.pos - 2)[0]
+
+    def raw(self):
+        length = self.u16()
+        if self.pos + length > len(self.data):
+            raise ProtocolError("Paket terpotong")
+        self.pos += length
+        return self.data[self.pos - length:self.pos]
+
+    def text(self):
+        try:
+            return self.raw().decode("utf-8")
+        except UnicodeDecodeError:
+            raise ProtocolError("String bukan UTF-8")
+
+    def rest(self):
+        return self.data[self.pos:]
+
+    def remaining(self):
+        return len(self.data) - self.pos
+
+# =========================================================================
+# TOPIC MATCHING
+# =========================================================================
+
+def valid_filter(topic_filter):
+    if not topic_filter:
+        return False
+    levels = topic_filter.split("/")
+    for i, level in enumerate(levels):
+        if "#" in level and (level != "#" or i != len(levels) - 1):
+            return False
+        if "+" in level and level != "+":
+            return False
+    return True
+
+def topic_matches(topic_filter, topic):
+    """True jika `topic` cocok dengan filter (wildcard + dan #)"""
+    if topic.startswith("$") and topic_filter[:1] in ("+", "#"):
+        return False
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for i, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if i >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[i]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+class _TopicNode:
+    __slots__ = ("children", "subscribers")
+
+    def __init__(self):
+        self.children = {}
+        self.subscribers = {}   # session -> QoS yang diberikan
+
+class _TopicTree:
+    """Trie per level topic: pencocokan publish tidak memindai semua langganan"""
+
+    def __init__(self):
+        self.root = _TopicNode()
+
+    def add(self, topic_filter, session, qos):
+        node = self.root
+        for level in topic_filter.split("/"):
+            node = node.children.setdefault(level, _TopicNode())
+        node.subscribers[session] = qos
+
+    def remove(self, topic_filter, session):
+        path = [self.root]
+        for level in topic_filter.split("/"):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].subscribers.pop(session, None)
+
+        # Pangkas node kosong dari ujung
+        levels = topic_filter.split("/")
+        for i in range(len(levels), 0, -1):
+            node = path[i]
+            if node.subscribers or node.children:
+                break
+            del path[i - 1].children[levels[i - 1]]
+
+    def match(self, topic):
+        """session -> QoS tertinggi dari semua filter yang cocok"""
+        levels = topic.split("/")
+        system_topic = topic.startswith("$")
+        result = {}
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            wildcard_ok = not (system_topic and depth == 0)
+
+            multi = node.children.get("#")
+            if multi is not None and wildcard_ok:
+                self._collect(result, multi)
+
+            if depth == len(levels):
+                self._collect(result, node)
+                continue
+
+            child = node.children.get(levels[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+            single = node.children.get("+")
+            if single is not None and wildcard_ok:
+                stack.append((single, depth + 1))
+        return result
+
+    @staticmethod
+    def _collect(result, node):
+        for session, qos in node.subscribers.items():
+            if qos > result.get(session, -1):
+                result[session] = qos
+
+# =========================================================================
+# BROKER
+# =========================================================================
+
+class _Session:
+    __slots__ = ("client_id", "writer", "keepalive", "last_seen", "will",
+                 "filters", "packet_ids", "closing")
+
+    def __init__(self, client_id, writer, keepalive, will):
+        self.client_id = client_id
+        self.writer = writer
+        self.keepalive = keepalive
+        self.last_seen = time.monotonic()
+        self.will = will              # (topic, payload, qos, retain) atau None
+        self.filters = {}             # filter -> QoS
+        self.packet_ids = itertools.cycle(range(1, 65536))
+        self.closing = False
+
+
+class LocalBroker:
+    """
+    Broker MQTT 3.1.1 ringan (asyncio) untuk uji offline & benchmark.
+    Mendukung QoS 0/1 (QoS 2 dari publisher diterima lalu diteruskan sebagai QoS 1),
+    retained message, wildcard + dan #, keepalive, dan last will.
+    Tanpa persistensi sesi: setiap koneksi diperlakukan sebagai clean session.
+
+        broker = LocalBroker(port=0)
+        port = broker.start_in_thread()   # port acak yang terpakai
+        ...
+        broker.stop()
+    """
+
+    def __init__(self, host=None, port=None, credentials=None, max_pending_bytes=None):
+        self.host = host or LOCAL_BROKER["host"]
+        self.port = LOCAL_BROKER["port"] if port is None else port
+        self.credentials = credentials    # {username: password} atau None (terima semua)
+        self.max_pending_bytes = max_pending_bytes or LOCAL_BROKER["max_pending_bytes"]
+
+        self.sessions = {}                # client_id -> _Session
+        self.retained = {}                # topic -> (payload, qos)
+        self.stats = {"connections": 0, "messages_in": 0, "messages_out": 0, "dropped": 0}
+
+        self._tree = _TopicTree()
+        self._client_tasks = set()
+        self._server = None
+        self._sweeper = None
+        self._loop = None
+        self._thread = None
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = self._loop.create_task(self._sweep_keepalive())
+        return self.port
+
+    async def close(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+        if self._server:
+            self._server.close()
+        # Tutup socket client lalu tunggu handler selesai (EOF -> keluar loop baca)
+        for session in list(self.sessions.values()):
+            session.closing = True
+            session.writer.close()
+        if self._client_tasks:
+            await asyncio.wait(list(self._client_tasks), timeout=2.0)
+        if self._server:
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🛰 Broker lokal aktif di {self.host}:{self.port}")
+        await self._server.serve_forever()
+
+    def start_in_thread(self, timeout=5.0):
+        """Jalankan broker di thread daemon (untuk tes / simulator). Mengembalikan port"""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.close())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="kartel-local-broker", daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if errors:
+            raise errors[0]
+        return self.port
+
+    def stop(self, timeout=5.0):
+        """Hentikan broker yang dijalankan lewat start_in_thread()"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Koneksi ---
+
+    async def _read_packet(self, reader):
+        header = await reader.readexactly(1)
+        length, multiplier = 0, 1
+        for _ in range(4):
+            byte = (await reader.readexactly(1))[0]
+            length += (byte & 0x7F) * multiplier
+            if not byte & 0x80:
+                break
+            multiplier *= 128
+        else:
+            raise ProtocolError("Remaining length tidak valid")
+        body = await reader.readexactly(length) if length else b""
+        return header[0] >> 4, header[0] & 0x0F, body
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        session = None
+        graceful = False
+        try:
+            packet_type, _, body = await asyncio.wait_for(self._read_packet(reader), CONNECT_TIMEOUT)
+            if packet_type != CONNECT:
+                return
+            session = self._connect(body, writer)
+            if session is None:
+                return
+
+            while True:
+                packet_type, flags, body = await self._read_packet(reader)
+                session.last_seen = time.monotonic()
+                if packet_type == PUBLISH:
+                    self._on_publish(session, flags, body)
+                elif packet_type == PUBREL:
+                    writer.write(_packet(PUBCOMP, 0, body[:2]))
+                elif packet_type == SUBSCRIBE:
+                    self._on_subscribe(session, body)
+                elif packet_type == UNSUBSCRIBE:
+                    self._on_unsubscribe(session, body)
+                elif packet_type == PINGREQ:
+                    writer.write(_packet(PINGRESP, 0))
+                elif packet_type == DISCONNECT:
+                    graceful = True
+                    break
+                elif packet_type in (PUBACK, PUBREC, PUBCOMP):
+                    pass   # Tanpa sesi persisten, QoS 1 keluar tidak perlu dikirim ulang
+                else:
+                    raise ProtocolError(f"Paket tidak didukung: {packet_type}")
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            if session is not None:
+                self._disconnect(session, graceful)
+            writer.close()
+            self._client_tasks.discard(task)
+
+    def _connect(self, body, writer):
+        data = _Reader(body)
+        protocol = data.text()
+        level = data.u8()
+        flags = data.u8()
+        keepalive = data.u16()
+        client_id = data.text()
+
+        if protocol not in ("MQTT", "MQIsdp") or level not in (3, 4):
+            writer.write(_packet(CONNACK, 0, bytes((0, CONNACK_BAD_PROTOCOL))))
+            return None
+
+        will = None
+        if flags & 0x04:
+            will_topic = data.text()
+            will = (will_topic, data.raw(), (flags >> 3) & 0x03, bool(flags & 0x20))
+        username = data.text() if flags & 0x80 else None
+        password = data.raw().decode("utf-8", "replace") if flags & 0x40 else None
+
+        if not client_id:
+            if not flags & 0x02:
+                writer.write(_packet(CONNACK, 0, bytes((0, CONNACK_ID_REJECTED))))
+                return None
+            client_id = f"kartel-auto-{id(writer):x}"
+
+        if self.credentials is not None and self.credentials.get(username) != password:
+            writer.write(_packet(CONNACK, 0, bytes((0, CONNACK_BAD_CREDENTIALS))))
+            return None
+
+        # Client ID yang sama connect lagi: koneksi lama diputus
+        old = self.sessions.get(client_id)
+        if old is not None:
+            old.closing = True
+            old.writer.close()
+            self._disconnect(old, graceful=False)
+
+        session = _Session(client_id, writer, keepalive, will)
+        self.sessions[client_id] = session
+        self.stats["connections"] += 1
+        writer.write(_packet(CONNACK, 0, bytes((0, CONNACK_ACCEPTED))))
+        return session
+
+    def _disconnect(self, session, graceful):
+        if self.sessions.get(session.client_id) is session:
+            del self.sessions[session.client_id]
+        for topic_filter in session.filters:
+            self._tree.remove(topic_filter, session)
+        session.filters.clear()
+        if session.will and not graceful:
+            topic, payload, qos, retain = session.will
+            session.will = None
+            self.publish(topic, payload, qos, retain)
+
+    async def _sweep_keepalive(self):
+        # Client yang diam lebih dari 1.5x keepalive dianggap putus (last will dikirim)
+        while True:
+            await asyncio.sleep(KEEPALIVE_SWEEP)
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if session.keepalive and now - session.last_seen > session.keepalive * 1.5:
+                    session.writer.close()
+
+    # --- Paket ---
+
+    def _on_publish(self, session, flags, body):
+        qos = (flags >> 1) & 0x03
+        retain = bool(flags & 0x01)
+        data = _Reader(body)
+        topic = data.text()
+        if not topic or "+" in topic or "#" in topic or qos == 3:
+            raise ProtocolError("Topic publish tidak valid")
+
+        if qos == 1:
+            session.writer.write(_packet(PUBACK, 0, struct.pack(">H", data.u16())))
+        elif qos == 2:
+            session.writer.write(_packet(PUBREC, 0, struct.pack(">H", data.u16())))
+        self.stats["messages_in"] += 1
+        self.publish(topic, data.rest(), min(qos, 1), retain)
+
+    def _on_subscribe(self, session, body):
+        data = _Reader(body)
+        packet_id = data.u16()
+        granted = bytearray()
+        new_filters = []
+        while data.remaining():
+            topic_filter = data.text()
+            qos = data.u8() & 0x03
+            if not valid_filter(topic_filter) or qos == 3:
+                granted.append(0x80)
+                continue
+            qos = min(qos, 1)
+            session.filters[topic_filter] = qos
+            self._tree.add(topic_filter, session, qos)
+            granted.append(qos)
+            new_filters.append((topic_filter, qos))
+        session.writer.write(_packet(SUBACK, 0, struct.pack(">H", packet_id) + bytes(granted)))
+
+        # Kirim retained message yang cocok dengan langganan baru
+        for topic, (payload, retained_qos) in list(self.retained.items()):
+            for topic_filter, qos in new_filters:
+                if topic_matches(topic_filter, topic):
+                    self._deliver(session, topic, payload, min(qos, retained_qos), retain=True)
+                    break
+
+    def _on_unsubscribe(self, session, body):
+        data = _Reader(body)
+        packet_id = data.u16()
+        while data.remaining():
+            topic_filter = data.text()
+            if session.filters.pop(topic_filter, None) is not None:
+                self._tree.remove(topic_filter, session)
+        session.writer.write(_packet(UNSUBACK, 0, struct.pack(">H", packet_id)))
+
+    # --- Routing ---
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        """Teruskan pesan ke semua subscriber (juga dipakai untuk pesan dari broker sendiri)"""
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if retain:
+            if payload:
+                self.retained[topic] = (payload, qos)
+            else:
+                self.retained.pop(topic, None)
+
+        for session, granted in self._tree.match(topic).items():
+            self._deliver(session, topic, payload, min(qos, granted), retain=False)
+
+    def _deliver(self, session, topic, payload, qos, retain):
+        if session.closing:
+            return
+        # Subscriber lambat: pesan dibuang daripada buffer tulis tumbuh tanpa batas
+        if session.writer.transport.get_write_buffer_size() > self.max_pending_bytes:
+            self.stats["dropped"] += 1
+            return
+
+        packet_id = None
+        if qos:
+            packet_id = next(session.packet_ids)
+        session.writer.write(_publish_packet(topic, payload, qos, retain, packet_id))
+        self.stats["messages_out"] += 1
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Broker MQTT lokal untuk uji offline KARTEL")
+    parser.add_argument("--host", default=LOCAL_BROKER["host"], help="Alamat bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=LOCAL_BROKER["port"], help="Port (default: %(default)s)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(LocalBroker(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Broker lokal dihentikan")
+
+if __name__ == "__main__":
+    main()
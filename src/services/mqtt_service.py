@@ -1,13 +1,21 @@
 import json
 import time
 import os
-from datetime import datetime
-from typing import Dict, Any, List
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+import threading
+from datetime import datetime, timedelta
+from PyQt6.QtCore import QObject, pyqtSignal
 
 # Import Config dan DataStore
-from src.config.settings import MQTT_SETTINGS, DATA_FORMAT, DEFAULT_SETTINGS, CONNECTION_RETRY
+from src.config.settings import MQTT_SETTINGS, DATA_FORMAT, DEFAULT_SETTINGS, CONNECTION_RETRY, ALARM_SETTINGS, BATCH_STATS, ANOMALY_SETTINGS, BATCH_REPORT
 from src.services.data_store import DataStore
+from src.services.history_store import HistoryStore
+from src.services.alarm_engine import AlarmEngine
+from src.services.batch_stats import BatchStats
+from src.services.anomaly_detection import FleetAnomalyDetector
+from src.services.batch_report import BatchReportService
+from src.services.records import SensorSample, DeviceStatus, format_countdown
+from src.utils.scheduler import get_scheduler
+from src.utils.clock import get_clock
 
 # Cek Library MQTT
 try:
@@ -23,14 +31,24 @@ class MqttService(QObject):
     """
     
     # Sinyal untuk Controller
-    data_received = pyqtSignal(dict)      # Data sensor baru
+    data_received = pyqtSignal(object)    # SensorSample baru
     connection_changed = pyqtSignal(bool) # Status koneksi berubah
     error_occurred = pyqtSignal(str)      # Error message
-    status_updated = pyqtSignal(dict)     # Update status perangkat (Motor/Timer)
+    status_updated = pyqtSignal(object)   # DeviceStatus (Motor/Timer)
+    alarm_raised = pyqtSignal(dict)       # Event alarm (raised/cleared) dari AlarmEngine
+    day_inputs_changed = pyqtSignal()     # Internal: tanggal mulai / total hari berubah
+    
+    # ID device jika payload tidak menyertakan "device_id"
+    DEFAULT_DEVICE_ID = "incubator"
+    
+    # Batas atas jeda timer hari (jaga-jaga jika jam sistem diubah)
+    DAY_TIMER_MAX_MS = 3600 * 1000
     
     def __init__(self):
         super().__init__()
         self.store = DataStore()
+        # Jam waktu-dinding (bisa diganti VirtualClock untuk soak test)
+        self.clock = get_clock()
         
         self.current_data = {
             "temperature": 0.0, "humidity": 0.0, "power": 0, "rotate_on": 0,
@@ -48,10 +66,23 @@ class MqttService(QObject):
         # Load Tanggal Mulai
         self.incubation_start_date = self.store.load_incubation_data()
         
+        # History persisten per batch (kolumnar, untuk zoom/pan grafik) dan
+        # statistik batch streaming (dipulihkan dari DataStore, tanpa baca ulang history)
+        self.history_store = HistoryStore()
+        self.batch_stats = BatchStats()
+        self._open_batch(self.incubation_start_date)
+        
         self.historical_data = {
             "timestamps": [], "temperature": [], "humidity": [],
             "max_points": DATA_FORMAT["history_max_points"]
         }
+        # Ditulis thread MQTT, dibaca thread GUI (grafik awal): salinan diambil di bawah lock
+        self._history_lock = threading.Lock()
+        
+        # Rule alarm dievaluasi langsung pada aliran data sensor
+        self.alarm_engine = AlarmEngine()
+        # Deteksi pergeseran (EWMA/CUSUM) untuk semua device, diproses per tick
+        self.anomaly_detector = FleetAnomalyDetector() if ANOMALY_SETTINGS["enabled"] else None
         
         # Motor Logic
         self.motor_start_time = None
@@ -59,18 +90,27 @@ class MqttService(QObject):
         self.motor_remaining_time = 0
         self.last_motor_state = False
 
-        # Timers
-        self.connection_timer = QTimer()
-        self.connection_timer.timeout.connect(self._check_connection)
-        self.connection_timer.start(30000)
+        # Semua pekerjaan berkala lewat satu scheduler; job hanya terdaftar
+        # selama ada pekerjaan (reconnect saat terputus, cek stale saat ada device)
+        self.scheduler = get_scheduler()
+        # Sinyal dari thread MQTT diteruskan ke thread GUI sebelum menyentuh scheduler
+        self.connection_changed.connect(self._update_reconnect_job)
+        self.data_received.connect(self._ensure_stale_check_job)
+        self.data_received.connect(self._schedule_stats_save)
+        self.data_received.connect(self._ensure_anomaly_job)
         
-        self.motor_timer = QTimer()
-        self.motor_timer.timeout.connect(self._update_motor_logic)
-        self.motor_timer.start(1000)
+        # Laporan akhir batch dibuat di proses terpisah saat hari terakhir lewat.
+        # Pengecekan baru aktif setelah UI tampil (enable_batch_reports)
+        self.batch_reports = (BatchReportService(self.history_store.root_dir)
+                              if BATCH_REPORT["enabled"] else None)
+        self._batch_check_enabled = False
         
-        self.daily_timer = QTimer()
-        self.daily_timer.timeout.connect(self._check_daily_milestones)
-        self.daily_timer.start(60000)
+        # Hari inkubasi dihitung sekali, lalu diperbarui oleh satu job
+        # yang dijadwalkan tepat pada pergantian hari berikutnya
+        self.current_day = 1
+        self.day_text = ""
+        self.day_inputs_changed.connect(self._refresh_incubation_day)
+        self._refresh_incubation_day()
 
         if MQTT_AVAILABLE: self._setup_mqtt_client()
         else: self.error_occurred.emit("Library MQTT tidak ditemukan!")
@@ -85,6 +125,7 @@ class MqttService(QObject):
             # Set waktu ke awal hari (00:00:00) dari tanggal yang dipilih
             new_date = datetime(year, month, day)
             self.incubation_start_date = new_date
+            self._open_batch(new_date)
             
             # Simpan ke JSON agar permanen
             self.store.save_incubation_data(
@@ -93,6 +134,7 @@ class MqttService(QObject):
             )
             
             print(f"📅 Start Date Updated Manually: {new_date.strftime('%Y-%m-%d')}")
+            self.day_inputs_changed.emit()
             
             # Paksa update UI Header (Hari ke-X)
             # Kita emit connection_changed karena Header menyimak sinyal ini
@@ -107,6 +149,14 @@ class MqttService(QObject):
         """Mengambil tanggal mulai saat ini untuk inisialisasi kalender di GUI"""
         return self.incubation_start_date
 
+    def _open_batch(self, start_date):
+        """History & statistik batch mengikuti tanggal mulai inkubasi"""
+        batch_id = HistoryStore.batch_id_for(start_date)
+        self.history_store.open_batch(batch_id)
+        if self.batch_stats.batch_id != batch_id:
+            # Statistik tersimpan hanya dipakai jika milik batch yang sama
+            self.batch_stats.load_dict(self.store.load_batch_stats(), batch_id)
+
     # =========================================================================
     # MQTT CONNECTION
     # =========================================================================
@@ -137,6 +187,7 @@ class MqttService(QObject):
             self.mqtt_client.username_pw_set(username, password)
             self.mqtt_client.connect_async(MQTT_SETTINGS["broker"], MQTT_SETTINGS["port"], MQTT_SETTINGS["keepalive"])
             self.mqtt_client.loop_start()
+            self._update_reconnect_job(False)
             return True
         except Exception as e:
             self.error_occurred.emit(f"Connection Error: {e}")
@@ -144,6 +195,15 @@ class MqttService(QObject):
 
     def disconnect(self):
         self.user_disconnected = True
+        self.history_store.flush()
+        self._save_batch_stats()
+        self.alarm_engine.reset()
+        if self.anomaly_detector is not None:
+            self.anomaly_detector.reset()
+        self.scheduler.remove_job("mqtt_reconnect")
+        self.scheduler.remove_job("stale_check")
+        self.scheduler.remove_job("batch_stats_save")
+        self.scheduler.remove_job("anomaly_tick")
         if self.mqtt_client:
             self.mqtt_client.loop_stop()
             self.mqtt_client.disconnect()
@@ -157,8 +217,10 @@ class MqttService(QObject):
             
             # Auto-start incubation date if None
             if not self.incubation_start_date:
-                self.incubation_start_date = datetime.now()
+                self.incubation_start_date = self.clock.now()
+                self._open_batch(self.incubation_start_date)
                 self.store.save_incubation_data(self.incubation_start_date, self.device_settings["total_days"])
+                self.day_inputs_changed.emit()
         else:
             self.is_connected = False
             self.connection_changed.emit(False)
@@ -176,78 +238,120 @@ class MqttService(QObject):
         except Exception: pass
 
     def _process_sensor_data(self, data):
-        updated = False
+        sample = {}   # Nilai yang benar-benar ada di pesan ini (untuk alarm)
         valid_keys = ["temperature", "humidity", "power", "rotate_on", "SET"]
         for key in valid_keys:
             if key in data:
                 try:
                     val = float(data[key])
+                    sample[key] = val
                     if key == "relay_interval":
                         self.device_settings["relay_interval"] = int(val)
                     else:
                         self.current_data[key] = val
-                    updated = True
+                    if key == "rotate_on":
+                        # Sisa waktu motor dikirim langsung oleh perangkat
+                        self.motor_remaining_time = val
                     if key == "SET":
                         self.target_temperature = val
                         self.device_settings["target_temperature"] = val
                 except ValueError: pass
-        if updated:
-            self._update_history(self.current_data["temperature"], self.current_data["humidity"])
-            self.data_received.emit(self.current_data.copy())
-
-    def _update_history(self, temp, humidity):
-        self.historical_data["timestamps"].append(time.time())
-        self.historical_data["temperature"].append(temp)
-        self.historical_data["humidity"].append(humidity)
-        max_pts = self.historical_data["max_points"]
-        if len(self.historical_data["timestamps"]) > max_pts:
-             self.historical_data["timestamps"] = self.historical_data["timestamps"][-max_pts:]
-             self.historical_data["temperature"] = self.historical_data["temperature"][-max_pts:]
-             self.historical_data["humidity"] = self.historical_data["humidity"][-max_pts:]
-
-    def _update_motor_logic(self):
-        rotate_val = self.current_data.get("rotate_on", 0)
-        is_rotating=rotate_val !=0
-        self.motor_remaining_time=rotate_val
+        if sample:
+            now = self.clock.time()
+            device_id = data.get("device_id", self.DEFAULT_DEVICE_ID)
+            current = self.current_data
+            self._update_history(current["temperature"], current["humidity"], now)
+            self.batch_stats.add(now, current["temperature"], current["humidity"],
+                                 self.target_temperature, self.device_settings["target_humidity"])
+            self._evaluate_alarms(device_id, sample, now)
+            if self.anomaly_detector is not None:
+                # Daya & SET hanya dari pesan ini (bukan sisa device lain)
+                self.anomaly_detector.ingest(
+                    device_id, now, current["temperature"], current["humidity"],
+                    current["power"] if "power" in data else None,
+                    current["SET"] if "SET" in data else None
+                )
+            
+            # Satu record immutable per pesan; timestamp sama dengan yang
+            # masuk history (untuk dedup di grafik)
+            self.data_received.emit(SensorSample(
+                now, current["temperature"], current["humidity"], current["power"],
+                current["rotate_on"], self.target_temperature,
+                self.device_settings["target_humidity"], device_id
+            ))
+
+    def _update_history(self, temp, humidity, now):
+        with self._history_lock:
+            self.historical_data["timestamps"].append(now)
+            self.historical_data["temperature"].append(temp)
+            self.historical_data["humidity"].append(humidity)
+            max_pts = self.historical_data["max_points"]
+            if len(self.historical_data["timestamps"]) > max_pts:
+                 self.historical_data["timestamps"] = self.historical_data["timestamps"][-max_pts:]
+                 self.historical_data["temperature"] = self.historical_data["temperature"][-max_pts:]
+                 self.historical_data["humidity"] = self.historical_data["humidity"][-max_pts:]
+        self.history_store.append(now, temp, humidity, self.current_data["power"], self.current_data["SET"])
+
+    def _evaluate_alarms(self, device_id, sample, now):
+        # Sampel per pesan: device lain tidak ikut terbaca lewat current_data
+        self._emit_alarms(self.alarm_engine.ingest(device_id, sample, now))
+
+    def _emit_alarms(self, events):
+        # Riwayat alarm ikut disimpan di folder batch (untuk laporan akhir batch)
+        for event in events:
+            self.history_store.append_event("alarms", event)
+            self.alarm_raised.emit(event)
+
+    def _ensure_stale_check_job(self, _sample=None):
+        if not self.scheduler.has_job("stale_check"):
+            self.scheduler.add_job("stale_check", self._check_stale_sensors,
+                                   ALARM_SETTINGS["stale_check_interval"])
+
+    def _check_stale_sensors(self):
+        self._emit_alarms(self.alarm_engine.check_stale(self.clock.time()))
+        # Semua device sudah stale: job berhenti sampai ada data baru
+        if not self.alarm_engine.has_tracked_devices():
+            self.scheduler.remove_job("stale_check")
+
+    def _ensure_anomaly_job(self, _sample=None):
+        if self.anomaly_detector is not None and not self.scheduler.has_job("anomaly_tick"):
+            self.scheduler.add_job("anomaly_tick", self._run_anomaly_tick,
+                                   ANOMALY_SETTINGS["tick_interval"])
+
+    def _run_anomaly_tick(self):
+        if not self.anomaly_detector.has_pending():
+            # Tidak ada sampel baru: job berhenti sampai data masuk lagi
+            self.scheduler.remove_job("anomaly_tick")
+            return
+        detections = self.anomaly_detector.update()
+        self._emit_alarms(self.alarm_engine.report(detections, self.clock.time()))
+
+    def _schedule_stats_save(self, _sample=None):
+        # Statistik diperbarui per sampel di memori, disimpan paling sering sekali per interval
+        if not self.scheduler.has_job("batch_stats_save"):
+            self.scheduler.add_job("batch_stats_save", self._save_batch_stats,
+                                   BATCH_STATS["save_interval"], single_shot=True)
+
+    def _save_batch_stats(self):
+        if self.batch_stats.dirty:
+            self.batch_stats.dirty = False
+            self.store.save_batch_stats(self.batch_stats.to_dict())
 
     def _reset_motor_state(self):
         self.last_motor_state = False
         self.motor_remaining_time = 0
 
-    def get_device_status(self) -> Dict[str, Any]:
-        rotate_val = self.current_data.get("rotate_on")
-        
-        if rotate_val > 5:
-            is_rotating = False
-            status_text = "Idle"
-
-            # Format H:M:S untuk countdown aktif
-            hours = int(self.motor_remaining_time // 3600)
-            minutes = int((self.motor_remaining_time % 3600)) // 60
-            seconds = int(self.motor_remaining_time % 60)
-            timer_text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        else:
-            is_rotating = True
-            status_text = "Berputar"
-            
-            # Format H:M:S untuk interval (idle)
-            interval_hours = self.device_settings["relay_interval"]
-            timer_text = f"{interval_hours:02d}:00:00"
-
-            hours = int(self.motor_remaining_time // 3600)
-            minutes = int((self.motor_remaining_time % 3600)) // 60
-            seconds = int(self.motor_remaining_time % 60)
-            timer_text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-        current_day = self._calculate_day()
-        total_days = self.device_settings.get("total_days", 21)
+    def get_device_status(self) -> DeviceStatus:
+        # rotate_on > 5: sisa detik menuju putaran berikutnya (motor diam)
+        is_rotating = self.current_data.get("rotate_on") <= 5
+        power = self.current_data["power"]
 
-        return {
-            "power": { "value": self.current_data["power"], "status": "ON" if self.current_data["power"] > 0 else "OFF", "active": self.current_data["power"] > 0 },
-            "motor": { "status": status_text, "active": is_rotating },
-            "timer": { "countdown": timer_text },
-            "incubation": { "day": current_day, "total": total_days }
-        }
+        return DeviceStatus(
+            power, power > 0,
+            "Berputar" if is_rotating else "Idle", is_rotating,
+            format_countdown(self.motor_remaining_time),
+            self.current_day, self.device_settings.get("total_days", 21)
+        )
 
     def set_target_temperature(self, temp: float) -> bool:
         if not (20.0 <= temp <= 50.0): return False
@@ -264,6 +368,7 @@ class MqttService(QObject):
                 # Update Data Store jika sudah ada tanggal
                 if self.incubation_start_date:
                     self.store.save_incubation_data(self.incubation_start_date, p["duration"])
+                self.day_inputs_changed.emit()
                 self._send_command({"SET": p["temperature"]})
                 return True
         return False
@@ -274,13 +379,19 @@ class MqttService(QObject):
     def get_target_values(self):
         return { "temperature": self.target_temperature, "humidity": self.device_settings["target_humidity"] }
     
-    def get_historical_data(self): return self.historical_data
+    def get_historical_data(self):
+        """Salinan buffer history (panjang semua kolom sama), aman dari thread MQTT"""
+        with self._history_lock:
+            return {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in self.historical_data.items()
+            }
+    def get_history_store(self): return self.history_store
+    def get_batch_stats(self): return self.batch_stats.snapshot()
     def get_mqtt_settings(self): return MQTT_SETTINGS
         
     def get_connection_status(self):
-        day = self._calculate_day()
-        total = self.device_settings.get("total_days", 21)
-        return { "connected": self.is_connected, "day_text": f"Hari ke-{day} dari {total}" }
+        return { "connected": self.is_connected, "day_text": self.day_text }
 
     def _send_command(self, command_dict):
         if not self.is_connected: return False
@@ -288,9 +399,18 @@ class MqttService(QObject):
             payload = json.dumps(command_dict)
             topic = MQTT_SETTINGS["topics"]["command"]
             self.mqtt_client.publish(topic, payload, MQTT_SETTINGS["qos"])
+            self.history_store.append_event("commands", {"timestamp": self.clock.time(), "command": command_dict})
             return True
         except Exception: return False
             
+    def _update_reconnect_job(self, connected):
+        """Job reconnect hanya aktif saat koneksi terputus tanpa diminta user"""
+        if connected or self.user_disconnected or not self.mqtt_client:
+            self.scheduler.remove_job("mqtt_reconnect")
+        elif not self.scheduler.has_job("mqtt_reconnect"):
+            self.scheduler.add_job("mqtt_reconnect", self._check_connection,
+                                   CONNECTION_RETRY["reconnect_delay"] * 1000)
+
     def _check_connection(self):
         if self.user_disconnected: return
         if not self.is_connected and self.mqtt_client:
@@ -299,7 +419,54 @@ class MqttService(QObject):
 
     def _calculate_day(self):
         if not self.incubation_start_date: return 1
-        delta = datetime.now() - self.incubation_start_date
+        delta = self.clock.now() - self.incubation_start_date
         return max(1, delta.days + 1)
 
-    def _check_daily_milestones(self): pass
\ No newline at end of file
+    def _refresh_incubation_day(self):
+        """Hitung ulang hari inkubasi & teks header, lalu arm timer ke pergantian hari"""
+        previous_text = self.day_text
+        self.current_day = self._calculate_day()
+        total = self.device_settings.get("total_days", 21)
+        self.day_text = f"Hari ke-{self.current_day} dari {total}"
+
+        self.scheduler.remove_job("incubation_day")
+        if self.incubation_start_date:
+            # Hari berganti tiap kelipatan 24 jam dari tanggal mulai
+            # (tengah malam untuk tanggal yang dipilih manual)
+            next_change = self.incubation_start_date + timedelta(days=self.current_day)
+            remaining_ms = (next_change - self.clock.now()).total_seconds() * 1000
+            self.scheduler.add_job(
+                "incubation_day", self._refresh_incubation_day,
+                int(min(max(remaining_ms, 1000), self.DAY_TIMER_MAX_MS)),
+                single_shot=True, tolerance_ms=0
+            )
+
+        self._schedule_batch_check()
+
+        if previous_text and self.day_text != previous_text:
+            # Header menyimak connection_changed untuk teks "Hari ke-X"
+            self.connection_changed.emit(self.is_connected)
+
+    def enable_batch_reports(self):
+        """Dipanggil setelah UI tampil: mulai cek batch selesai lewat scheduler"""
+        self._batch_check_enabled = True
+        self._schedule_batch_check()
+
+    def _schedule_batch_check(self):
+        # Tidak pernah dari constructor: pool proses spawn tidak boleh ikut startup
+        if self._batch_check_enabled and self.batch_reports is not None:
+            self.scheduler.add_job("batch_finished_check", self._check_batch_finished,
+                                   BATCH_REPORT["check_delay"] * 1000, single_shot=True)
+
+    def _check_batch_finished(self):
+        """Hari ke-total_days sudah lewat: buat laporan batch (sekali, di proses terpisah)"""
+        total_days = self.device_settings.get("total_days", 21)
+        if self.batch_reports is None or not self.incubation_start_date or self.current_day <= total_days:
+            return
+        batch_id = self.history_store.batch_id
+        if self.batch_reports.has_report(batch_id):
+            return
+        # Pastikan sampel terakhir sudah di disk sebelum proses pekerja membaca memory-map
+        self.history_store.flush()
+        self.batch_reports.request(batch_id, target_humidity=self.device_settings["target_humidity"],
+                                   total_days=total_days)
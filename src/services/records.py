@@ -0,0 +1,40 @@
+from typing import NamedTuple
+
+# =========================================================================
+# RECORD DATA (immutable, satu objek per pesan)
+# Dikirim lewat pyqtSignal(object) sehingga diteruskan sebagai referensi
+# Python dari Service -> Controller -> View, tanpa konversi ke QVariantMap
+# dan tanpa salinan dict di tiap tahap.
+# =========================================================================
+
+class SensorSample(NamedTuple):
+    """Satu sampel sensor beserta target yang aktif saat sampel diterima"""
+    timestamp: float
+    temperature: float
+    humidity: float
+    power: float
+    rotate_on: float
+    target_temperature: float
+    target_humidity: float
+    device_id: str
+
+
+class DeviceStatus(NamedTuple):
+    """Status perangkat untuk kartu Power / Motor / Timer"""
+    power: float
+    power_active: bool
+    motor_status: str
+    motor_active: bool
+    countdown: str
+    day: int
+    total_days: int
+
+    @property
+    def power_status(self):
+        return "ON" if self.power_active else "OFF"
+
+
+def format_countdown(seconds):
+    """Detik -> teks HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -0,0 +1,87 @@
+# File: src/utils/assets.py
+"""
+Akses aset (stylesheet, font, ikon) lewat satu pintu.
+Jika bundle `kartel_assets.rcc` tersedia, bundle di-register sekali
+(Qt memetakan file ke memori) dan semua path menjadi ":/kartel/asset/...".
+Jika tidak, path menunjuk ke file biasa di folder asset/.
+"""
+import os
+import sys
+
+from PyQt6.QtCore import QResource, QFile, QIODevice, QDir
+
+from src.config.settings import ASSET_DIR, ASSET_BUNDLE, resource_path
+
+_bundle_root = None     # ":/kartel/asset" jika bundle aktif
+_bundle_checked = False
+
+def _bundle_is_stale(bundle_file):
+    """Mode source: abaikan bundle yang lebih tua dari file di asset/"""
+    bundle_mtime = os.path.getmtime(bundle_file)
+    for folder, _, files in os.walk(ASSET_DIR):
+        for name in files:
+            if os.path.getmtime(os.path.join(folder, name)) > bundle_mtime:
+                return True
+    return False
+
+def _asset_root():
+    """Root aset aktif (bundle di-register saat pertama kali dibutuhkan)"""
+    global _bundle_root, _bundle_checked
+    if not _bundle_checked:
+        _bundle_checked = True
+        bundle_file = resource_path(ASSET_BUNDLE["file"])
+
+        if ASSET_BUNDLE["enabled"] and os.path.exists(bundle_file):
+            frozen = getattr(sys, 'frozen', False)
+            if not frozen and _bundle_is_stale(bundle_file):
+                print(f"⚠ {ASSET_BUNDLE['file']} lebih lama dari folder asset/, memakai file biasa")
+            elif QResource.registerResource(bundle_file, ASSET_BUNDLE["prefix"]):
+                _bundle_root = f":{ASSET_BUNDLE['prefix']}/asset"
+            else:
+                print(f"⚠ Gagal me-register {bundle_file}, memakai file biasa")
+
+    if _bundle_root:
+        return _bundle_root
+    return ASSET_DIR.replace('\\', '/')
+
+def using_bundle():
+    _asset_root()
+    return _bundle_root is not None
+
+def asset_path(*parts):
+    """Path aset yang bisa dipakai Qt (QPixmap, QIcon, QSvgRenderer, QFile)"""
+    return "/".join((_asset_root(),) + parts)
+
+def asset_exists(*parts):
+    return QFile.exists(asset_path(*parts))
+
+def list_assets(*parts):
+    """Nama file di dalam sebuah folder aset (terurut)"""
+    directory = QDir(asset_path(*parts))
+    if not directory.exists():
+        return []
+    return sorted(directory.entryList(QDir.Filter.Files))
+
+def read_asset_bytes(*parts):
+    """Baca isi aset; None jika tidak ada"""
+    f = QFile(asset_path(*parts))
+    if not f.open(QIODevice.OpenModeFlag.ReadOnly):
+        return None
+    try:
+        return bytes(f.readAll())
+    finally:
+        f.close()
+
+def read_asset_text(*parts):
+    data = read_asset_bytes(*parts)
+    return data.decode('utf-8') if data is not None else None
+
+def load_stylesheet(*parts):
+    """
+    Baca file QSS dan arahkan `url(asset/...)` ke root aset aktif,
+    sehingga ikon di stylesheet tidak bergantung pada working directory.
+    """
+    qss = read_asset_text(*parts)
+    if qss is None:
+        return None
+    return qss.replace("url(asset/", f"url({_asset_root()}/")
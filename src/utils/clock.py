@@ -0,0 +1,64 @@
+# File: src/utils/clock.py
+import time
+from datetime import datetime
+
+class SystemClock:
+    """Jam sistem biasa (default aplikasi)"""
+
+    def time(self):
+        """Detik sejak epoch, seperti time.time()"""
+        return time.time()
+
+    def now(self):
+        """Waktu lokal, seperti datetime.now()"""
+        return datetime.now()
+
+
+class VirtualClock:
+    """
+    Jam buatan untuk soak test / simulasi dipercepat.
+    Waktu hanya bergerak lewat advance() atau set(), sehingga satu batch
+    inkubasi penuh bisa diputar dalam hitungan menit.
+    """
+
+    def __init__(self, start=None):
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        self._now = time.time() if start is None else float(start)
+
+    def time(self):
+        return self._now
+
+    def now(self):
+        return datetime.fromtimestamp(self._now)
+
+    def advance(self, seconds):
+        """Majukan jam `seconds` detik; jam tidak pernah mundur"""
+        if seconds < 0:
+            raise ValueError("VirtualClock tidak bisa mundur")
+        self._now += seconds
+        return self._now
+
+    def set(self, timestamp):
+        """Lompat ke waktu tertentu (timestamp atau datetime)"""
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        self.advance(timestamp - self._now)
+        return self._now
+
+
+_clock = SystemClock()
+
+def get_clock():
+    """
+    Jam yang dipakai logika waktu-dinding aplikasi (hari inkubasi, timestamp
+    sampel, history). Timer Qt & pengukuran durasi tetap memakai jam nyata.
+    """
+    return _clock
+
+def set_clock(clock=None):
+    """Pasang jam lain (mis. VirtualClock) sebelum service dibuat; None = jam sistem. Mengembalikan jam lama."""
+    global _clock
+    previous = _clock
+    _clock = clock if clock is not None else SystemClock()
+    return previous
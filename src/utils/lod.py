@@ -0,0 +1,114 @@
+# File: src/utils/lod.py
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+class _LodLevel:
+    """Envelope min/max satu level zoom (lebar bucket tetap)"""
+
+    __slots__ = ("bucket", "x", "y_min", "y_max", "n_done", "n_total", "generation")
+
+    def __init__(self, bucket, generation):
+        self.bucket = bucket
+        self.generation = generation
+        self.x = np.empty(0)
+        self.y_min = np.empty(0)
+        self.y_max = np.empty(0)
+        self.n_done = 0    # Indeks sampel pertama dari bucket terakhir (belum final)
+        self.n_total = 0   # Jumlah sampel yang sudah diproses
+
+
+def minmax_envelope(x, y, bucket):
+    """
+    Hitung envelope min/max per bucket waktu (vectorized).
+    Mengembalikan (x_tengah_bucket, y_min, y_max, indeks_awal_bucket).
+    """
+    ids = np.floor(x / bucket).astype(np.int64)
+    starts = np.flatnonzero(np.diff(ids)) + 1
+    starts = np.concatenate(([0], starts))
+
+    y_min = np.minimum.reduceat(y, starts)
+    y_max = np.maximum.reduceat(y, starts)
+    x_mid = (ids[starts] + 0.5) * bucket
+    return x_mid, y_min, y_max, starts
+
+
+def envelope_to_line(x, y_min, y_max):
+    """Ubah envelope menjadi satu polyline (min lalu max per bucket)"""
+    line_x = np.repeat(x, 2)
+    line_y = np.empty(len(y_min) * 2)
+    line_y[0::2] = y_min
+    line_y[1::2] = y_max
+    return line_x, line_y
+
+
+class MinMaxDecimator:
+    """
+    Lapisan Level-of-Detail antara history dan grafik.
+    Data dikelompokkan per piksel layar (min & max per bucket) agar spike tetap
+    terlihat. Lebar bucket dibulatkan ke pangkat dua sehingga setiap level zoom
+    bisa di-cache, dan sampel baru hanya memperbarui ekor envelope.
+    """
+
+    def __init__(self, max_levels=12, raw_factor=2):
+        self.max_levels = max_levels
+        self.raw_factor = raw_factor  # Di bawah (lebar piksel x faktor) titik, pakai data mentah
+        self._levels = OrderedDict()
+
+    def reset(self):
+        self._levels.clear()
+
+    def envelope(self, x, y, x_min, x_max, width_px, generation=0):
+        """
+        Ambil data untuk viewport [x_min, x_max] selebar `width_px` piksel.
+        Mengembalikan (x, y_min, y_max, decimated). Jika tidak perlu decimation,
+        y_min dan y_max adalah data mentah yang sama.
+        """
+        n = len(x)
+        if n == 0:
+            empty = np.empty(0)
+            return empty, empty, empty, False
+
+        # Sertakan satu titik di luar viewport agar garis tidak terputus di tepi
+        i0 = max(0, int(np.searchsorted(x, x_min, side="left")) - 1)
+        i1 = min(n, int(np.searchsorted(x, x_max, side="right")) + 1)
+        width_px = max(1, int(width_px))
+
+        if (i1 - i0) <= width_px * self.raw_factor:
+            ys = y[i0:i1]
+            return x[i0:i1], ys, ys, False
+
+        span = max(float(x_max - x_min), 1e-9)
+        bucket = 2.0 ** math.floor(math.log2(span / width_px))
+
+        level = self._get_level(bucket, x, y, generation)
+        j0 = max(0, int(np.searchsorted(level.x, x_min - bucket, side="left")))
+        j1 = int(np.searchsorted(level.x, x_max + bucket, side="right"))
+        return level.x[j0:j1], level.y_min[j0:j1], level.y_max[j0:j1], True
+
+    def _get_level(self, bucket, x, y, generation):
+        level = self._levels.get(bucket)
+        if level is None or level.generation != generation or level.n_total > len(x):
+            level = _LodLevel(bucket, generation)
+            self._levels[bucket] = level
+            while len(self._levels) > self.max_levels:
+                self._levels.popitem(last=False)
+        else:
+            self._levels.move_to_end(bucket)
+
+        if level.n_total == len(x):
+            return level
+
+        # Hitung ulang mulai dari bucket terakhir yang belum final saja
+        keep = len(level.x) - 1 if level.n_total else 0
+        x_mid, y_min, y_max, starts = minmax_envelope(
+            x[level.n_done:], y[level.n_done:], bucket
+        )
+
+        level.x = np.concatenate((level.x[:keep], x_mid))
+        level.y_min = np.concatenate((level.y_min[:keep], y_min))
+        level.y_max = np.concatenate((level.y_max[:keep], y_max))
+        level.n_done += int(starts[-1])
+        level.n_total = len(x)
+        return level
@@ -0,0 +1,170 @@
+# File: src/utils/scheduler.py
+import heapq
+import itertools
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
+
+from src.config.settings import SCHEDULER_SETTINGS
+
+class _Job:
+    __slots__ = ("name", "callback", "interval", "single_shot", "tolerance", "deadline", "token")
+
+    def __init__(self, name, callback, interval, single_shot, tolerance, deadline, token):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.single_shot = single_shot
+        self.tolerance = tolerance
+        self.deadline = deadline
+        self.token = token
+
+
+class TimerScheduler(QObject):
+    """
+    Satu QTimer untuk semua pekerjaan berkala aplikasi.
+    Deadline disimpan di heap; timer hanya di-arm ke deadline terdekat.
+    Job yang jatuh tempo dalam `tolerance`-nya ikut dijalankan pada wakeup yang
+    sama (deadline digabung), dan job hanya didaftarkan selama ada pekerjaan.
+    QTimer hanya boleh disentuh dari thread GUI: add_job/remove_job dari
+    thread lain (paho, QThreadPool) diteruskan lewat sinyal queued.
+    """
+
+    STATS_WINDOW = 60.0   # Detik, jendela hitung wakeup per detik
+
+    # Antrian lintas thread (dikirim queued ke thread pemilik scheduler)
+    _add_requested = pyqtSignal(str, object, object, bool, object)
+    _remove_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = {}
+        self._heap = []          # (deadline, token, name)
+        self._tokens = itertools.count()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_due_jobs)
+
+        self._add_requested.connect(self.add_job, Qt.ConnectionType.QueuedConnection)
+        self._remove_requested.connect(self.remove_job, Qt.ConnectionType.QueuedConnection)
+
+        self.wakeups = 0
+        self._wakeup_times = deque()
+
+        if SCHEDULER_SETTINGS["report_interval"] > 0:
+            self.add_job("scheduler_report", self._report, SCHEDULER_SETTINGS["report_interval"] * 1000)
+
+    def add_job(self, name, callback, interval_ms, single_shot=False, tolerance_ms=None):
+        """
+        Daftarkan (atau jadwalkan ulang) job bernama `name`.
+        `tolerance_ms`: seberapa awal job boleh dijalankan agar bisa digabung
+        dengan wakeup job lain (default: 10% interval, maks. coalesce_ms).
+        """
+        if not self._in_owner_thread():
+            self._add_requested.emit(name, callback, interval_ms, single_shot, tolerance_ms)
+            return
+        if tolerance_ms is None:
+            tolerance_ms = min(interval_ms * 0.1, SCHEDULER_SETTINGS["coalesce_ms"])
+
+        job = _Job(
+            name, callback, interval_ms / 1000.0, single_shot, tolerance_ms / 1000.0,
+            time.monotonic() + interval_ms / 1000.0, next(self._tokens)
+        )
+        self._jobs[name] = job
+        heapq.heappush(self._heap, (job.deadline, job.token, name))
+        self._arm()
+
+    def remove_job(self, name):
+        """Hapus job (entri heap lamanya dibuang saat muncul di puncak heap)"""
+        if not self._in_owner_thread():
+            self._remove_requested.emit(name)
+            return
+        if self._jobs.pop(name, None) is not None:
+            self._arm()
+
+    def has_job(self, name):
+        return name in self._jobs
+
+    def job_names(self):
+        return sorted(self._jobs)
+
+    def wakeups_per_second(self):
+        self._trim_stats(time.monotonic())
+        return len(self._wakeup_times) / self.STATS_WINDOW
+
+    def _in_owner_thread(self):
+        return QThread.currentThread() is self.thread()
+
+    def _is_current(self, token, name):
+        job = self._jobs.get(name)
+        return job is not None and job.token == token
+
+    def _arm(self):
+        # Buang entri basi (job dihapus / dijadwalkan ulang) dari puncak heap
+        while self._heap and not self._is_current(self._heap[0][1], self._heap[0][2]):
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._timer.stop()
+            return
+
+        delay_ms = max(0, int((self._heap[0][0] - time.monotonic()) * 1000))
+        # Coarse (boleh digeser OS ~5%) untuk jeda pendek, presisi untuk jeda
+        # panjang seperti pergantian hari
+        self._timer.setTimerType(
+            Qt.TimerType.PreciseTimer if delay_ms > 60000 else Qt.TimerType.CoarseTimer
+        )
+        self._timer.start(delay_ms)
+
+    def _run_due_jobs(self):
+        now = time.monotonic()
+        self.wakeups += 1
+        self._wakeup_times.append(now)
+        self._trim_stats(now)
+
+        due = []
+        for deadline, token, name in self._heap:
+            job = self._jobs.get(name)
+            if job is not None and job.token == token and deadline - job.tolerance <= now:
+                due.append(job)
+
+        for job in sorted(due, key=lambda j: j.deadline):
+            if self._jobs.get(job.name) is not job:
+                continue   # Dihapus/dijadwalkan ulang oleh job lain pada wakeup ini
+
+            if job.single_shot:
+                del self._jobs[job.name]
+            else:
+                # Jaga ritme interval; jika tertinggal, lanjut dari sekarang
+                job.deadline += job.interval
+                if job.deadline <= now:
+                    job.deadline = now + job.interval
+                job.token = next(self._tokens)
+                heapq.heappush(self._heap, (job.deadline, job.token, job.name))
+
+            try:
+                job.callback()
+            except Exception as e:
+                print(f"⚠ Scheduler job '{job.name}' error: {e}")
+
+        self._arm()
+
+    def _trim_stats(self, now):
+        cutoff = now - self.STATS_WINDOW
+        while self._wakeup_times and self._wakeup_times[0] < cutoff:
+            self._wakeup_times.popleft()
+
+    def _report(self):
+        print(f"⏲ Scheduler: {self.wakeups_per_second():.2f} wakeup/detik, job: {', '.join(self.job_names())}")
+
+
+_scheduler = None
+
+def get_scheduler():
+    """Scheduler bersama (dibuat saat pertama dipakai, setelah QApplication ada)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TimerScheduler()
+    return _scheduler
@@ -0,0 +1,94 @@
+# File: src/utils/series_buffer.py
+import numpy as np
+
+class SeriesBuffer:
+    """
+    Buffer deret waktu berbasis NumPy (kolom-kolom float64 sejajar).
+    Append O(1) amortized; data lama dibuang per blok saat melewati max_points
+    sehingga indeks tidak bergeser di setiap sampel.
+    """
+
+    TRIM_SLACK = 0.1  # Buang data lama setelah melewati max_points + 10%
+
+    def __init__(self, columns, max_points, initial_capacity=1024):
+        self.columns = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self.max_points = int(max_points)
+
+        capacity = max(16, min(int(initial_capacity), self._hard_limit()))
+        self._data = np.empty((len(self.columns), capacity), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+        # version: naik setiap ada data baru
+        # generation: naik jika indeks lama tidak lagi valid (trim/clear)
+        self.version = 0
+        self.generation = 0
+
+    def _hard_limit(self):
+        return self.max_points + max(1, int(self.max_points * self.TRIM_SLACK))
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, name):
+        """View (tanpa copy) ke kolom data yang valid"""
+        return self._data[self._index[name], self._start:self._end]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def append(self, *values):
+        """Tambah satu baris sesuai urutan kolom"""
+        if self._end == self._data.shape[1]:
+            self._make_room(1)
+        self._data[:, self._end] = values
+        self._end += 1
+        self.version += 1
+
+        if len(self) > self._hard_limit():
+            self._trim()
+
+    def extend(self, columns):
+        """Tambah banyak baris sekaligus dari dict {kolom: array}"""
+        arrays = [np.asarray(columns[name], dtype=np.float64) for name in self.columns]
+        count = len(arrays[0])
+        if count == 0:
+            return
+        if self._end + count > self._data.shape[1]:
+            self._make_room(count)
+        for i, arr in enumerate(arrays):
+            self._data[i, self._end:self._end + count] = arr
+        self._end += count
+        self.version += 1
+
+        if len(self) > self.max_points:
+            self._trim()
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+        self.version += 1
+        self.generation += 1
+
+    def _trim(self):
+        self._start = self._end - self.max_points
+        self.generation += 1
+
+    def _make_room(self, count):
+        size = len(self)
+        needed = size + count
+        capacity = self._data.shape[1]
+
+        if needed > capacity:
+            # Perbesar kapasitas (x2) sampai batas keras
+            new_capacity = max(needed, min(capacity * 2, max(self._hard_limit() + 1, needed)))
+            new_data = np.empty((len(self.columns), new_capacity), dtype=np.float64)
+            new_data[:, :size] = self._data[:, self._start:self._end]
+            self._data = new_data
+        else:
+            # Geser data valid ke awal buffer (indeks logis tidak berubah)
+            self._data[:, :size] = self._data[:, self._start:self._end]
+
+        self._start = 0
+        self._end = size
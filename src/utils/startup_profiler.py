@@ -0,0 +1,152 @@
+# File: src/utils/startup_profiler.py
+import os
+import sys
+import time
+import subprocess
+from datetime import datetime
+
+from src.config.settings import STARTUP_PROFILE
+
+PROFILE_FLAG = "--profile-startup"
+ENV_REPORT = "KARTEL_PROFILE_STARTUP"
+ENV_IMPORT_LOG = "KARTEL_IMPORTTIME_LOG"
+
+class StartupProfiler:
+    """
+    Pencatat fase startup (import, init controller, build UI, frame pertama).
+    Nonaktif secara default; `mark()` hanya mencatat jika mode profiling aktif,
+    jadi aman dipanggil dari jalur startup normal.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._last = self._t0
+        self.phases = []   # (nama fase, durasi ms, waktu kumulatif ms)
+        self.report_path = None
+        self.importtime_log = None
+        self.finished = False
+
+        if os.environ.get(ENV_REPORT):
+            self.enable(os.environ[ENV_REPORT], os.environ.get(ENV_IMPORT_LOG))
+
+    @property
+    def enabled(self):
+        return self.report_path is not None
+
+    def enable(self, report_path, importtime_log=None):
+        self.report_path = report_path
+        self.importtime_log = importtime_log
+
+    def mark(self, phase):
+        """Tutup fase yang sedang berjalan dengan nama `phase`"""
+        if not self.enabled or self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000, (now - self._t0) * 1000))
+        self._last = now
+
+    def finish(self):
+        """Tulis laporan (sekali saja) setelah UI selesai dibangun"""
+        if not self.enabled or self.finished:
+            return
+        self.finished = True
+
+        lines = [
+            f"KARTEL startup profile - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Python {sys.version.split()[0]} | frozen={getattr(sys, 'frozen', False)}",
+            "",
+            "== Fase startup ==",
+            f"{'durasi':>10}  {'kumulatif':>10}  fase",
+        ]
+        for phase, duration, total in self.phases:
+            lines.append(f"{duration:8.1f}ms  {total:8.1f}ms  {phase}")
+
+        lines.append("")
+        lines.extend(self._import_summary())
+
+        try:
+            folder = os.path.dirname(self.report_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            print(f"⏱ Startup profile disimpan ke {self.report_path}")
+        except Exception as e:
+            print(f"⚠ Gagal menulis startup profile: {e}")
+
+    def _import_summary(self):
+        """Ringkas output `-X importtime` menjadi daftar modul paling lambat"""
+        if not self.importtime_log or not os.path.exists(self.importtime_log):
+            return ["== Import ==", "(tidak tersedia: build frozen atau -X importtime tidak aktif)"]
+
+        entries = []
+        try:
+            with open(self.importtime_log, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if not line.startswith("import time:"):
+                        continue
+                    parts = line[len("import time:"):].split("|")
+                    if len(parts) != 3 or not parts[0].strip().isdigit():
+                        continue  # Baris header
+                    self_us, cumulative_us = int(parts[0]), int(parts[1])
+                    name = parts[2].rstrip("\n")[1:]   # Buang spasi setelah '|'
+                    depth = (len(name) - len(name.lstrip())) // 2
+                    entries.append((cumulative_us, self_us, depth, name.strip()))
+        except Exception as e:
+            return ["== Import ==", f"(gagal membaca {self.importtime_log}: {e})"]
+
+        # Total = jumlah modul level teratas (depth 0)
+        total_ms = sum(e[0] for e in entries if e[2] == 0) / 1000
+        # Paket bisa muncul dua kali (import parent + submodul); ambil yang terbesar
+        top, seen = [], set()
+        for entry in sorted(entries, reverse=True):
+            if entry[3] in seen:
+                continue
+            seen.add(entry[3])
+            top.append(entry)
+            if len(top) >= STARTUP_PROFILE["top_imports"]:
+                break
+
+        lines = [
+            f"== Import terlama (total {total_ms:.1f}ms, {len(entries)} modul) ==",
+            f"{'kumulatif':>10}  {'sendiri':>10}  modul",
+        ]
+        for cumulative_us, self_us, _, name in top:
+            lines.append(f"{cumulative_us / 1000:8.1f}ms  {self_us / 1000:8.1f}ms  {name}")
+        return lines
+
+
+def relaunch_with_importtime(argv=None):
+    """
+    Mode --profile-startup: jalankan ulang interpreter dengan `-X importtime`
+    (stderr diarahkan ke file log) lalu kembalikan exit code proses anak.
+    Mengembalikan None jika proses ini sendiri yang harus diprofil
+    (sudah di dalam proses anak, atau build frozen PyInstaller).
+    """
+    argv = list(sys.argv if argv is None else argv)
+    if os.environ.get(ENV_REPORT):
+        return None
+
+    report_path = os.path.abspath(STARTUP_PROFILE["report_file"])
+    if getattr(sys, 'frozen', False):
+        # EXE tidak bisa di-restart dengan -X importtime: cukup catat fase init
+        startup_profiler.enable(report_path)
+        return None
+
+    log_path = os.path.abspath(STARTUP_PROFILE["importtime_log"])
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    env = dict(os.environ)
+    env[ENV_REPORT] = report_path
+    env[ENV_IMPORT_LOG] = log_path
+
+    print(f"⏱ Profiling startup (-X importtime) -> {log_path}")
+    with open(log_path, 'w') as log_file:
+        return subprocess.call(
+            [sys.executable, "-X", "importtime"] + argv,
+            stderr=log_file, env=env
+        )
+
+
+# Instance bersama; dibuat saat modul pertama kali di-import (awal main.py)
+startup_profiler = StartupProfiler()
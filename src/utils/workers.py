@@ -0,0 +1,51 @@
+# File: src/utils/workers.py
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Referensi task yang masih berjalan agar sinyalnya tidak di-GC sebelum terkirim
+_active_tasks = set()
+
+class _TaskSignals(QObject):
+    """Sinyal hasil task; dibuat di thread GUI agar callback berjalan di sana"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BackgroundTask(QRunnable):
+    """Bungkus fungsi biasa agar bisa dijalankan di QThreadPool"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(fn, *args, on_done=None, on_error=None, **kwargs):
+    """
+    Jalankan `fn(*args, **kwargs)` di worker thread.
+    `on_done(result)` / `on_error(message)` dipanggil kembali di thread GUI.
+    """
+    task = BackgroundTask(fn, *args, **kwargs)
+    if on_done is not None:
+        task.signals.finished.connect(on_done)
+    if on_error is not None:
+        task.signals.failed.connect(on_error)
+    else:
+        task.signals.failed.connect(lambda msg: print(f"⚠ Background task error: {msg}"))
+
+    _active_tasks.add(task)
+    task.signals.finished.connect(lambda _: _active_tasks.discard(task))
+    task.signals.failed.connect(lambda _: _active_tasks.discard(task))
+
+    QThreadPool.globalInstance().start(task)
+    return task
@@ -1,12 +1,17 @@
-import time
+import numpy as np
 import pyqtgraph as pg
 from datetime import datetime
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QSizePolicy
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QSizePolicy, QPushButton
 from PyQt6.QtGui import QColor
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QSize, QTimer
 
-# Import Widgets untuk meminjam fungsi load_svg_icon
-from src.views.components.widgets import DashboardWidgets
+from src.views.components.icon_cache import icon_cache
+from src.config.settings import GRAPH_SETTINGS, RENDER_SETTINGS
+from src.utils.series_buffer import SeriesBuffer
+from src.utils.clock import get_clock
+from src.utils.lod import MinMaxDecimator, envelope_to_line
+from src.views.components.history_loader import HistoryViewportLoader
+from src.views.components.plot_style import PlotStylePolicy, StyledSeries
 
 class DashboardGraphs:
     """
@@ -17,6 +22,26 @@ class DashboardGraphs:
     def __init__(self, main_window):
         # Kita sebut main_window agar jelas (karena dia parentnya)
         self.parent = main_window
+        
+        # Setup PyqtGraph (modul ini baru di-import setelah frame pertama)
+        pg.setConfigOptions(antialias=True)
+        
+        # Level-of-detail (min/max per piksel) per kurva, di-cache per level zoom
+        self.lod = {
+            "temperature": MinMaxDecimator(),
+            "humidity": MinMaxDecimator()
+        }
+        
+        # Mode live: sumbu X mengikuti data terbaru. Zoom/pan manual -> mode eksplorasi
+        self.live_mode = True
+        self.history_loader = None
+        
+        # Data yang sedang tampil (untuk lookup tooltip)
+        self._hover_series = None
+        
+        # Gaya kurva (simbol/garis/envelope) mengikuti kepadatan titik
+        self.style_policy = PlotStylePolicy()
+        self.styled_series = {}
     
     def create_graph_panel(self):
         """Buat widget panel grafik"""
@@ -30,10 +55,7 @@ class DashboardGraphs:
         title_layout = QHBoxLayout()
         icon_label = QLabel()
         
-        # Menggunakan Helper dari DashboardWidgets untuk load icon
-        # Kita inisialisasi sementara hanya untuk akses fungsi load_svg_icon
-        widgets_helper = DashboardWidgets(self.parent)
-        icon_label.setPixmap(widgets_helper.load_svg_icon("graph.svg", QSize(40, 40)))
+        icon_label.setPixmap(icon_cache.pixmap("graph.svg", QSize(40, 40)))
         
         title_label = QLabel("GRAFIK TREN (REAL-TIME)")
         title_label.setObjectName("sectionTitle")
@@ -41,12 +63,24 @@ class DashboardGraphs:
         title_layout.addWidget(icon_label)
         title_layout.addWidget(title_label)
         title_layout.addStretch()
+        
+        # Tombol kembali ke mode live (muncul setelah zoom/pan manual)
+        self.parent.live_btn = QPushButton("Kembali ke Live")
+        self.parent.live_btn.setObjectName("liveButton")
+        self.parent.live_btn.clicked.connect(self.resume_live)
+        self.parent.live_btn.hide()
+        title_layout.addWidget(self.parent.live_btn)
         graph_main_layout.addLayout(title_layout)
         
         # --- Bagian Plotting ---
-        self.parent.plot_widget = pg.PlotWidget()
+        # Sumbu X berbasis waktu (timestamp epoch)
+        self.parent.plot_widget = pg.PlotWidget(
+            axisItems={'bottom': pg.DateAxisItem(orientation='bottom')}
+        )
         self.parent.plot_widget.setBackground('#ffffff')
         self.parent.plot_widget.setMenuEnabled(False)
+        # Zoom & pan hanya pada sumbu waktu
+        self.parent.plot_widget.setMouseEnabled(x=True, y=False)
         self.parent.plot_widget.showGrid(x=True, y=True, alpha=0.3)
         self.parent.plot_widget.setMinimumHeight(280)
         self.parent.plot_widget.setSizePolicy(
@@ -59,6 +93,12 @@ class DashboardGraphs:
         if hasattr(self.parent, 'controller'):
             hist_data = self.parent.controller.get_historical_data()
             self.initialize_graph_with_real_data(hist_data)
+            
+            # History lama (di luar buffer live) dimuat sesuai viewport
+            self.history_loader = HistoryViewportLoader(
+                self.parent.controller.get_history_store(), parent=self.parent.plot_widget
+            )
+            self.history_loader.tiles_loaded.connect(self._request_redraw)
         
         # Pengaturan plot style
         self.setup_graph_plot()
@@ -71,31 +111,29 @@ class DashboardGraphs:
         if not hist_data or not hist_data.get("temperature") or not hist_data.get("humidity"):
             return
             
-        current_time = time.time()
+        current_time = get_clock().time()
         
         # Pastikan parent memiliki variable penampung data grafik
         # (Nanti kita pastikan ini ada di Main Window)
         if not hasattr(self.parent, 'graph_data'):
-            self.parent.graph_data = {"timestamps": [], "temperature": [], "humidity": []}
+            self.parent.graph_data = SeriesBuffer(
+                ("timestamps", "temperature", "humidity"),
+                GRAPH_SETTINGS["history_max_points"]
+            )
 
         # Gunakan timestamp yang ada dari data historis atau buat jika tidak ada
         if hist_data.get("timestamps"):
-            for timestamp, temp, humidity in zip(
-                hist_data["timestamps"], 
-                hist_data["temperature"], 
-                hist_data["humidity"]
-            ):
-                self.parent.graph_data["timestamps"].append(timestamp)
-                self.parent.graph_data["temperature"].append(temp)
-                self.parent.graph_data["humidity"].append(humidity)
+            timestamps = hist_data["timestamps"]
         else:
-            # Fallback: buat timestamp mundur
+            # Fallback: buat timestamp mundur (Interval 5 menit)
             count = len(hist_data["temperature"])
-            for i, (temp, humidity) in enumerate(zip(hist_data["temperature"], hist_data["humidity"])):
-                timestamp = current_time - (count - i - 1) * 300  # Interval 5 menit
-                self.parent.graph_data["timestamps"].append(timestamp)
-                self.parent.graph_data["temperature"].append(temp)
-                self.parent.graph_data["humidity"].append(humidity)
+            timestamps = current_time - (count - 1 - np.arange(count)) * 300
+
+        self.parent.graph_data.extend({
+            "timestamps": timestamps,
+            "temperature": hist_data["temperature"],
+            "humidity": hist_data["humidity"]
+        })
         
         print(f"📊 Graph initialized with {len(hist_data['temperature'])} points")
     
@@ -107,18 +145,23 @@ class DashboardGraphs:
         
         self.update_x_axis()
 
+        ax_bottom = self.parent.plot_widget.getAxis('bottom')
+        ax_bottom.setTextPen(QColor("#6b7280"))
+
         # Sumbu Y Kiri (Suhu)
         ax_left = self.parent.plot_widget.getAxis('left')
         ax_left.setLabel("Suhu (°C)", color="#FFC107")
         ax_left.setTextPen(QColor("#FFC107"))
 
-        # Garis Plot Suhu
+        # Garis Plot Suhu (simbol diatur oleh PlotStylePolicy)
         self.parent.temp_plot = self.parent.plot_widget.plot(
             [], [], 
             pen=pg.mkPen(color="#FFC107", width=3),
-            symbol='o', symbolSize=6, symbolBrush='#FFC107',
             name="Suhu"
         )
+        self.styled_series["temperature"] = StyledSeries(
+            self.parent.temp_plot, "#FFC107", self.parent.plot_widget
+        )
 
         # ViewBox kedua untuk Kelembaban
         self.parent.view_box_2 = pg.ViewBox()
@@ -134,17 +177,15 @@ class DashboardGraphs:
         self.parent.plot_widget.plotItem.layout.addItem(ax_right, 2, 3)
         self.parent.view_box_2.linkView(pg.ViewBox.XAxis, self.parent.plot_widget.plotItem.getViewBox())
 
-        # Elemen Plot Kelembaban
-        self.parent.humidity_plot = pg.PlotCurveItem(
+        # Elemen Plot Kelembaban (garis + simbol dalam satu PlotDataItem)
+        self.parent.humidity_plot = pg.PlotDataItem(
             [], [],
             pen=pg.mkPen(color="#5A3FFF", width=3),
         )
-        self.parent.humidity_symbol = pg.ScatterPlotItem(
-            [], [],
-            symbol='o', size=6, brush='#5A3FFF'
-        )
         self.parent.view_box_2.addItem(self.parent.humidity_plot)
-        self.parent.view_box_2.addItem(self.parent.humidity_symbol)
+        self.styled_series["humidity"] = StyledSeries(
+            self.parent.humidity_plot, "#5A3FFF", self.parent.view_box_2
+        )
 
         # Tooltip Setup
         self.setup_graph_tooltip()
@@ -152,8 +193,12 @@ class DashboardGraphs:
         # Resize Handler
         def update_views():
             self.parent.view_box_2.setGeometry(self.parent.plot_widget.plotItem.vb.sceneBoundingRect())
+            # Lebar piksel berubah -> level LOD ikut berubah
+            if hasattr(self.parent, 'render_scheduler'):
+                self.parent.render_scheduler.mark_dirty("graph")
         
         self.parent.plot_widget.plotItem.vb.sigResized.connect(update_views)
+        self.parent.plot_widget.plotItem.vb.sigRangeChangedManually.connect(self.on_user_range_changed)
         
         self.update_graph_plot()
         update_views()
@@ -174,71 +219,190 @@ class DashboardGraphs:
         """)
         self.parent.tooltip.hide()
 
-        def on_mouse_move(event):
-            if self.parent.plot_widget.sceneBoundingRect().contains(event):
-                mouse_pos = self.parent.plot_widget.plotItem.vb.mapSceneToView(event)
-                x_pos = int(mouse_pos.x())
-                
-                # Cek apakah index valid
-                if hasattr(self.parent, 'graph_data') and \
-                   0 <= x_pos < len(self.parent.graph_data["temperature"]):
-                    
-                    timestamp = self.parent.graph_data["timestamps"][x_pos]
-                    time_str = datetime.fromtimestamp(timestamp).strftime("%H:%M")
-                    temp_val = self.parent.graph_data["temperature"][x_pos]
-                    humidity_val = self.parent.graph_data["humidity"][x_pos]
-                    
-                    tooltip_text = f"""<div style="color: #6b7280; font-size: 11px; margin-bottom: 4px;">{time_str}</div>
-<div style="color: #5A3FFF;">Kelembaban: {humidity_val}%</div>
-<div style="color: #FFC107;">Suhu: {temp_val}°C</div>"""
-                    
-                    self.parent.tooltip.setText(tooltip_text)
-                    self.parent.tooltip.adjustSize()
-                    
-                    try:
-                        tooltip_pos = self.parent.plot_widget.mapFromScene(event)
-                        self.parent.tooltip.move(tooltip_pos.x() + 10, tooltip_pos.y() - 60)
-                        self.parent.tooltip.show()
-                    except: pass
-                else:
-                    self.parent.tooltip.hide()
-            else:
-                self.parent.tooltip.hide()
+        # Hover diproses paling banyak sekali per frame (posisi terakhir saja)
+        self._hover_scene_pos = None
+        self._hover_key = None
+        self._hover_timer = QTimer(self.parent.plot_widget)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.timeout.connect(self._render_tooltip)
 
-        self.parent.plot_widget.scene().sigMouseMoved.connect(on_mouse_move)
+        self.parent.plot_widget.scene().sigMouseMoved.connect(self._on_mouse_move)
     
-    def update_x_axis(self):
-        """Perbarui sumbu X dengan label waktu"""
-        if not hasattr(self.parent, 'graph_data') or not self.parent.graph_data["timestamps"]:
+    def _on_mouse_move(self, scene_pos):
+        """Simpan posisi kursor; tooltip diperbarui pada frame berikutnya"""
+        self._hover_scene_pos = scene_pos
+        if not self._hover_timer.isActive():
+            self._hover_timer.start(int(1000 / RENDER_SETTINGS["max_fps"]))
+    
+    @staticmethod
+    def _nearest_index(x, target):
+        """Binary search indeks sampel terdekat dari `target` (O(log n))"""
+        i = int(np.searchsorted(x, target))
+        if i <= 0: return 0
+        if i >= len(x): return len(x) - 1
+        return i if (x[i] - target) < (target - x[i - 1]) else i - 1
+    
+    @staticmethod
+    def _format_value(y_min, y_max, unit):
+        # Data teragregasi (LOD) ditampilkan sebagai rentang min-max
+        if abs(y_max - y_min) < 0.05:
+            return f"{y_max:.1f}{unit}"
+        return f"{y_min:.1f} - {y_max:.1f}{unit}"
+    
+    def _render_tooltip(self):
+        """Snap ke sampel terdekat lalu tampilkan tooltip (label dipakai ulang jika sama)"""
+        tooltip = self.parent.tooltip
+        scene_pos = self._hover_scene_pos
+        series = self._hover_series
+        
+        if scene_pos is None or not series or not self.parent.plot_widget.sceneBoundingRect().contains(scene_pos):
+            tooltip.hide()
+            self._hover_key = None
             return
-            
-        time_labels = []
-        x_positions = []
         
-        for i, timestamp in enumerate(self.parent.graph_data["timestamps"]):
-            time_str = datetime.fromtimestamp(timestamp).strftime("%H:%M")
-            time_labels.append(time_str)
-            x_positions.append(i)
+        temp_x, temp_min, temp_max = series["temperature"]
+        hum_x, hum_min, hum_max = series["humidity"]
+        if not len(temp_x) or not len(hum_x):
+            tooltip.hide()
+            return
         
-        x_ticks = [list(zip(x_positions, time_labels))]
-        ax_bottom = self.parent.plot_widget.getAxis('bottom')
-        ax_bottom.setTicks(x_ticks)
-        ax_bottom.setTextPen(QColor("#6b7280"))
+        vb = self.parent.plot_widget.plotItem.vb
+        mouse_x = vb.mapSceneToView(scene_pos).x()
+        if not (temp_x[0] <= mouse_x <= temp_x[-1]):
+            tooltip.hide()
+            self._hover_key = None
+            return
+        
+        i_temp = self._nearest_index(temp_x, mouse_x)
+        i_hum = self._nearest_index(hum_x, temp_x[i_temp])
+        key = (temp_x[i_temp], temp_min[i_temp], temp_max[i_temp], hum_min[i_hum], hum_max[i_hum])
         
-        if len(x_positions) > 1:
-            self.parent.plot_widget.setXRange(-0.5, len(x_positions) - 0.5)
+        if key != self._hover_key:
+            self._hover_key = key
+            timestamp = temp_x[i_temp]
+            time_str = datetime.fromtimestamp(timestamp).strftime("%d/%m %H:%M:%S")
+            temp_text = self._format_value(temp_min[i_temp], temp_max[i_temp], "°C")
+            humidity_text = self._format_value(hum_min[i_hum], hum_max[i_hum], "%")
+            
+            tooltip.setText(f"""<div style="color: #6b7280; font-size: 11px; margin-bottom: 4px;">{time_str}</div>
+<div style="color: #5A3FFF;">Kelembaban: {humidity_text}</div>
+<div style="color: #FFC107;">Suhu: {temp_text}</div>""")
+            tooltip.adjustSize()
+        
+        # Posisi X di-snap ke sampel, posisi Y mengikuti kursor
+        snapped = vb.mapViewToScene(pg.Point(temp_x[i_temp], vb.mapSceneToView(scene_pos).y()))
+        widget_pos = self.parent.plot_widget.mapFromScene(snapped)
+        tooltip.move(int(widget_pos.x()) + 10, int(widget_pos.y()) - 60)
+        tooltip.show()
+    
+    def _request_redraw(self):
+        if hasattr(self.parent, 'render_scheduler'):
+            self.parent.render_scheduler.mark_dirty("graph")
+    
+    def on_user_range_changed(self, *args):
+        """Zoom/pan manual: berhenti mengikuti data live"""
+        if self.live_mode:
+            self.live_mode = False
+            self.parent.live_btn.show()
+        self._request_redraw()
+    
+    def resume_live(self):
+        """Kembali mengikuti data terbaru"""
+        self.live_mode = True
+        self.parent.live_btn.hide()
+        self._request_redraw()
+    
+    def _live_range(self):
+        """Rentang waktu jendela live (berakhir di sampel terbaru)"""
+        data = self.parent.graph_data
+        x_max = float(data["timestamps"][-1]) if len(data) else get_clock().time()
+        return x_max - GRAPH_SETTINGS["live_window_seconds"], x_max
+    
+    def update_x_axis(self):
+        """Perbarui rentang sumbu X di mode live (label waktu diatur oleh DateAxisItem)"""
+        if not self.live_mode or not hasattr(self.parent, 'graph_data') or not len(self.parent.graph_data):
+            return
+            
+        x_min, x_max = self._live_range()
+        data_start = float(self.parent.graph_data["timestamps"][0])
+        if self.history_loader is None:
+            x_min = max(x_min, data_start)
+        self.parent.plot_widget.setXRange(x_min, x_max, padding=0.02)
     
     def update_graph_plot(self):
-        """Perbarui grafik dengan data saat ini"""
-        if not hasattr(self.parent, 'graph_data') or not self.parent.graph_data["temperature"]:
+        """Perbarui grafik sesuai viewport (buffer live + history dari store)"""
+        if not hasattr(self.parent, 'graph_data') or not hasattr(self.parent, 'temp_plot'):
+            return
+        if self.live_mode and not len(self.parent.graph_data):
             return
             
-        x_data = list(range(len(self.parent.graph_data["temperature"])))
+        if self.live_mode:
+            x_min, x_max = self._live_range()
+        else:
+            x_min, x_max = self.parent.plot_widget.plotItem.vb.viewRange()[0]
+        width_px = self.parent.plot_widget.plotItem.vb.width()
         
-        self.parent.temp_plot.setData(x_data, self.parent.graph_data["temperature"])
+        curves = self._collect_curves(x_min, x_max, width_px)
+        self._hover_series = {key: curve[:3] for key, curve in curves.items()}
         
-        self.parent.humidity_plot.setData(x_data, self.parent.graph_data["humidity"])
-        self.parent.humidity_symbol.setData(x_data, self.parent.graph_data["humidity"])
+        for key, curve in curves.items():
+            x, y_min, y_max, decimated = curve
+            line_x, line_y = self._to_line(curve)
+            mode = self.style_policy.mode_for(len(x), width_px, decimated)
+            self.styled_series[key].set_data(mode, x, y_min, y_max, line_x, line_y)
         
         self.update_x_axis()
-        self.parent.view_box_2.setXRange(-0.5, len(x_data) - 0.5)
\ No newline at end of file
+    
+    def _collect_curves(self, x_min, x_max, width_px):
+        """
+        Gabungkan data viewport: bagian sebelum buffer live diambil dari
+        HistoryStore (tile di-cache), sisanya dari buffer memori via LOD.
+        """
+        data = self.parent.graph_data
+        buffer_start = float(data["timestamps"][0]) if len(data) else float("inf")
+        span = max(x_max - x_min, 1e-9)
+        
+        stored = None
+        if self.history_loader is not None and x_min < buffer_start:
+            stored = self.history_loader.fetch(x_min, min(x_max, buffer_start), width_px)
+        
+        curves = {}
+        for key in ("temperature", "humidity"):
+            parts_x, parts_min, parts_max = [], [], []
+            decimated = False
+            
+            if stored is not None:
+                x, y_min, y_max = stored[key]
+                keep = x < buffer_start
+                parts_x.append(x[keep]); parts_min.append(y_min[keep]); parts_max.append(y_max[keep])
+                # Bucket berisi satu sampel (min == max) setara data mentah
+                decimated = bool(np.any(y_min[keep] != y_max[keep]))
+            
+            if len(data) and x_max >= buffer_start:
+                part_min = max(x_min, buffer_start)
+                part_width = width_px * (x_max - part_min) / span
+                x, y_min, y_max, buffer_decimated = self.lod[key].envelope(
+                    data["timestamps"], data[key], part_min, x_max, part_width, data.generation
+                )
+                parts_x.append(x); parts_min.append(y_min); parts_max.append(y_max)
+                decimated = decimated or buffer_decimated
+            
+            if not parts_x:
+                empty = np.empty(0)
+                curves[key] = (empty, empty, empty, False)
+                continue
+            
+            curves[key] = (
+                np.concatenate(parts_x), np.concatenate(parts_min),
+                np.concatenate(parts_max), decimated
+            )
+        
+        return curves
+    
+    @staticmethod
+    def _to_line(curve):
+        """Envelope (x, min, max, decimated) -> data polyline untuk plot"""
+        x, y_min, y_max, decimated = curve
+        if decimated:
+            return envelope_to_line(x, y_min, y_max)
+        return x, y_min
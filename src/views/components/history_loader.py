@@ -0,0 +1,129 @@
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.utils.lod import minmax_envelope
+from src.utils.workers import run_in_background
+
+class HistoryViewportLoader(QObject):
+    """
+    Memuat history dari HistoryStore sesuai viewport grafik.
+    Rentang waktu dipecah menjadi tile (TILE_BUCKETS bucket per tile) pada level
+    resolusi yang sesuai lebar piksel. Tile dimuat di worker thread, disimpan di
+    cache LRU, dan tile tetangga di-prefetch agar pan/zoom terasa instan.
+    """
+
+    tiles_loaded = pyqtSignal()
+
+    TILE_BUCKETS = 512
+    SERIES = ("temperature", "humidity")
+    RELOAD_AFTER = 5.0   # Detik sebelum tile yang belum lengkap boleh dimuat ulang
+
+    def __init__(self, store, max_tiles=96, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()   # (batch, bucket, index) -> {series: (x, min, max)}
+        self._pending = set()
+
+    @staticmethod
+    def bucket_for(x_min, x_max, width_px):
+        """Lebar bucket (detik, pangkat dua) untuk viewport ini"""
+        span = max(float(x_max - x_min), 1e-9)
+        return 2.0 ** math.floor(math.log2(span / max(1, int(width_px))))
+
+    def fetch(self, x_min, x_max, width_px):
+        """
+        Ambil envelope untuk [x_min, x_max] dari tile yang sudah ada di cache.
+        Tile yang belum ada (plus tetangganya) dimuat di background; sinyal
+        `tiles_loaded` dipancarkan saat datanya siap.
+        """
+        batch = self.store.batch_id
+        bucket = self.bucket_for(x_min, x_max, width_px)
+        tile_span = bucket * self.TILE_BUCKETS
+
+        first = int(math.floor(x_min / tile_span))
+        last = int(math.floor(x_max / tile_span))
+
+        now = time.monotonic()
+        parts = {name: [] for name in self.SERIES}
+        for index in range(first, last + 1):
+            key = (batch, bucket, index)
+            tile = self._tiles.get(key)
+            if tile is None:
+                self._request(key, tile_span)
+                continue
+            self._tiles.move_to_end(key)
+            
+            # Tile yang dimuat sebelum datanya lengkap dimuat ulang (dengan jeda)
+            needed_until = min((index + 1) * tile_span, x_max)
+            if tile["until"] < needed_until and now - tile["loaded_at"] >= self.RELOAD_AFTER:
+                self._request(key, tile_span)
+            for name in self.SERIES:
+                parts[name].append(tile[name])
+
+        # Prefetch tile di kiri & kanan viewport
+        for index in (first - 1, last + 1):
+            key = (batch, bucket, index)
+            if key not in self._tiles:
+                self._request(key, tile_span)
+
+        result = {}
+        for name, chunks in parts.items():
+            if chunks:
+                result[name] = tuple(np.concatenate(col) for col in zip(*chunks))
+            else:
+                empty = np.empty(0)
+                result[name] = (empty, empty, empty)
+        return result
+
+    def clear(self):
+        self._tiles.clear()
+
+    def _request(self, key, tile_span):
+        if key in self._pending:
+            return
+        self._pending.add(key)
+
+        batch, bucket, index = key
+        t_start = index * tile_span
+        t_end = t_start + tile_span
+        run_in_background(
+            self._load_tile, batch, bucket, t_start, t_end,
+            on_done=lambda tile, key=key: self._on_tile_loaded(key, tile),
+            on_error=lambda msg, key=key: self._on_tile_failed(key, msg)
+        )
+
+    def _load_tile(self, batch, bucket, t_start, t_end):
+        """Worker thread: baca rentang dari memory-map lalu reduksi ke envelope"""
+        columns = ["timestamps"] + list(self.SERIES)
+        data = self.store.read_range(t_start, t_end, columns, batch_id=batch)
+        ts = data["timestamps"]
+
+        # Batas waktu di mana isi tile sudah pasti lengkap
+        span = self.store.time_span(batch)
+        until = min(t_end, span[1]) if span else t_start
+
+        tile = {"until": until, "loaded_at": time.monotonic()}
+        for name in self.SERIES:
+            if len(ts) == 0:
+                empty = np.empty(0)
+                tile[name] = (empty, empty, empty)
+                continue
+            x_mid, y_min, y_max, _ = minmax_envelope(ts, data[name].astype(np.float64), bucket)
+            tile[name] = (x_mid, y_min, y_max)
+        return tile
+
+    def _on_tile_loaded(self, key, tile):
+        self._pending.discard(key)
+        self._tiles[key] = tile
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        self.tiles_loaded.emit()
+
+    def _on_tile_failed(self, key, message):
+        self._pending.discard(key)
+        print(f"⚠ Gagal memuat history: {message}")
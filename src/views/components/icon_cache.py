@@ -0,0 +1,105 @@
+# File: src/views/components/icon_cache.py
+from collections import OrderedDict
+
+from PyQt6.QtGui import QPixmap, QIcon, QPainter, QGuiApplication
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtSvg import QSvgRenderer
+
+from src.config.settings import ICON_CACHE
+from src.utils.assets import asset_path, asset_exists, list_assets
+
+class IconCache:
+    """
+    Cache pixmap SVG untuk seluruh proses.
+    Key: (file, ukuran, device pixel ratio). File SVG hanya di-parse sekali,
+    dan pixmap dibuang dengan pola LRU saat melewati `max_entries`.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or ICON_CACHE["max_entries"]
+        self._pixmaps = OrderedDict()
+        self._icons = {}
+        self._renderers = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def svg_path(svg_filename):
+        return asset_path('svg', svg_filename)
+
+    @staticmethod
+    def _device_pixel_ratio():
+        app = QGuiApplication.instance()
+        return app.devicePixelRatio() if app is not None else 1.0
+
+    def pixmap(self, svg_filename, size=QSize(24, 24), dpr=None):
+        """Ambil pixmap ikon (render hanya jika belum ada di cache)"""
+        dpr = dpr or self._device_pixel_ratio()
+        key = (svg_filename, size.width(), size.height(), dpr)
+
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = self._render(svg_filename, size, dpr)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            evicted, _ = self._pixmaps.popitem(last=False)
+            self._icons.pop(evicted, None)
+        return pixmap
+
+    def icon(self, svg_filename, size=QSize(24, 24)):
+        """QIcon dari pixmap yang di-cache (ikut terbuang bersama pixmap-nya)"""
+        dpr = self._device_pixel_ratio()
+        key = (svg_filename, size.width(), size.height(), dpr)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = QIcon(self.pixmap(svg_filename, size, dpr))
+            self._icons[key] = icon
+        return icon
+
+    def _renderer(self, svg_filename):
+        renderer = self._renderers.get(svg_filename)
+        if renderer is None:
+            if not asset_exists('svg', svg_filename):
+                return None
+            renderer = QSvgRenderer(self.svg_path(svg_filename))
+            self._renderers[svg_filename] = renderer
+        return renderer
+
+    def _render(self, svg_filename, size, dpr):
+        renderer = self._renderer(svg_filename)
+        if renderer is None:
+            # Fallback ke qtawesome jika SVG tidak ditemukan
+            import qtawesome as qta
+            print(f"⚠ SVG icon tidak ditemukan: {self.svg_path(svg_filename)}, menggunakan fallback")
+            return qta.icon("fa5s.question", color="#666666").pixmap(size)
+
+        pixmap = QPixmap(int(size.width() * dpr), int(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        renderer.render(painter)
+        painter.end()
+        return pixmap
+
+    def warm_up(self, sizes=None):
+        """Render semua ikon di asset/svg untuk ukuran yang dipakai dashboard"""
+        sizes = sizes or [QSize(s, s) for s in ICON_CACHE["warm_up_sizes"]]
+
+        count = 0
+        for filename in list_assets('svg'):
+            if not filename.endswith(".svg"):
+                continue
+            for size in sizes:
+                self.pixmap(filename, size)
+                count += 1
+        return count
+
+
+# Instance bersama untuk seluruh aplikasi
+icon_cache = IconCache()
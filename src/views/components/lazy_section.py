@@ -0,0 +1,62 @@
+# File: src/views/components/lazy_section.py
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import QTimer, QRect, QPoint
+
+class LazySection(QWidget):
+    """
+    Placeholder untuk bagian UI yang jarang dipakai.
+    Isi dibangun oleh `builder(layout)` hanya saat pertama kali section
+    terlihat di dalam scroll area (atau saat `ensure_built()` dipanggil).
+    """
+
+    def __init__(self, builder, placeholder_height=0, parent=None):
+        super().__init__(parent)
+        self._builder = builder
+        self.built = False
+
+        self.section_layout = QVBoxLayout(self)
+        self.section_layout.setContentsMargins(0, 0, 0, 0)
+        self.section_layout.setSpacing(20)
+        # Tinggi perkiraan agar scrollbar & posisi widget di bawahnya tidak melompat
+        self.setMinimumHeight(placeholder_height)
+
+    def ensure_built(self):
+        if self.built:
+            return
+        self.built = True
+        self._builder(self.section_layout)
+        self.setMinimumHeight(0)
+
+    def is_in_view(self, scroll_area):
+        """Cek apakah section beririsan dengan viewport scroll area"""
+        viewport = scroll_area.viewport()
+        top_left = self.mapTo(viewport, QPoint(0, 0))
+        return QRect(top_left, self.size()).intersects(viewport.rect())
+
+
+class LazySectionWatcher:
+    """Bangun LazySection saat di-scroll/resize sampai terlihat"""
+
+    def __init__(self, scroll_area, sections):
+        self.scroll_area = scroll_area
+        self.sections = list(sections)
+
+        scroll_bar = scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.check)
+        scroll_bar.rangeChanged.connect(self.check)
+
+        # Cek pertama setelah layout selesai dihitung
+        QTimer.singleShot(0, self.check)
+
+    def check(self, *args):
+        if not self.scroll_area.isVisible():
+            return
+        for section in self.sections:
+            if not section.built and section.is_in_view(self.scroll_area):
+                section.ensure_built()
+        self.sections = [s for s in self.sections if not s.built]
+
+    def build_all(self):
+        for section in self.sections:
+            section.ensure_built()
+        self.sections = []
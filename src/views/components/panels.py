@@ -7,11 +7,12 @@ from datetime import datetime
 
 # Import komponen widget kita
 from src.views.components.widgets import DashboardWidgets
+from src.views.components.lazy_section import LazySection, LazySectionWatcher
 # Import service untuk kredensial
 from src.services.auth_service import AuthService
 
 # Import dari helper
-from src.utils.helpers import resource_path
+from src.utils.assets import asset_path
 class DashboardPanels:
     """
     Menangani pembuatan Panel Konfigurasi (Sidebar Kanan).
@@ -22,6 +23,7 @@ class DashboardPanels:
         self.parent = main_window
         # Helper widget untuk load icon & label
         self.widgets = DashboardWidgets(main_window)
+        self.lazy_watcher = None
     
     def create_config_panel(self):
         """Membuat panel konfigurasi utama"""
@@ -50,8 +52,10 @@ class DashboardPanels:
         # --- Bagian-bagian Form ---
         self.add_profile_section(config_layout)
         self.add_setpoint_section(config_layout)
-        self.add_mqtt_section(config_layout)
-        self.add_info_section(config_layout)
+        
+        # Form MQTT & info jarang dipakai: dibangun saat pertama terlihat
+        mqtt_section = LazySection(self._build_connection_sections, placeholder_height=360)
+        config_layout.addWidget(mqtt_section)
         
         config_layout.addStretch()
 
@@ -59,8 +63,18 @@ class DashboardPanels:
         self.add_action_buttons(config_layout)
         
         scroll_area.setWidget(config_widget)
+        self.lazy_watcher = LazySectionWatcher(scroll_area, [mqtt_section])
         return scroll_area
     
+    def _build_connection_sections(self, layout):
+        self.add_mqtt_section(layout)
+        self.add_info_section(layout)
+    
+    def ensure_sections_built(self):
+        """Paksa semua section lazy dibangun (misal sebelum membaca input MQTT)"""
+        if self.lazy_watcher is not None:
+            self.lazy_watcher.build_all()
+    
     def add_profile_section(self, layout):
         """Dropdown Pemilihan Profil"""
         layout.addWidget(self.widgets.create_form_label("Profil Inkubasi"))
@@ -190,9 +204,7 @@ class DashboardPanels:
         self.parent.remember_checkbox.setObjectName("rememberCheckbox")
 
         # Inject CSS via Python untuk Path Gambar
-        icon_checked = resource_path("asset/svg/check.svg")
-
-        icon_checked = icon_checked.replace('\\', '/')
+        icon_checked = asset_path('svg', 'check.svg')
 
         self.parent.remember_checkbox.setStyleSheet(f"""
             QCheckBox::indicator:checked {{
@@ -256,14 +268,25 @@ class DashboardPanels:
         layout.addLayout(button_layout)
     
     def load_saved_credentials(self):
-        """Muat kredensial menggunakan AuthService"""
+        """Isi form dari cache AuthService, atau dekripsi dulu di worker thread"""
+        loaded, saved_creds = AuthService.cached_credentials()
+        if loaded:
+            # Sudah dimuat (auto-connect / sesi ini): isi form saat itu juga
+            self.apply_saved_credentials(saved_creds)
+        else:
+            AuthService.load_credentials_async(on_done=self.apply_saved_credentials)
+    
+    def apply_saved_credentials(self, saved_creds):
+        """Isi form login dengan kredensial tersimpan (dipanggil di thread GUI)"""
         try:
-            saved_creds = AuthService.load_credentials()
-            
             if saved_creds:
                 username = saved_creds.get("username", "")
                 password = saved_creds.get("password", "")
                 
+                # Jangan timpa input yang sudah diketik user selama proses load
+                if self.parent.user_input.text() or self.parent.pass_input.text():
+                    return
+                
                 if username and password:
                     self.parent.user_input.setText(username)
                     self.parent.pass_input.setText(password)
@@ -0,0 +1,80 @@
+import pyqtgraph as pg
+from PyQt6.QtGui import QColor
+
+from src.config.settings import GRAPH_SETTINGS
+
+class PlotStylePolicy:
+    """
+    Kebijakan gaya kurva berdasarkan kepadatan titik per piksel.
+    - symbols  : data jarang, tiap sampel diberi simbol 'o'
+    - lines    : data rapat, garis polos tanpa simbol
+    - envelope : data teragregasi (LOD), area isi antara min & max
+    """
+
+    SYMBOLS = "symbols"
+    LINES = "lines"
+    ENVELOPE = "envelope"
+
+    def __init__(self, symbol_max_density=None):
+        if symbol_max_density is None:
+            symbol_max_density = GRAPH_SETTINGS["symbol_max_density"]
+        self.symbol_max_density = symbol_max_density
+
+    def mode_for(self, n_points, width_px, decimated):
+        if decimated:
+            return self.ENVELOPE
+        density = n_points / max(1.0, float(width_px))
+        if density <= self.symbol_max_density:
+            return self.SYMBOLS
+        return self.LINES
+
+
+class StyledSeries:
+    """
+    Satu deret data (garis utama + envelope min/max) yang gayanya diganti
+    otomatis oleh PlotStylePolicy. Gaya hanya diubah saat mode berganti.
+    """
+
+    def __init__(self, curve, color, envelope_parent):
+        self.curve = curve
+        self.color = color
+        self.mode = None
+
+        # clipToView + auto-downsampling: hanya bagian terlihat yang digambar
+        self.curve.setClipToView(True)
+        self.curve.setDownsampling(auto=True, method='peak')
+
+        fill = QColor(color)
+        fill.setAlpha(70)
+        edge_pen = pg.mkPen(color=color, width=1)
+        self.env_min = pg.PlotCurveItem([], [], pen=edge_pen)
+        self.env_max = pg.PlotCurveItem([], [], pen=edge_pen)
+        self.env_fill = pg.FillBetweenItem(self.env_min, self.env_max, brush=fill)
+        for item in (self.env_fill, self.env_min, self.env_max):
+            envelope_parent.addItem(item)
+
+    def set_data(self, mode, x, y_min, y_max, line_x, line_y):
+        if mode != self.mode:
+            self._apply_mode(mode)
+
+        if mode == PlotStylePolicy.ENVELOPE:
+            self.env_min.setData(x, y_min)
+            self.env_max.setData(x, y_max)
+        else:
+            self.curve.setData(line_x, line_y)
+
+    def _apply_mode(self, mode):
+        self.mode = mode
+        if mode == PlotStylePolicy.ENVELOPE:
+            self.curve.setData([], [])
+        else:
+            self.env_min.setData([], [])
+            self.env_max.setData([], [])
+
+        if mode == PlotStylePolicy.SYMBOLS:
+            self.curve.setSymbol('o')
+            self.curve.setSymbolSize(6)
+            self.curve.setSymbolBrush(self.color)
+            self.curve.setSymbolPen(self.color)
+        else:
+            self.curve.setSymbol(None)
@@ -0,0 +1,99 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, QEvent
+
+from src.config.settings import RENDER_SETTINGS
+
+class RenderScheduler(QObject):
+    """
+    Penjadwal repaint berbasis dirty flag.
+    Data yang masuk hanya menandai bagian UI sebagai 'kotor'. Repaint dilakukan
+    paling banyak `max_fps` kali per detik, dan dilewati selama jendela
+    diminimize atau tidak terlihat (lalu dikejar dengan satu repaint saat kembali).
+    """
+
+    def __init__(self, window, max_fps=None):
+        super().__init__(window)
+        self.window = window
+
+        self._handlers = {}   # nama region -> callback repaint (urutan = urutan gambar)
+        self._dirty = set()
+        self._last_frame = 0.0
+        self.frames_rendered = 0
+
+        self.frame_interval_ms = 0
+        self.set_max_fps(max_fps or RENDER_SETTINGS["max_fps"])
+
+        # Timer single-shot: hanya aktif jika memang ada yang perlu digambar
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+        # Pantau show/minimize/restore untuk repaint susulan
+        self._window_handle = None
+        self.window.installEventFilter(self)
+
+    def register(self, name, callback):
+        """Daftarkan region UI beserta fungsi repaint-nya"""
+        self._handlers[name] = callback
+
+    def set_max_fps(self, fps):
+        fps = max(1, int(fps))
+        self.frame_interval_ms = int(1000 / fps)
+
+    def mark_dirty(self, *names):
+        """Tandai region sebagai kotor; repaint dijadwalkan pada frame berikutnya"""
+        self._dirty.update(names)
+        if self._timer.isActive() or not self._is_renderable():
+            return
+
+        elapsed_ms = (time.monotonic() - self._last_frame) * 1000
+        self._timer.start(int(max(0, self.frame_interval_ms - elapsed_ms)))
+
+    def resume(self):
+        """Jendela kembali terlihat: satu repaint untuk mengejar semua perubahan"""
+        if self._dirty and not self._timer.isActive():
+            self._timer.start(0)
+
+    def flush(self):
+        """Gambar region kotor sekarang juga (dipakai soak test / benchmark)"""
+        self._timer.stop()
+        self._flush()
+
+    def _is_renderable(self):
+        if not self.window.isVisible() or self.window.isMinimized():
+            return False
+        handle = self.window.windowHandle()
+        if handle is not None and not handle.isExposed():
+            return False
+        return True
+
+    def _flush(self):
+        if not self._dirty or not self._is_renderable():
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        self._last_frame = time.monotonic()
+
+        for name, callback in self._handlers.items():
+            if name in dirty:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠ Render error ({name}): {e}")
+
+        self.frames_rendered += 1
+
+    def eventFilter(self, obj, event):
+        etype = event.type()
+
+        if obj is self.window and etype == QEvent.Type.Show:
+            # QWindow baru tersedia setelah show pertama; pantau event Expose-nya
+            handle = self.window.windowHandle()
+            if handle is not None and handle is not self._window_handle:
+                self._window_handle = handle
+                handle.installEventFilter(self)
+            self.resume()
+        elif etype in (QEvent.Type.WindowStateChange, QEvent.Type.Expose):
+            self.resume()
+
+        return False
@@ -0,0 +1,28 @@
+# File: src/views/components/state_style.py
+"""
+Styling status berbasis dynamic property.
+Widget status memakai objectName tetap; warnanya dipilih oleh selector
+QSS `[state="..."]`. Re-polish hanya dilakukan saat state benar-benar berubah.
+"""
+
+STATE_PROPERTY = "state"
+
+# Tabel state per status (dihitung sekali, bukan per update)
+POWER_STATES = {True: "aktif", False: "nonaktif"}
+MOTOR_STATES = {"Berputar": "berputar", "Error": "error", "Idle": "idle"}
+CONNECTION_STATES = {True: "connected", False: "disconnected"}
+
+
+def set_widget_state(widget, state):
+    """
+    Set state widget. Mengembalikan True jika terjadi transisi
+    (hanya pada saat itu stylesheet widget di-resolve ulang).
+    """
+    if widget.property(STATE_PROPERTY) == state:
+        return False
+
+    widget.setProperty(STATE_PROPERTY, state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
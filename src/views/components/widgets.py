@@ -1,18 +1,13 @@
-import os
-import qtawesome as qta
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QFrame, 
     QPushButton, QSizePolicy
 )
-from PyQt6.QtGui import QPixmap, QIcon, QPainter, QColor
+from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtSvg import QSvgRenderer
 
-# Import konfigurasi path agar gambar selalu ketemu
-from src.config.settings import ASSET_DIR
-
-# --- IMPORT DARI HELPER ---
-from src.utils.helpers import resource_path
+# --- IMPORT DARI HELPER (path aset: bundle .rcc atau file biasa) ---
+from src.utils.assets import asset_path, asset_exists
+from src.views.components.icon_cache import icon_cache
 
 class DashboardWidgets:
     """
@@ -25,30 +20,18 @@ class DashboardWidgets:
     
     def _get_asset_path(self, subfolder, filename):
         """Helper private untuk mendapatkan path aset yang valid"""
-        # Buat path relatif
-        full_relative_path = os.path.join(ASSET_DIR, subfolder, filename)
-        
-        # Bungkus dengan resource_path agar dikenali PyInstaller
-        return resource_path(full_relative_path)
+        # Path ":/..." jika bundle .rcc aktif, path file biasa jika tidak
+        return asset_path(subfolder, filename)
+
+    @staticmethod
+    def _fallback_logo():
+        """Logo cadangan qtawesome (di-import hanya jika file logo tidak ada)"""
+        import qtawesome as qta
+        return qta.icon("fa5s.cube", color="#4f46e5").pixmap(QSize(60, 60))
 
     def load_svg_icon(self, svg_filename, size=QSize(24, 24)):
-        """Load SVG icon dengan warna asli tanpa customisasi"""
-        svg_path = self._get_asset_path('svg', svg_filename)
-        
-        if os.path.exists(svg_path):
-            renderer = QSvgRenderer(svg_path)
-            pixmap = QPixmap(size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-            
-            painter = QPainter(pixmap)
-            renderer.render(painter)
-            painter.end()
-            
-            return pixmap
-        else:
-            # Fallback ke qtawesome jika SVG tidak ditemukan
-            print(f"⚠ SVG icon tidak ditemukan: {svg_path}, menggunakan fallback")
-            return qta.icon("fa5s.question", color="#666666").pixmap(size)
+        """Load SVG icon dengan warna asli tanpa customisasi (via cache pixmap)"""
+        return icon_cache.pixmap(svg_filename, size)
     
     def create_header(self):
         """Create header widget with logo and status buttons"""
@@ -61,14 +44,14 @@ class DashboardWidgets:
         logo_label = QLabel()
         logo_path = self._get_asset_path('img', 'kartel-logo.png')
         
-        if os.path.exists(logo_path):
+        if asset_exists('img', 'kartel-logo.png'):
             logo_pixmap = QPixmap(logo_path)
             if not logo_pixmap.isNull():
                 logo_label.setPixmap(logo_pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
             else:
-                logo_label.setPixmap(qta.icon("fa5s.cube", color="#4f46e5").pixmap(QSize(60, 60)))
+                logo_label.setPixmap(self._fallback_logo())
         else:
-            logo_label.setPixmap(qta.icon("fa5s.cube", color="#4f46e5").pixmap(QSize(60, 60)))
+            logo_label.setPixmap(self._fallback_logo())
 
         title_layout = QVBoxLayout()
         title_layout.setSpacing(0)
@@ -85,11 +68,12 @@ class DashboardWidgets:
 
         # Tombol Status (Disimpan ke parent agar bisa diupdate Controller)
         self.parent.status_connect_btn = QPushButton(" Tidak Terhubung")
-        self.parent.status_connect_btn.setIcon(QIcon(self.load_svg_icon("wifi-notconnect.svg", QSize(20, 20))))
-        self.parent.status_connect_btn.setObjectName("statusNotConnected")
+        self.parent.status_connect_btn.setIcon(icon_cache.icon("wifi-notconnect.svg", QSize(20, 20)))
+        self.parent.status_connect_btn.setObjectName("statusConnection")
+        self.parent.status_connect_btn.setProperty("state", "disconnected")
 
         self.parent.status_day_btn = QPushButton(" Hari ke- --")
-        self.parent.status_day_btn.setIcon(QIcon(self.load_svg_icon("calendar.svg", QSize(20, 20))))
+        self.parent.status_day_btn.setIcon(icon_cache.icon("calendar.svg", QSize(20, 20)))
         self.parent.status_day_btn.setObjectName("statusDay")
         
         header_layout.addWidget(self.parent.status_connect_btn)
@@ -221,8 +205,8 @@ class DashboardWidgets:
         status_cards_layout.setSpacing(15)
 
         # Create status cards with references
-        self.parent.power_card = self.create_single_status_card("pemanas.svg", "Power", "OFF", "statusNonAktif")
-        self.parent.motor_card = self.create_single_status_card("motor-dinamo.svg", "Motor Pembalik", "Idle", "statusMotorIdle")
+        self.parent.power_card = self.create_single_status_card("pemanas.svg", "Power", "OFF", "statusBadge", "nonaktif")
+        self.parent.motor_card = self.create_single_status_card("motor-dinamo.svg", "Motor Pembalik", "Idle", "statusBadge", "idle")
         self.parent.timer_card = self.create_single_status_card("sand-clock.svg", "Putaran Berikutnya", "--:--", "statusTimer")
         
         status_cards_layout.addWidget(self.parent.power_card)
@@ -232,7 +216,7 @@ class DashboardWidgets:
         status_main_layout.addWidget(status_cards_widget)
         return status_widget_container
 
-    def create_single_status_card(self, icon_svg, title, status_text, status_style_name):
+    def create_single_status_card(self, icon_svg, title, status_text, status_style_name, state=None):
         """Create a single device status card"""
         card = QFrame()
         card.setObjectName("statusCard")
@@ -257,6 +241,8 @@ class DashboardWidgets:
         # Status Label
         status_label = QLabel(status_text)
         status_label.setObjectName(status_style_name)
+        if state is not None:
+            status_label.setProperty("state", state)
         status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         # Store references
@@ -270,6 +256,63 @@ class DashboardWidgets:
         card_layout.addWidget(status_label)
         return card
     
+    def create_batch_stats_card(self):
+        """Create batch statistics card (rata-rata, min/maks, waktu dalam band sejak batch mulai)"""
+        stats_widget_container = QWidget()
+        stats_main_layout = QVBoxLayout(stats_widget_container)
+        stats_main_layout.setContentsMargins(0, 0, 0, 0)
+        stats_main_layout.setSpacing(10)
+
+        # Judul "STATISTIK BATCH"
+        title_layout = QHBoxLayout()
+        icon_label = QLabel()
+        icon_label.setPixmap(self.load_svg_icon("graph.svg", QSize(40, 40)))
+
+        title_label = QLabel("STATISTIK BATCH")
+        title_label.setObjectName("sectionTitle")
+
+        title_layout.addWidget(icon_label)
+        title_layout.addWidget(title_label)
+        title_layout.addStretch()
+        stats_main_layout.addLayout(title_layout)
+
+        card = QFrame()
+        card.setObjectName("statsCard")
+        grid = QGridLayout(card)
+        grid.setHorizontalSpacing(24)
+        grid.setVerticalSpacing(8)
+
+        columns = [("mean", "Rata-rata ± SD"), ("min", "Minimum"), ("max", "Maksimum"), ("in_band", "Dalam Band")]
+        for col, (_, header) in enumerate(columns, start=1):
+            header_label = QLabel(header)
+            header_label.setObjectName("statsHeader")
+            grid.addWidget(header_label, 0, col)
+
+        # Store references for updates: {(metric, kolom): QLabel}
+        self.parent.batch_stats_labels = {}
+        for row, (metric, name) in enumerate((("temperature", "Suhu"), ("humidity", "Kelembaban")), start=1):
+            metric_label = QLabel(name)
+            metric_label.setObjectName("statsMetric")
+            grid.addWidget(metric_label, row, 0)
+            for col, (key, _) in enumerate(columns, start=1):
+                value_label = QLabel("--")
+                value_label.setObjectName("statsValue")
+                grid.addWidget(value_label, row, col)
+                self.parent.batch_stats_labels[(metric, key)] = value_label
+
+        self.parent.batch_stats_footer = QLabel("Belum ada data untuk batch ini")
+        self.parent.batch_stats_footer.setObjectName("statsFooter")
+        grid.addWidget(self.parent.batch_stats_footer, 3, 0, 1, len(columns) + 1)
+
+        # Ringkasan kontrol pemanas (duty cycle, error tunak, overshoot, settling)
+        self.parent.control_summary_label = QLabel("Kontrol pemanas: menunggu data history")
+        self.parent.control_summary_label.setObjectName("statsFooter")
+        self.parent.control_summary_label.setWordWrap(True)
+        grid.addWidget(self.parent.control_summary_label, 4, 0, 1, len(columns) + 1)
+
+        stats_main_layout.addWidget(card)
+        return stats_widget_container
+
     def create_form_label(self, text):
         label = QLabel(text)
         label.setObjectName("formSectionTitle")
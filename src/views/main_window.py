@@ -1,24 +1,30 @@
 import sys
-import os
-import time
 import signal
-import pyqtgraph as pg
+import socket
+from datetime import datetime
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QApplication
+    QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QApplication, QFrame
 )
 from PyQt6.QtGui import QFont, QFontDatabase, QIcon
-from PyQt6.QtCore import Qt, pyqtSlot, QTimer, QSize
+from PyQt6.QtCore import Qt, pyqtSlot, QTimer, QSize, QSocketNotifier
 
 # --- IMPORT MODULES DARI STRUKTUR BARU ---
 from src.controllers.main_controller import MainController
 from src.controllers.event_handlers import DashboardEventHandlers
 from src.views.components.widgets import DashboardWidgets
-from src.views.components.graphs import DashboardGraphs
 from src.views.components.panels import DashboardPanels
-from src.config.settings import ASSET_DIR
+from src.views.components.render_scheduler import RenderScheduler
+from src.views.components.icon_cache import icon_cache
+from src.views.components.state_style import (
+    set_widget_state, POWER_STATES, MOTOR_STATES, CONNECTION_STATES
+)
+from src.config.settings import GRAPH_SETTINGS, ICON_CACHE, CONTROL_ANALYSIS, RENDER_SETTINGS
+from src.utils.clock import get_clock
+from src.utils.scheduler import get_scheduler
+from src.utils.startup_profiler import startup_profiler
 
 # --- IMPORT DARI HELPER ---
-from src.utils.helpers import resource_path
+from src.utils.assets import asset_path, asset_exists, load_stylesheet
 
 class KartelMainWindow(QWidget):
     """
@@ -29,14 +35,7 @@ class KartelMainWindow(QWidget):
     def __init__(self):
         super().__init__()
         
-        # State Data untuk Grafik
-        self.graph_data = {
-            "timestamps": [],
-            "temperature": [],
-            "humidity": [],
-            "max_points": 24 
-        }
-        
+        # Buffer grafik (NumPy) dibuat di build_deferred_ui, setelah frame pertama
         self.input_fields = {
             'temperature': None,
             'humidity': None
@@ -44,29 +43,44 @@ class KartelMainWindow(QWidget):
         
         # Inisialisasi Controller (Logic)
         self.controller = MainController()
+        startup_profiler.mark("init: MainController")
         
         # Inisialisasi Event Handlers (Interaction)
         self.event_handlers = DashboardEventHandlers(self)
         
         # Inisialisasi Komponen UI (View Helpers)
+        # (DashboardGraphs dibuat di build_deferred_ui agar pyqtgraph tidak
+        # ikut di-import sebelum frame pertama)
         self.widgets_helper = DashboardWidgets(self)
-        self.graphs_helper = DashboardGraphs(self)
+        self.graphs_helper = None
         self.panels_helper = DashboardPanels(self)
         
+        # Penjadwal repaint (data hanya menandai dirty, gambar per frame)
+        self.render_scheduler = RenderScheduler(self)
+        self._latest_sensor_data = None
+        self._latest_device_status = None
+        self.render_scheduler.register("labels", self.render_sensor_labels)
+        self.render_scheduler.register("status", self.render_device_status)
+        self.render_scheduler.register("stats", self.render_batch_stats)
+        
+        # Analisis kontrol pemanas dibuat di build_deferred_ui (NumPy setelah frame pertama)
+        self.control_analyzer = None
+        
         # Setup Koneksi Controller -> UI
         self.setup_controller_connections()
         
         # Bangun Antarmuka
         self.load_custom_fonts()
+        startup_profiler.mark("init: fonts")
         self.init_ui()
+        startup_profiler.mark("init: init_ui (header, kartu, status)")
+        # Statistik batch yang dipulihkan dari sesi sebelumnya
+        self.render_scheduler.mark_dirty("stats")
         
-        # Startup Sequence
-        QTimer.singleShot(500, self.force_sync_current_profile)
-        
-        # Timer Refresh Data (Polling UI)
-        self.data_refresh_timer = QTimer()
-        self.data_refresh_timer.timeout.connect(self.refresh_display_data)
-        self.data_refresh_timer.start(2000) 
+        # Startup bertahap: grafik & panel konfigurasi dibangun setelah frame pertama
+        # (dipicu paintEvent pertama, dengan timer cadangan jika jendela belum tampil)
+        self._deferred_ui_started = False
+        QTimer.singleShot(250, self._start_deferred_ui)
         
         print("📡 Dashboard initialized and ready.")
         
@@ -79,10 +93,9 @@ class KartelMainWindow(QWidget):
         self.setGeometry(100, 100, 1400, 900)
         self.setMinimumSize(1000, 600)
         
-        # Gunakan resource_path untuk Logo 
-        icon_path = resource_path(os.path.join(ASSET_DIR, 'img', 'kartel-logo.png'))
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+        # Logo dari bundle aset (atau file biasa)
+        if asset_exists('img', 'kartel-logo.png'):
+            self.setWindowIcon(QIcon(asset_path('img', 'kartel-logo.png')))
         
         # Layout Utama
         main_layout = QHBoxLayout(self)
@@ -93,16 +106,19 @@ class KartelMainWindow(QWidget):
         left_column = self.create_left_column()
         
         # === KOLOM KANAN (Konfigurasi) ===
-        right_column = self.panels_helper.create_config_panel()
+        # Placeholder; panel asli dibangun di build_deferred_ui()
+        self._config_placeholder = QWidget()
+        self._config_placeholder.setObjectName("configWidget")
         
         main_layout.addWidget(left_column, 7)
-        main_layout.addWidget(right_column, 3)
+        main_layout.addWidget(self._config_placeholder, 3)
+        self.main_layout = main_layout
 
         # Stylesheet
         self.set_stylesheet()
     
     def create_left_column(self):
-        """Buat kolom monitoring kiri"""
+        """Buat kolom monitoring kiri (header & kartu vital dulu, grafik menyusul)"""
         left_scroll_area = QScrollArea()
         left_scroll_area.setWidgetResizable(True)
         left_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -117,16 +133,79 @@ class KartelMainWindow(QWidget):
         left_layout.addWidget(self.widgets_helper.create_header())
         left_layout.addWidget(self.widgets_helper.create_vital_cards())
         left_layout.addWidget(self.widgets_helper.create_status_system())
+        left_layout.addWidget(self.widgets_helper.create_batch_stats_card())
         
-        # Gunakan Helper Graphs
-        graph_panel = self.graphs_helper.create_graph_panel()
-        left_layout.addWidget(graph_panel, 1)
+        # Placeholder grafik (ukuran sama dengan panel grafik asli)
+        self._graph_placeholder = QFrame()
+        self._graph_placeholder.setObjectName("graphCard")
+        self._graph_placeholder.setMinimumHeight(380)
+        left_layout.addWidget(self._graph_placeholder, 1)
         
         left_layout.addStretch(0)
+        self.left_layout = left_layout
         
         left_scroll_area.setWidget(left_column)
         return left_scroll_area
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._deferred_ui_started:
+            startup_profiler.mark("paint: frame pertama")
+            QTimer.singleShot(0, self._start_deferred_ui)
+
+    def _start_deferred_ui(self):
+        if self._deferred_ui_started: return
+        self._deferred_ui_started = True
+        self.build_deferred_ui()
+
+    def build_deferred_ui(self):
+        """Tahap 2: bangun panel grafik, lalu panel konfigurasi di giliran berikutnya"""
+        from src.views.components.graphs import DashboardGraphs
+        from src.utils.series_buffer import SeriesBuffer
+        startup_profiler.mark("deferred: import graphs (pyqtgraph)")
+        
+        # State Data untuk Grafik (buffer NumPy untuk jendela live)
+        self.graph_data = SeriesBuffer(
+            ("timestamps", "temperature", "humidity"),
+            GRAPH_SETTINGS["history_max_points"]
+        )
+        
+        self.graphs_helper = DashboardGraphs(self)
+        self.render_scheduler.register("graph", self.graphs_helper.update_graph_plot)
+        graph_panel = self.graphs_helper.create_graph_panel()
+        self.left_layout.replaceWidget(self._graph_placeholder, graph_panel)
+        self._graph_placeholder.deleteLater()
+        self._graph_placeholder = None
+        self.render_scheduler.mark_dirty("graph")
+        startup_profiler.mark("deferred: panel grafik")
+        
+        # Analisis kontrol pemanas dari history (worker thread, cache per jendela)
+        from src.services.control_analysis import ControlAnalyzer
+        self.control_analyzer = ControlAnalyzer(self.controller.get_history_store(), parent=self)
+        self.control_analyzer.analysis_ready.connect(lambda: self.render_scheduler.mark_dirty("stats"))
+        self.render_scheduler.mark_dirty("stats")
+        
+        # Grafik & label siap: terima paket (termasuk yang datang lebih awal)
+        self.controller.mark_view_ready()
+        
+        QTimer.singleShot(0, self.build_config_panel)
+    
+    def build_config_panel(self):
+        """Tahap 3: panel konfigurasi (bagian MQTT dibangun saat terlihat)"""
+        right_column = self.panels_helper.create_config_panel()
+        self.main_layout.replaceWidget(self._config_placeholder, right_column)
+        self._config_placeholder.deleteLater()
+        self._config_placeholder = None
+        startup_profiler.mark("deferred: panel konfigurasi")
+        startup_profiler.finish()
+        
+        # Render ikon SVG ke cache setelah semua tahap UI selesai (opsional)
+        if ICON_CACHE["warm_up"]:
+            QTimer.singleShot(0, icon_cache.warm_up)
+        
+        # Sinkronisasi profil setelah panel siap
+        QTimer.singleShot(500, self.force_sync_current_profile)
+
     def setup_controller_connections(self):
         """Hubungkan sinyal controller ke metode update GUI"""
         self.controller.data_updated.connect(self.update_sensor_display)
@@ -136,91 +215,136 @@ class KartelMainWindow(QWidget):
 
     # === UPDATE SLOTS (Dipanggil oleh Controller) ===
     
-    @pyqtSlot(dict)
+    @pyqtSlot(object)
     def update_sensor_display(self, data):
+        """Simpan data sensor terbaru, label digambar ulang pada frame berikutnya"""
+        self._latest_sensor_data = data
+        self.render_scheduler.mark_dirty("labels")
+        # Kartu statistik (+ ringkasan kontrol) cukup ~1x per detik, bukan per frame
+        scheduler = get_scheduler()
+        if not scheduler.has_job("stats_card"):
+            scheduler.add_job("stats_card", lambda: self.render_scheduler.mark_dirty("stats"),
+                              RENDER_SETTINGS["stats_interval"], single_shot=True)
+    
+    def render_sensor_labels(self):
         """Update teks sensor"""
-        current = data["current"]
-        target = data["target"]
+        data = self._latest_sensor_data
+        if data is None: return
         
         if hasattr(self, 'temp_current_label'):
-            self.temp_current_label.setText(f"{current['temperature']:.1f}°C")
-            self.humidity_current_label.setText(f"{current['humidity']:.1f}%")
-            self.temp_target_label.setText(f"Target: {target['temperature']:.1f}°C")
+            self.temp_current_label.setText(f"{data.temperature:.1f}°C")
+            self.humidity_current_label.setText(f"{data.humidity:.1f}%")
+            self.temp_target_label.setText(f"Target: {data.target_temperature:.1f}°C")
     
-    @pyqtSlot(dict)
+    def render_batch_stats(self):
+        """Update kartu statistik batch (ringkasan O(1) dari service)"""
+        if not hasattr(self, 'batch_stats_labels'): return
+        stats = self.controller.get_batch_stats()
+
+        def at(timestamp):
+            return datetime.fromtimestamp(timestamp).strftime("%d/%m %H:%M")
+
+        for metric, unit in (("temperature", "°C"), ("humidity", "%")):
+            s = stats[metric]
+            labels = {key: self.batch_stats_labels[(metric, key)] for key in ("mean", "min", "max", "in_band")}
+            if not s["count"]:
+                for label in labels.values():
+                    label.setText("--")
+                continue
+            labels["mean"].setText(f"{s['mean']:.2f}{unit} ± {s['stdev']:.2f}")
+            labels["min"].setText(f"{s['min']:.1f}{unit} ({at(s['min_time'])})")
+            labels["max"].setText(f"{s['max']:.1f}{unit} ({at(s['max_time'])})")
+            in_band = s["in_band_percent"]
+            labels["in_band"].setText(
+                f"{in_band:.1f}% (±{s['tolerance']:g}{unit})" if in_band is not None else "--"
+            )
+
+        count = stats["temperature"]["count"]
+        self.batch_stats_footer.setText(
+            f"{count:,} sampel sejak batch dimulai".replace(",", ".") if count else "Belum ada data untuk batch ini"
+        )
+        self.render_control_summary()
+
+    def render_control_summary(self):
+        """Ringkasan kontrol pemanas N jam terakhir (dari cache ControlAnalyzer)"""
+        if self.control_analyzer is None: return
+        hours = CONTROL_ANALYSIS["dashboard_hours"]
+        graph_data = getattr(self, "graph_data", None)
+        end = float(graph_data["timestamps"][-1]) if graph_data is not None and len(graph_data) else get_clock().time()
+        control = self.control_analyzer.fetch(end - hours * 3600, end)
+        if control is None or control["duty_cycle"] is None:
+            return
+
+        parts = [f"duty {control['duty_cycle']:.1f}%"]
+        if control["steady_state_error"] is not None:
+            parts.append(f"error tunak {control['steady_state_error']:+.2f}°C")
+        if control["overshoot"] is not None:
+            parts.append(f"overshoot {control['overshoot']:.2f}°C")
+        if control["settling_time"] is not None:
+            parts.append(f"settling {control['settling_time'] / 60:.0f} mnt")
+        self.control_summary_label.setText(f"Kontrol pemanas {hours} jam: " + " · ".join(parts))
+
+    @pyqtSlot(object)
     def update_graph_data(self, data):
         """Update data grafik"""
-        current = data["current"]
-        current_time = time.time()
+        current_time = data.timestamp or get_clock().time()
         
-        self.graph_data["timestamps"].append(current_time)
-        self.graph_data["temperature"].append(current['temperature'])
-        self.graph_data["humidity"].append(current['humidity'])
+        # Sampel yang sudah ikut dimuat dari history (mis. paket awal yang
+        # tertahan sebelum tampilan siap) tidak ditambahkan dua kali
+        if len(self.graph_data) and current_time <= self.graph_data["timestamps"][-1]:
+            return
         
-        # Limit data points
-        max_points = self.graph_data["max_points"]
-        if len(self.graph_data["timestamps"]) > max_points:
-            self.graph_data["timestamps"] = self.graph_data["timestamps"][-max_points:]
-            self.graph_data["temperature"] = self.graph_data["temperature"][-max_points:]
-            self.graph_data["humidity"] = self.graph_data["humidity"][-max_points:]
+        # Buffer otomatis membuang data terlama saat melewati batas
+        self.graph_data.append(current_time, data.temperature, data.humidity)
             
-        # Panggil method update di graph component
-        self.graphs_helper.update_graph_plot()
+        # Grafik digambar ulang oleh render scheduler (maks. 1x per frame)
+        self.render_scheduler.mark_dirty("graph")
 
-    @pyqtSlot(dict)
+    @pyqtSlot(object)
     def update_device_status_display(self, status):
+        """Simpan status perangkat terbaru, digambar ulang pada frame berikutnya"""
+        self._latest_device_status = status
+        self.render_scheduler.mark_dirty("status")
+
+    def render_device_status(self):
         """Update status visual (Power, Motor, Timer)"""
+        status = self._latest_device_status
+        if status is None: return
         # Power
-        if "power" in status and hasattr(self, 'power_status_label'):
-            power_val = status["power"]["value"]
-            self.power_status_label.setText(f"{status['power']['status']} ({power_val}%)")
-            style_obj = "statusAktif" if status["power"]["active"] else "statusNonAktif"
-            self.power_status_label.setObjectName(style_obj)
-            self._refresh_style(self.power_status_label)
+        if hasattr(self, 'power_status_label'):
+            self.power_status_label.setText(f"{status.power_status} ({status.power}%)")
+            set_widget_state(self.power_status_label, POWER_STATES[status.power_active])
 
         # Motor
-        if "motor" in status and hasattr(self, 'motor_status_label'):
-            motor_st = status["motor"]["status"]
-            self.motor_status_label.setText(motor_st)
-            
-            style_obj = "statusMotorIdle"
-            if motor_st == "Berputar": style_obj = "statusMotorBerputar"
-            elif motor_st == "Error": style_obj = "statusMotorError"
-            
-            self.motor_status_label.setObjectName(style_obj)
-            self._refresh_style(self.motor_status_label)
+        if hasattr(self, 'motor_status_label'):
+            self.motor_status_label.setText(status.motor_status)
+            set_widget_state(self.motor_status_label, MOTOR_STATES.get(status.motor_status, "idle"))
 
         # Timer
-        if "timer" in status and hasattr(self, 'timer_status_label'):
-            self.timer_status_label.setText(status["timer"]["countdown"])
+        if hasattr(self, 'timer_status_label'):
+            self.timer_status_label.setText(status.countdown)
             
     @pyqtSlot(dict)
     def update_connection_display(self, connection):
         """Update tombol status koneksi"""
         if not hasattr(self, 'status_connect_btn'): return
         
-        if connection["connected"]:
-            self.status_connect_btn.setText(" Terhubung")
-            self.status_connect_btn.setObjectName("statusConnected")
-            self.status_connect_btn.setIcon(QIcon(self.widgets_helper.load_svg_icon("wifi.svg", QSize(20, 20))))
-        else:
-            self.status_connect_btn.setText(" Tidak Terhubung")
-            self.status_connect_btn.setObjectName("statusNotConnected")
-            self.status_connect_btn.setIcon(QIcon(self.widgets_helper.load_svg_icon("wifi-notconnect.svg", QSize(20, 20))))
+        # Teks, ikon & style hanya diganti saat status koneksi berubah
+        connected = connection["connected"]
+        if set_widget_state(self.status_connect_btn, CONNECTION_STATES[connected]):
+            if connected:
+                self.status_connect_btn.setText(" Terhubung")
+                self.status_connect_btn.setIcon(icon_cache.icon("wifi.svg", QSize(20, 20)))
+            else:
+                self.status_connect_btn.setText(" Tidak Terhubung")
+                self.status_connect_btn.setIcon(icon_cache.icon("wifi-notconnect.svg", QSize(20, 20)))
             
         self.status_day_btn.setText(f" {connection['day_text']}")
-        self._refresh_style(self.status_connect_btn)
-
-    def _refresh_style(self, widget):
-        """Helper untuk force refresh stylesheet pada widget tertentu"""
-        widget.style().unpolish(widget)
-        widget.style().polish(widget)
+        # Ganti tanggal mulai = batch baru: statistik ikut diperbarui
+        self.render_scheduler.mark_dirty("stats")
 
     # === STARTUP & CLEANUP ===
     
-    def refresh_display_data(self):
-        pass
-
     def force_sync_current_profile(self):
         if hasattr(self, 'profil_combo'):
             current_profile = self.profil_combo.currentText()
@@ -229,9 +353,21 @@ class KartelMainWindow(QWidget):
 
     def setup_signal_handlers(self):
         signal.signal(signal.SIGINT, self.signal_handler)
-        self.signal_timer = QTimer()
-        self.signal_timer.timeout.connect(lambda: None)
-        self.signal_timer.start(100)
+        # Handler Python baru jalan saat interpreter mendapat giliran; daripada
+        # timer 100ms, sinyal membangunkan event loop lewat socket (set_wakeup_fd)
+        self._signal_rsock, self._signal_wsock = socket.socketpair()
+        self._signal_rsock.setblocking(False)
+        self._signal_wsock.setblocking(False)
+        signal.set_wakeup_fd(self._signal_wsock.fileno())
+        self.signal_notifier = QSocketNotifier(self._signal_rsock.fileno(), QSocketNotifier.Type.Read, self)
+        self.signal_notifier.activated.connect(self._drain_signal_socket)
+    
+    def _drain_signal_socket(self):
+        try:
+            while self._signal_rsock.recv(64):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
     
     def signal_handler(self, signum, frame):
         print("\n🛑 Menerima sinyal shutdown...")
@@ -239,6 +375,7 @@ class KartelMainWindow(QWidget):
 
     def shutdown_application(self):
         print("🔄 Melakukan cleanup...")
+        get_scheduler().remove_job("stats_card")
         self.controller.cleanup()
         QApplication.instance().quit()
     
@@ -247,16 +384,13 @@ class KartelMainWindow(QWidget):
         event.accept()
 
     def set_stylesheet(self):
-        # Gunakan resource_path untuk Stylesheet ---
-        path = resource_path(os.path.join(ASSET_DIR, 'style', 'styles.qss'))
+        # Stylesheet dari bundle aset (url(asset/...) diarahkan ke root aset aktif)
+        stylesheet = load_stylesheet('style', 'styles.qss')
         
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                self.setStyleSheet(f.read())
+        if stylesheet is not None:
+            self.setStyleSheet(stylesheet)
     
     def load_custom_fonts(self):
-        # Gunakan resource_path untuk Font ---
-        font_path = resource_path(os.path.join(ASSET_DIR, 'fonts', 'Manrope-Regular.ttf'))
-        
-        if os.path.exists(font_path):
-            QFontDatabase.addApplicationFont(font_path)
\ No newline at end of file
+        # Font dari bundle aset (QFontDatabase bisa membaca path ":/")
+        if asset_exists('fonts', 'Manrope-Regular.ttf'):
+            QFontDatabase.addApplicationFont(asset_path('fonts', 'Manrope-Regular.ttf'))
\ No newline at end of file
@@ -0,0 +1,88 @@
+# File: tests/test_alarm_engine.py
+from src.services.alarm_engine import AlarmEngine, OutOfBandRule, ThresholdRule, StaleRule
+
+DEVICE = "inkubator-01"
+
+
+def make_engine(cooldown=60, per_minute=100, stale=False):
+    rules = [ThresholdRule("temp_high", "temperature", ">", 39.0)]
+    if stale:
+        rules.append(StaleRule("stale", max_age=600))
+    return AlarmEngine(rules, cooldown_seconds=cooldown, max_alarms_per_minute=per_minute)
+
+
+def states(events):
+    return [(e["rule_id"], e["state"]) for e in events]
+
+
+def test_alarm_held_by_cooldown_is_emitted_once_allowed():
+    engine = make_engine(cooldown=60)
+    assert states(engine.ingest(DEVICE, {"temperature": 40.0}, 0)) == [("temp_high", "raised")]
+    assert states(engine.ingest(DEVICE, {"temperature": 38.0}, 10)) == [("temp_high", "cleared")]
+
+    # Naik lagi dalam masa cooldown: ditahan, tapi kondisi tetap bertahan
+    assert engine.ingest(DEVICE, {"temperature": 40.0}, 20) == []
+    assert engine.ingest(DEVICE, {"temperature": 40.5}, 40) == []
+    assert engine.suppressed == 1
+
+    events = engine.ingest(DEVICE, {"temperature": 40.5}, 61)
+    assert states(events) == [("temp_high", "raised")]
+    assert events[0]["value"] == 40.5
+
+    # Tidak dikirim dua kali, dan 'cleared' menyusul saat normal
+    assert engine.ingest(DEVICE, {"temperature": 40.5}, 70) == []
+    assert states(engine.ingest(DEVICE, {"temperature": 38.0}, 80)) == [("temp_high", "cleared")]
+
+
+def test_pending_alarm_emitted_by_periodic_check_without_new_samples():
+    engine = make_engine(cooldown=60, stale=True)
+    engine.ingest(DEVICE, {"temperature": 40.0}, 0)
+    engine.ingest(DEVICE, {"temperature": 38.0}, 5)
+    assert engine.ingest(DEVICE, {"temperature": 40.0}, 10) == []
+
+    assert engine.check_stale(20) == []
+    assert states(engine.check_stale(60)) == [("temp_high", "raised")]
+
+
+def test_pending_alarm_dropped_when_condition_clears():
+    engine = make_engine(cooldown=60)
+    engine.ingest(DEVICE, {"temperature": 40.0}, 0)
+    engine.ingest(DEVICE, {"temperature": 38.0}, 10)
+    engine.ingest(DEVICE, {"temperature": 40.0}, 20)
+
+    # Tidak pernah dikirim 'raised', jadi tidak ada 'cleared'
+    assert engine.ingest(DEVICE, {"temperature": 38.0}, 30) == []
+    assert engine.ingest(DEVICE, {"temperature": 38.0}, 90) == []
+    assert engine.active_alarms() == []
+
+
+def test_token_bucket_delays_but_does_not_drop_alarms():
+    engine = make_engine(per_minute=1)
+    assert states(engine.ingest("a", {"temperature": 40.0}, 0)) == [("temp_high", "raised")]
+    assert engine.ingest("b", {"temperature": 40.0}, 1) == []
+
+    events = engine.ingest("b", {"temperature": 40.0}, 61)
+    assert [(e["device_id"], e["state"]) for e in events] == [("b", "raised")]
+
+
+def test_reset_forgets_pending_alarms():
+    engine = make_engine(cooldown=60)
+    engine.ingest(DEVICE, {"temperature": 40.0}, 0)
+    engine.ingest(DEVICE, {"temperature": 38.0}, 10)
+    engine.ingest(DEVICE, {"temperature": 40.0}, 20)
+    engine.reset()
+    assert engine.check_stale(100) == []
+
+
+def test_band_rule_keeps_last_setpoint_for_messages_without_set():
+    band = OutOfBandRule("temp_band", "temperature", max_seconds=60, target="SET", tolerance=0.5)
+    engine = AlarmEngine([band], cooldown_seconds=0, max_alarms_per_minute=100)
+
+    assert engine.ingest(DEVICE, {"temperature": 37.5, "SET": 37.5}, 0) == []
+    # Pesan berikutnya tanpa SET tetap dievaluasi terhadap SET terakhir
+    assert engine.ingest(DEVICE, {"temperature": 36.5}, 10) == []
+    events = engine.ingest(DEVICE, {"temperature": 36.5}, 75)
+    assert states(events) == [("temp_band", "raised")]
+
+    # SET device lain tidak dipakai untuk device ini
+    assert engine.ingest("lain", {"temperature": 30.0}, 200) == []
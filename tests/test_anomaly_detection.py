@@ -0,0 +1,35 @@
+# File: tests/test_anomaly_detection.py
+import pytest
+
+from src.services.anomaly_detection import FleetAnomalyDetector
+
+
+def feed(detector, device_id, start, seconds, temperature, setpoint_every=None, setpoint=37.5):
+    for i, t in enumerate(range(start, start + seconds, 2)):
+        sends_set = setpoint_every is not None and i % setpoint_every == 0
+        detector.ingest(device_id, float(t), temperature, 60.0, 40.0,
+                        setpoint if sends_set else None)
+        detector.update()
+
+
+def test_temperature_channel_uses_last_setpoint_when_message_has_none():
+    detector = FleetAnomalyDetector()
+    # SET hanya di setiap pesan kedua
+    feed(detector, "dev", 0, 600, 37.6, setpoint_every=2)
+
+    state = detector.device_state("dev")["temperature"]
+    assert state["blocks"] > 0
+    assert state["mean"] == pytest.approx(0.1, abs=1e-6)
+
+
+def test_temperature_channel_waits_for_first_setpoint():
+    detector = FleetAnomalyDetector()
+    feed(detector, "dev", 0, 300, 37.6)
+    assert detector.device_state("dev")["temperature"]["blocks"] == 0
+
+    # Mulai mengirim SET: kanal langsung berupa offset, bukan suhu mentah
+    feed(detector, "dev", 300, 300, 37.6, setpoint_every=1)
+    state = detector.device_state("dev")["temperature"]
+    assert state["blocks"] > 0
+    assert state["mean"] == pytest.approx(0.1, abs=1e-6)
+    assert not state["alarm"]
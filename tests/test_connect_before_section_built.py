@@ -0,0 +1,85 @@
+# File: tests/test_connect_before_section_built.py
+import threading
+
+import pytest
+
+from src.services import auth_service
+from src.services.auth_service import AuthService
+
+SAVED = {"username": "kartel", "password": "kartel123", "remember": True, "method": "encrypted"}
+
+
+@pytest.fixture
+def window(qapp, wait_until, tmp_path, monkeypatch):
+    # Data runtime (history, JSON, kredensial) ditulis ke folder sementara
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(AuthService, "_cached_credentials", auth_service._NOT_LOADED)
+    monkeypatch.setattr(AuthService, "_read_credentials", classmethod(lambda cls: dict(SAVED)))
+    monkeypatch.setattr(AuthService, "save_credentials_async", classmethod(lambda cls, *a, **k: None))
+
+    from src.views.main_window import KartelMainWindow
+    w = KartelMainWindow()
+    w.connections = []
+    w.messages = []
+    monkeypatch.setattr(w.controller, "simulate_mqtt_connection",
+                        lambda u, p: w.connections.append((u, p)) or True)
+    monkeypatch.setattr(w.event_handlers, "show_message",
+                        lambda title, message: w.messages.append(title))
+
+    # Jendela tidak ditampilkan: section MQTT lazy tidak akan terbangun sendiri
+    assert wait_until(lambda: w.panels_helper.lazy_watcher is not None)
+    assert w.panels_helper.lazy_watcher.sections, "section MQTT seharusnya belum dibangun"
+    yield w
+    w.controller.cleanup()
+    w.close()
+    w.deleteLater()
+
+
+def test_connect_before_section_opened_waits_for_saved_credentials(window, wait_until, monkeypatch):
+    # Dekripsi ditahan sampai klik selesai diproses
+    release = threading.Event()
+
+    def slow_read(cls):
+        release.wait(5)
+        return dict(SAVED)
+
+    monkeypatch.setattr(AuthService, "_read_credentials", classmethod(slow_read))
+    window.connect_btn.click()
+
+    # Dekripsi masih berjalan: belum ada pesan error "kosong"
+    assert window.messages == []
+    assert not window.connect_btn.isEnabled()
+
+    release.set()
+    assert wait_until(lambda: window.connections)
+    assert window.connections == [("kartel", "kartel123")]
+    assert window.messages == ["Sukses"]
+    assert window.user_input.text() == "kartel"
+    assert window.connect_btn.isEnabled()
+
+
+def test_connect_right_after_load_finished_fills_form_from_cache(window):
+    # Worker sudah selesai (cache terisi) tapi callback on_done belum diproses
+    AuthService.load_credentials()
+    window.connect_btn.click()
+    assert window.connections == [("kartel", "kartel123")]
+    assert window.messages == ["Sukses"]
+
+
+def test_connect_before_section_opened_uses_cached_credentials(window):
+    AuthService._cached_credentials = dict(SAVED)
+
+    # Kredensial sudah di cache: form diisi & connect berjalan sinkron
+    window.connect_btn.click()
+    assert window.connections == [("kartel", "kartel123")]
+    assert window.messages == ["Sukses"]
+
+
+def test_connect_without_saved_credentials_reports_empty_form(window, wait_until, monkeypatch):
+    monkeypatch.setattr(AuthService, "_read_credentials", classmethod(lambda cls: None))
+
+    window.connect_btn.click()
+    assert wait_until(lambda: window.messages)
+    assert window.messages == ["Error"]
+    assert window.connections == []
+    assert window.connect_btn.isEnabled()
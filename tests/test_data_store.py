@@ -0,0 +1,45 @@
+# File: tests/test_data_store.py
+import os
+import threading
+from datetime import datetime
+
+from src.services.data_store import DataStore
+
+
+def test_concurrent_saves_keep_every_key(tmp_path):
+    store = DataStore(str(tmp_path / "incubation_data.json"))
+    start = datetime(2025, 12, 5)
+    errors = []
+
+    def save_stats(k):
+        for i in range(50):
+            if not store.save_batch_stats({"writer": k, "i": i}):
+                errors.append("stats")
+
+    def save_incubation():
+        for _ in range(50):
+            if not store.save_incubation_data(start, 21):
+                errors.append("incubation")
+
+    threads = [threading.Thread(target=save_stats, args=(k,)) for k in range(3)]
+    threads.append(threading.Thread(target=save_incubation))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert store.load_incubation_data() == start
+    assert store.load_batch_stats()["i"] == 49
+    assert os.listdir(tmp_path) == ["incubation_data.json"]
+
+
+def test_saved_file_keeps_umask_permissions(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        store = DataStore(str(tmp_path / "incubation_data.json"))
+        assert store.save_incubation_data(datetime(2025, 12, 5), 21)
+        assert store.save_batch_stats({"i": 1})
+    finally:
+        os.umask(old_umask)
+    assert os.stat(store.filename).st_mode & 0o777 == 0o644
@@ -0,0 +1,29 @@
+# File: tests/test_history_store.py
+import threading
+
+import numpy as np
+
+from src.services.history_store import HistoryStore
+
+
+def test_concurrent_flushes_keep_columns_aligned(tmp_path):
+    store = HistoryStore(root_dir=str(tmp_path), flush_every=3, flush_interval=0)
+    store.open_batch("batch")
+
+    def writer(offset):
+        for i in range(2000):
+            value = offset + i
+            store.append(value, value, value, value, value)
+
+    threads = [threading.Thread(target=writer, args=(k * 10000,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    store.flush()
+
+    columns = store.memmap_columns()
+    timestamps = np.asarray(columns["timestamps"])
+    assert len(timestamps) == 8000
+    for name in ("temperature", "humidity", "power", "setpoint"):
+        np.testing.assert_array_equal(np.asarray(columns[name], dtype=np.float64), timestamps)
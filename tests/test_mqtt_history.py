@@ -0,0 +1,30 @@
+# File: tests/test_mqtt_history.py
+import threading
+
+from src.services.mqtt_service import MqttService
+
+
+def test_historical_data_copy_is_consistent_while_mqtt_thread_appends(qapp, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service = MqttService()
+    service.historical_data["max_points"] = 200
+    stop = threading.Event()
+
+    def mqtt_thread():
+        i = 0
+        while not stop.is_set():
+            service._update_history(37.5, 60.0, float(i))
+            i += 1
+
+    writer = threading.Thread(target=mqtt_thread)
+    writer.start()
+    try:
+        for _ in range(2000):
+            history = service.get_historical_data()
+            lengths = {len(history[k]) for k in ("timestamps", "temperature", "humidity")}
+            assert len(lengths) == 1
+            assert history["timestamps"] is not service.historical_data["timestamps"]
+    finally:
+        stop.set()
+        writer.join()
+        service.disconnect()